@@ -0,0 +1,33 @@
+"""add recent_writes table
+
+Revision ID: 0b6e4d9a7c13
+Revises: f3a8c2d61e57
+Create Date: 2026-10-20 09:52:08.031774
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6e4d9a7c13'
+down_revision: Union[str, Sequence[str], None] = 'f3a8c2d61e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('recent_writes',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('sticky_until', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('user_id'),
+    prefixes=['UNLOGGED']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('recent_writes')
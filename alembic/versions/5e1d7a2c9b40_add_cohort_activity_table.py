@@ -0,0 +1,52 @@
+"""add cohort_activity table
+
+Revision ID: 5e1d7a2c9b40
+Revises: c40a3041a05a
+Create Date: 2026-10-19 10:12:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1d7a2c9b40'
+down_revision: Union[str, Sequence[str], None] = 'c40a3041a05a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('cohort_activity',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('week_offset', sa.Integer(), nullable=False),
+    sa.Column('cohort_week', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'week_offset')
+    )
+    op.create_index('ix_cohort_activity_cohort_offset', 'cohort_activity', ['cohort_week', 'week_offset'], unique=False)
+
+    # Backfill from existing transaction history
+    op.execute("""
+        INSERT INTO cohort_activity (user_id, week_offset, cohort_week)
+        SELECT DISTINCT
+            u.id,
+            (date_trunc('week', t.date)::date - date_trunc('week', u.created_at)::date) / 7,
+            date_trunc('week', u.created_at)::date
+        FROM users u
+        JOIN (
+            SELECT user_id, date FROM incomes
+            UNION
+            SELECT user_id, date FROM expenses
+        ) t ON t.user_id = u.id
+        WHERE date_trunc('week', t.date)::date >= date_trunc('week', u.created_at)::date
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cohort_activity_cohort_offset', table_name='cohort_activity')
+    op.drop_table('cohort_activity')
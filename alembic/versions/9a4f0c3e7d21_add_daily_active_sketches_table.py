@@ -0,0 +1,50 @@
+"""add daily_active_sketches table
+
+Revision ID: 9a4f0c3e7d21
+Revises: 5e1d7a2c9b40
+Create Date: 2026-10-19 14:03:17.842260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services import hyperloglog
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f0c3e7d21'
+down_revision: Union[str, Sequence[str], None] = '5e1d7a2c9b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    sketches = op.create_table('daily_active_sketches',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('registers', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('day')
+    )
+
+    # Backfill one sketch per transaction date from existing history
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("""
+        SELECT date, array_agg(user_id) FROM (
+            SELECT date, user_id FROM incomes
+            UNION
+            SELECT date, user_id FROM expenses
+        ) t
+        GROUP BY date
+    """))
+    for day, user_ids in rows:
+        conn.execute(
+            sketches.insert().values(day=day, registers=hyperloglog.sketch_of(user_ids))
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_active_sketches')
@@ -0,0 +1,30 @@
+"""add keyset pagination indexes
+
+Revision ID: b7c2e94f1a63
+Revises: 9a4f0c3e7d21
+Create Date: 2026-10-19 16:41:05.117392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c2e94f1a63'
+down_revision: Union[str, Sequence[str], None] = '9a4f0c3e7d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_expense_user_date_id', 'expenses', ['user_id', 'date', 'id'], unique=False)
+    op.create_index('ix_income_user_date_id', 'incomes', ['user_id', 'date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_income_user_date_id', table_name='incomes')
+    op.drop_index('ix_expense_user_date_id', table_name='expenses')
@@ -0,0 +1,47 @@
+"""add transaction search vectors
+
+Revision ID: b8f3c1d6e492
+Revises: a4e7d2b91c56
+Create Date: 2026-10-19 21:32:14.806377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8f3c1d6e492'
+down_revision: Union[str, Sequence[str], None] = 'a4e7d2b91c56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Lets user_id (btree-style) and the tsvector share one GIN index
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+
+    op.add_column('expenses', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(
+        "setweight(to_tsvector('english', coalesce(category, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+        persisted=True
+    ), nullable=True))
+    op.add_column('incomes', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(
+        "setweight(to_tsvector('english', coalesce(source, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+        persisted=True
+    ), nullable=True))
+
+    op.create_index('ix_expense_user_search', 'expenses', ['user_id', 'search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_income_user_search', 'incomes', ['user_id', 'search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_income_user_search', table_name='incomes', postgresql_using='gin')
+    op.drop_index('ix_expense_user_search', table_name='expenses', postgresql_using='gin')
+    op.drop_column('incomes', 'search_vector')
+    op.drop_column('expenses', 'search_vector')
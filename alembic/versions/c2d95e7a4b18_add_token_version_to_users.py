@@ -0,0 +1,28 @@
+"""add token_version to users
+
+Revision ID: c2d95e7a4b18
+Revises: b8f3c1d6e492
+Create Date: 2026-10-19 22:04:51.330918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d95e7a4b18'
+down_revision: Union[str, Sequence[str], None] = 'b8f3c1d6e492'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), nullable=False, server_default=sa.text('0')))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,43 @@
+"""add transaction_counts table
+
+Revision ID: d3a81f6b5c27
+Revises: b7c2e94f1a63
+Create Date: 2026-10-19 17:26:52.640918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a81f6b5c27'
+down_revision: Union[str, Sequence[str], None] = 'b7c2e94f1a63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('transaction_counts',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('income_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('expense_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Backfill from existing rows
+    op.execute("""
+        INSERT INTO transaction_counts (user_id, income_count, expense_count)
+        SELECT u.id,
+               (SELECT COUNT(*) FROM incomes i WHERE i.user_id = u.id),
+               (SELECT COUNT(*) FROM expenses e WHERE e.user_id = u.id)
+        FROM users u
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('transaction_counts')
@@ -0,0 +1,42 @@
+"""add refresh_tokens table
+
+Revision ID: d7a4e8c35f01
+Revises: c2d95e7a4b18
+Create Date: 2026-10-19 22:41:08.914522
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a4e8c35f01'
+down_revision: Union[str, Sequence[str], None] = 'c2d95e7a4b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('refresh_tokens',
+    sa.Column('token_hash', sa.String(length=64), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('family_id', sa.String(length=32), nullable=False),
+    sa.Column('token_version', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('used_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('token_hash')
+    )
+    op.create_index('ix_refresh_token_expires', 'refresh_tokens', ['expires_at'], unique=False)
+    op.create_index('ix_refresh_token_family', 'refresh_tokens', ['family_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_refresh_token_family', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_token_expires', table_name='refresh_tokens')
+    op.drop_table('refresh_tokens')
@@ -0,0 +1,28 @@
+"""add income source index
+
+Revision ID: e6b04d8a2f19
+Revises: d3a81f6b5c27
+Create Date: 2026-10-19 18:02:33.905174
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b04d8a2f19'
+down_revision: Union[str, Sequence[str], None] = 'd3a81f6b5c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_income_user_source', 'incomes', ['user_id', 'source'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_income_user_source', table_name='incomes')
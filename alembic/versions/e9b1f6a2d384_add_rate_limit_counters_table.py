@@ -0,0 +1,36 @@
+"""add rate_limit_counters table
+
+Revision ID: e9b1f6a2d384
+Revises: d7a4e8c35f01
+Create Date: 2026-10-19 23:12:46.207153
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b1f6a2d384'
+down_revision: Union[str, Sequence[str], None] = 'd7a4e8c35f01'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rate_limit_counters',
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('key'),
+    prefixes=['UNLOGGED']
+    )
+    op.create_index('ix_rate_limit_counter_expires', 'rate_limit_counters', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rate_limit_counter_expires', table_name='rate_limit_counters')
+    op.drop_table('rate_limit_counters')
@@ -0,0 +1,46 @@
+"""add statement_imports table
+
+Revision ID: f1c9e35a7b08
+Revises: e6b04d8a2f19
+Create Date: 2026-10-19 19:48:10.226731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c9e35a7b08'
+down_revision: Union[str, Sequence[str], None] = 'e6b04d8a2f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('statement_imports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.Enum('pending', 'loading', 'processing', 'completed', 'failed', name='import_status_enum', create_constraint=True), nullable=False),
+    sa.Column('rows_received', sa.Integer(), nullable=False),
+    sa.Column('expenses_imported', sa.Integer(), nullable=False),
+    sa.Column('incomes_imported', sa.Integer(), nullable=False),
+    sa.Column('rows_rejected', sa.Integer(), nullable=False),
+    sa.Column('rejected_samples', sa.JSON(), nullable=True),
+    sa.Column('error', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_statement_import_user_created', 'statement_imports', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_statement_import_user_created', table_name='statement_imports')
+    op.drop_table('statement_imports')
+    sa.Enum(name='import_status_enum').drop(op.get_bind(), checkfirst=True)
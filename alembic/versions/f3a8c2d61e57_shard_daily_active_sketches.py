@@ -0,0 +1,51 @@
+"""shard daily_active_sketches
+
+Revision ID: f3a8c2d61e57
+Revises: e9b1f6a2d384
+Create Date: 2026-10-20 09:14:32.518406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services import hyperloglog
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c2d61e57'
+down_revision: Union[str, Sequence[str], None] = 'e9b1f6a2d384'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing per-day sketches become shard 0; merging on read keeps them valid
+    op.add_column('daily_active_sketches', sa.Column('shard', sa.SmallInteger(), server_default='0', nullable=False))
+    op.drop_constraint('daily_active_sketches_pkey', 'daily_active_sketches', type_='primary')
+    op.create_primary_key('daily_active_sketches_pkey', 'daily_active_sketches', ['day', 'shard'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fold every day's shards back into one sketch before dropping the column
+    conn = op.get_bind()
+    sketches = sa.table(
+        'daily_active_sketches',
+        sa.column('day', sa.Date()),
+        sa.column('shard', sa.SmallInteger()),
+        sa.column('registers', sa.LargeBinary()),
+    )
+    merged = {}
+    for day, registers in conn.execute(sa.select(sketches.c.day, sketches.c.registers)):
+        merged.setdefault(day, []).append(registers)
+
+    conn.execute(sketches.delete())
+    for day, shards in merged.items():
+        conn.execute(sketches.insert().values(day=day, shard=0, registers=hyperloglog.merge(shards)))
+
+    op.drop_constraint('daily_active_sketches_pkey', 'daily_active_sketches', type_='primary')
+    op.drop_column('daily_active_sketches', 'shard')
+    op.create_primary_key('daily_active_sketches_pkey', 'daily_active_sketches', ['day'])
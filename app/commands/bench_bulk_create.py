@@ -0,0 +1,84 @@
+"""
+Rows per second for creating expenses one at a time versus in bulk.
+
+    python -m app.commands.bench_bulk_create --rows 2000
+
+"Single" runs the POST /expense handler once per row: validation, one
+INSERT, the activity and counter bookkeeping, and a commit. "Bulk" sends
+the same rows through bulk_create_expenses, the service behind
+POST /expense/bulk, in batches of MAX_BULK_ITEMS. Both run in-process
+against the configured database (no HTTP). They write as a throwaway
+user, which is deleted afterwards with its rows.
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+from typing import Dict, List, get_args
+
+from app.commands.benchmarking import scratch_user
+from app.database import SessionLocal
+from app.models.user import User
+from app.routers.expense import add_expense
+from app.schemas.common import MAX_BULK_ITEMS
+from app.schemas.expense import ExpenseCategory, ExpenseCreate
+from app.services.transaction_service import bulk_create_expenses
+
+CATEGORIES = get_args(ExpenseCategory)
+
+
+def sample_items(rows: int) -> List[Dict]:
+    """Request-shaped expense items spread over the last 90 days."""
+    today = date.today()
+    return [
+        {
+            "amount": f"{i % 500 + 1}.00",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "necessity_type": "essential" if i % 3 else "non_essential",
+            "payment_method": "Cash",
+            "date": (today - timedelta(days=i % 90)).isoformat(),
+            "description": f"benchmark row {i}",
+        }
+        for i in range(rows)
+    ]
+
+
+def single_inserts(user: User, items: List[Dict]) -> float:
+    """Seconds to create every item through the single-expense handler."""
+    with SessionLocal() as db:
+        start = time.perf_counter()
+        for item in items:
+            add_expense(ExpenseCreate.model_validate(item), db=db, current_user=user, idempotency=None)
+        return time.perf_counter() - start
+
+
+def bulk_inserts(user: User, items: List[Dict]) -> float:
+    """Seconds to create every item through the bulk service."""
+    with SessionLocal() as db:
+        start = time.perf_counter()
+        for offset in range(0, len(items), MAX_BULK_ITEMS):
+            result = bulk_create_expenses(db, user.id, items[offset:offset + MAX_BULK_ITEMS])
+            assert not result["failed"], result["errors"]
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rows/sec, single vs bulk expense creation")
+    parser.add_argument("--rows", type=int, default=2000, help="Expenses to create per mode")
+    args = parser.parse_args()
+
+    items = sample_items(args.rows)
+
+    print(f"{'mode':<8} {'rows':>8} {'seconds':>9} {'rows/sec':>10}")
+    rates = {}
+    for mode, run in (("single", single_inserts), ("bulk", bulk_inserts)):
+        with scratch_user() as user:
+            elapsed = run(user, items)
+        rates[mode] = args.rows / elapsed
+        print(f"{mode:<8} {args.rows:>8} {elapsed:9.2f} {rates[mode]:10.0f}")
+
+    print(f"bulk is {rates['bulk'] / rates['single']:.1f}x single")
+
+
+if __name__ == "__main__":
+    main()
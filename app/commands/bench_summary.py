@@ -0,0 +1,187 @@
+"""
+Compare the Python-side cost of the summary queries before and after
+the move to cached select()/lambda statements.
+
+    python -m app.commands.bench_summary --calls 200
+    python -m app.commands.bench_summary --user-id 42
+
+Without --user-id it seeds a throwaway user (--rows expenses, a tenth as
+many incomes, bucket activity over six buckets and some bills) and
+deletes it afterwards.
+
+"Before" is the previous implementation: one legacy Query per
+aggregate, including four per bucket, reproduced in this module. "After"
+is the current service. Both run against the configured database with
+SQLAlchemy's normal compiled cache, so the difference is statement
+construction, cache-key generation and the number of round trips. The
+report is process CPU time per call, which excludes time spent waiting
+on Postgres.
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.commands.benchmarking import scratch_user, seed_buckets, seed_transactions
+from app.database import engine
+from app.models.bucket_activity import BucketActivity, ActivityType
+from app.models.committed_expense import CommittedExpense
+from app.models.custom_bucket import CustomBucket
+from app.models.expense import Expense
+from app.models.income import Income
+from app.services.bucket_service import calculate_all_bucket_balances
+from app.services.finance import (
+    calculate_daily_summary,
+    calculate_monthly_summary,
+    calculate_safe_to_spend,
+)
+
+
+# ==========================================================
+# PREVIOUS IMPLEMENTATIONS (query side only)
+# ==========================================================
+
+def _sum(db: Session, column, *criteria) -> Decimal:
+    value = db.query(func.coalesce(func.sum(column), 0)).filter(*criteria).scalar()
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _legacy_bucket_balance(db: Session, user_id: int, bucket_name: str) -> Decimal:
+    def activity(*types):
+        return _sum(
+            db, BucketActivity.amount,
+            BucketActivity.user_id == user_id,
+            BucketActivity.bucket_name == bucket_name,
+            BucketActivity.activity_type.in_(types)
+        )
+
+    return (
+        activity(ActivityType.allocation)
+        + activity(ActivityType.transfer_in)
+        - activity(ActivityType.withdrawal_transfer, ActivityType.withdrawal_expense)
+        - activity(ActivityType.transfer_out)
+    )
+
+
+def _legacy_bucket_protected(db: Session, user_id: int) -> Decimal:
+    names = (
+        db.query(BucketActivity.bucket_name)
+        .filter(BucketActivity.user_id == user_id)
+        .distinct()
+        .all()
+    )
+    balances = (_legacy_bucket_balance(db, user_id, name) for (name,) in names)
+    return sum((b for b in balances if b > 0), Decimal("0.00"))
+
+
+def legacy_daily_summary(db: Session, user_id: int):
+    today = date.today()
+    return (
+        _sum(db, Income.amount, Income.user_id == user_id, Income.date == today),
+        _sum(db, Expense.amount, Expense.user_id == user_id, Expense.date == today),
+    )
+
+
+def legacy_monthly_summary(db: Session, user_id: int):
+    today = date.today()
+    month_start = today.replace(day=1)
+    in_month = (Expense.user_id == user_id, Expense.date >= month_start)
+    return (
+        _sum(db, Income.amount, Income.user_id == user_id, Income.date >= month_start, Income.date <= today),
+        _sum(db, Expense.amount, *in_month, Expense.date <= today),
+        _sum(db, Expense.amount, *in_month, Expense.necessity_type == "essential"),
+        _sum(db, Expense.amount, *in_month, Expense.necessity_type == "non_essential"),
+        _sum(db, Expense.amount, *in_month, Expense.necessity_type == None),
+        db.query(Expense.category, func.coalesce(func.sum(Expense.amount), 0))
+        .filter(*in_month)
+        .group_by(Expense.category)
+        .all(),
+        _legacy_bucket_protected(db, user_id),
+    )
+
+
+def legacy_safe_to_spend(db: Session, user_id: int):
+    today = date.today()
+    month_start = today.replace(day=1)
+    return (
+        _sum(
+            db, Income.amount,
+            Income.user_id == user_id,
+            Income.date >= month_start,
+            ~Income.source.ilike('%bucket return%')
+        ),
+        _sum(db, Expense.amount, Expense.user_id == user_id, Expense.date >= month_start),
+        _sum(
+            db, CommittedExpense.amount,
+            CommittedExpense.user_id == user_id,
+            CommittedExpense.is_paid == False,
+            CommittedExpense.due_date <= today + timedelta(days=30)
+        ),
+        _legacy_bucket_protected(db, user_id),
+    )
+
+
+def legacy_bucket_balances(db: Session, user_id: int):
+    names = ["family", "freedom_fund", "emergency_buffer", "asset_building"]
+    names += [
+        cb.bucket_name
+        for cb in db.query(CustomBucket).filter(CustomBucket.user_id == user_id).all()
+    ]
+    return [_legacy_bucket_balance(db, user_id, name) for name in names]
+
+
+PAIRS = [
+    ("daily_summary", legacy_daily_summary, calculate_daily_summary),
+    ("monthly_summary", legacy_monthly_summary, calculate_monthly_summary),
+    ("safe_to_spend", legacy_safe_to_spend, calculate_safe_to_spend),
+    ("bucket_balances", legacy_bucket_balances, calculate_all_bucket_balances),
+]
+
+
+# ==========================================================
+# TIMING
+# ==========================================================
+
+def cpu_ms_per_call(service, user_id: int, calls: int) -> float:
+    """Mean process CPU milliseconds for one call, after one warm-up call."""
+    with Session(bind=engine) as db:
+        service(db, user_id)
+        start = time.process_time()
+        for _ in range(calls):
+            service(db, user_id)
+            # Drop loaded rows so each call does the same work
+            db.expire_all()
+        return (time.process_time() - start) / calls * 1000
+
+
+def report(user_id: int, calls: int) -> None:
+    print(f"{'summary':<20} {'before':>10} {'after':>10}  (CPU ms/call)")
+    for name, before, after in PAIRS:
+        before_ms = cpu_ms_per_call(before, user_id, calls)
+        after_ms = cpu_ms_per_call(after, user_id, calls)
+        print(f"{name:<20} {before_ms:10.3f} {after_ms:10.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CPU time per call, previous vs current summary queries")
+    parser.add_argument("--user-id", type=int, help="Existing user whose data to summarise")
+    parser.add_argument("--rows", type=int, default=5000, help="Expenses to seed when no --user-id is given")
+    parser.add_argument("--calls", type=int, default=200, help="Timed calls per implementation")
+    args = parser.parse_args()
+
+    if args.user_id is not None:
+        report(args.user_id, args.calls)
+        return
+
+    with scratch_user() as user:
+        seed_transactions(user.id, expenses=args.rows, incomes=args.rows // 10)
+        seed_buckets(user.id, activities=args.rows // 5, bills=40)
+        report(user.id, args.calls)
+
+
+if __name__ == "__main__":
+    main()
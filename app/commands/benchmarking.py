@@ -0,0 +1,172 @@
+"""
+Shared pieces for the bench_* and load_* commands.
+
+The load_* commands start their own uvicorn processes against the
+configured DATABASE_URL and drive them over HTTP with httpx
+(pip install -r requirements-dev.txt).
+"""
+
+import os
+import secrets
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+from sqlalchemy import text
+
+from app.core.security import create_access_token, hash_password
+from app.database import SessionLocal
+from app.models.user import User
+
+
+@contextmanager
+def scratch_user(password: str = None) -> Iterator[User]:
+    """
+    A throwaway user for a benchmark run. It is deleted on exit, and the
+    database cascades take everything it owns with it.
+    """
+    # Short sessions either side: a long run mustn't sit idle in a transaction
+    with SessionLocal(expire_on_commit=False) as db:
+        user = User(
+            full_name="Benchmark user",
+            email=f"bench-{secrets.token_hex(6)}@example.com",
+            hashed_password=hash_password(password or secrets.token_urlsafe(16))
+        )
+        db.add(user)
+        db.commit()
+
+    try:
+        yield user
+    finally:
+        with SessionLocal() as db:
+            db.query(User).filter(User.id == user.id).delete(synchronize_session=False)
+            db.commit()
+
+
+_SEED_EXPENSES = text("""
+    INSERT INTO expenses (user_id, amount, category, necessity_type, payment_method, date, description)
+    SELECT :user_id,
+           (n % 500) + 1,
+           (ARRAY['Food', 'Transport', 'Utilities', 'Health', 'Personal'])[n % 5 + 1],
+           (CASE WHEN n % 3 = 0 THEN 'non_essential' ELSE 'essential' END)::necessity_type_enum,
+           'Cash',
+           current_date - (n % 730),
+           'benchmark row ' || n
+    FROM generate_series(1, :rows) AS n
+""")
+
+_SEED_INCOMES = text("""
+    INSERT INTO incomes (user_id, amount, source, payment_method, date)
+    SELECT :user_id, (n % 900) + 100, 'Salary', 'Bank Transfer', current_date - (n % 730)
+    FROM generate_series(1, :rows) AS n
+""")
+
+
+def seed_transactions(user_id: int, expenses: int, incomes: int = 0) -> None:
+    """Bulk-load synthetic history for a user (bypasses the activity bookkeeping)."""
+    with SessionLocal() as db:
+        db.execute(_SEED_EXPENSES, {"user_id": user_id, "rows": expenses})
+        db.execute(_SEED_INCOMES, {"user_id": user_id, "rows": incomes})
+        db.commit()
+        db.execute(text("ANALYZE expenses, incomes"))
+
+
+_SEED_BUCKETS = text("""
+    INSERT INTO custom_buckets (user_id, bucket_name, label)
+    VALUES (:user_id, 'holiday', 'Holiday'), (:user_id, 'car', 'Car')
+""")
+
+# Mostly allocations, with every other activity type mixed in
+_SEED_BUCKET_ACTIVITY = text("""
+    INSERT INTO bucket_activities (user_id, bucket_name, activity_type, amount, date)
+    SELECT :user_id,
+           (ARRAY['family', 'freedom_fund', 'emergency_buffer', 'asset_building', 'holiday', 'car'])[n % 6 + 1],
+           (ARRAY['allocation', 'allocation', 'allocation', 'transfer_in', 'transfer_out',
+                  'withdrawal_transfer', 'withdrawal_expense'])[n % 7 + 1]::activity_type_enum,
+           (n % 200) + 10,
+           current_date - (n % 365)
+    FROM generate_series(1, :rows) AS n
+""")
+
+_SEED_BILLS = text("""
+    INSERT INTO committed_expenses (user_id, title, amount, due_date, is_recurring, is_paid)
+    SELECT :user_id, 'Bill ' || n, (n % 300) + 50, current_date + (n % 60) - 15, n % 2 = 0, n % 4 = 0
+    FROM generate_series(1, :rows) AS n
+""")
+
+
+def seed_buckets(user_id: int, activities: int, bills: int = 0) -> None:
+    """Two custom buckets, bucket activity spread over all six buckets, and bills."""
+    with SessionLocal() as db:
+        db.execute(_SEED_BUCKETS, {"user_id": user_id})
+        db.execute(_SEED_BUCKET_ACTIVITY, {"user_id": user_id, "rows": activities})
+        db.execute(_SEED_BILLS, {"user_id": user_id, "rows": bills})
+        db.commit()
+        db.execute(text("ANALYZE bucket_activities, committed_expenses"))
+
+
+def auth_headers(user: User) -> Dict[str, str]:
+    token = create_access_token(user_id=user.id, token_version=user.token_version)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def client_address() -> str:
+    """
+    A random client address for X-Forwarded-For. uvicorn trusts the header
+    from 127.0.0.1 by default, so each address gets its own rate-limit key.
+    """
+    return "10.{}.{}.{}".format(*secrets.token_bytes(3))
+
+
+@contextmanager
+def running_server(port: int = 8765, workers: int = 1, **settings) -> Iterator[str]:
+    """
+    Run `uvicorn app.main:app` with the given settings overriding the
+    environment; yields its base URL and stops it on exit.
+    """
+    env = {**os.environ, **{key: str(value) for key, value in settings.items()}}
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ],
+        env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        _wait_until_serving(base_url, process, workers)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def _wait_until_serving(base_url: str, process: subprocess.Popen, workers: int, timeout: float = 60.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+        try:
+            if httpx.get(base_url + "/", timeout=1.0).status_code == 200:
+                # The first worker answers while the rest may still be importing
+                time.sleep(2.0 * (workers - 1))
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"uvicorn did not start within {timeout}s")
+
+
+def percentiles(samples: List[float]) -> Tuple[float, float, float]:
+    """(p50, p95, max) of samples, in the same unit."""
+    if len(samples) < 2:
+        value = samples[0] if samples else float("nan")
+        return value, value, value
+    cuts = statistics.quantiles(samples, n=100)
+    return cuts[49], cuts[94], max(samples)
@@ -0,0 +1,60 @@
+"""
+Pick a bcrypt cost for this machine.
+
+    python -m app.commands.calibrate_bcrypt --target-ms 250
+
+Times a verify at increasing costs and prints the highest cost whose
+median verify time stays within the target. Put the result in .env as
+BCRYPT_ROUNDS; existing hashes are rehashed at the new cost on each
+user's next successful login.
+"""
+
+import argparse
+import statistics
+import time
+
+from passlib.hash import bcrypt
+
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+
+def time_verify(rounds: int, samples: int = 3) -> float:
+    """Median seconds for one verify at the given cost."""
+    hashed = bcrypt.using(rounds=rounds).hash("calibration-password")
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        bcrypt.verify("calibration-password", hashed)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def calibrate(target_seconds: float, samples: int = 3) -> int:
+    """Highest cost within target_seconds, never below MIN_ROUNDS."""
+    chosen = MIN_ROUNDS
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        elapsed = time_verify(rounds, samples)
+        print(f"  rounds={rounds:<3} verify={elapsed * 1000:8.1f} ms")
+        if elapsed > target_seconds:
+            break
+        chosen = rounds
+        # Each extra round doubles the work; skip timing one that can't fit
+        if elapsed * 2 > target_seconds:
+            break
+    return chosen
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Choose a bcrypt cost for this machine")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target verify time in milliseconds")
+    parser.add_argument("--samples", type=int, default=3, help="Timed verifies per cost")
+    args = parser.parse_args()
+
+    print(f"Calibrating bcrypt for a {args.target_ms:.0f} ms verify target...")
+    rounds = calibrate(args.target_ms / 1000, args.samples)
+    print(f"\nRecommended: BCRYPT_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
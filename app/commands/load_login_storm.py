@@ -0,0 +1,123 @@
+"""
+/summary/* latency with and without a concurrent login storm.
+
+    python -m app.commands.load_login_storm --readers 8 --logins 32 --seconds 20
+
+Starts one uvicorn worker and seeds a throwaway user with transaction
+history. The run then has two phases, each --seconds long:
+
+- quiet: --readers clients loop over the summary endpoints.
+- storm: the same readers, plus --logins clients posting real logins
+  as fast as they can.
+
+Each login comes from its own X-Forwarded-For address, so the per-IP
+5/minute limit doesn't answer them cheaply with 429. The report gives
+summary p50/p95/max latency per phase, plus how the logins were
+answered. Logins over PASSWORD_HASH_QUEUE_LIMIT should get a fast 503
+rather than slow the summaries.
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, List
+
+import httpx
+
+from app.commands.benchmarking import (
+    auth_headers,
+    client_address,
+    percentiles,
+    running_server,
+    scratch_user,
+    seed_transactions,
+)
+
+SUMMARY_PATHS = ["/summary/daily", "/summary/monthly", "/summary/safe-to-spend", "/summary/wealth-buckets"]
+PASSWORD = "load-test-password"
+
+
+async def read_summaries(client: httpx.AsyncClient, headers: Dict, stop: float, latencies: List[float], errors: Counter):
+    i = 0
+    while time.monotonic() < stop:
+        path = SUMMARY_PATHS[i % len(SUMMARY_PATHS)]
+        i += 1
+        start = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors[response.status_code] += 1
+
+
+async def log_in(client: httpx.AsyncClient, email: str, stop: float, latencies: List[float], statuses: Counter):
+    while time.monotonic() < stop:
+        start = time.perf_counter()
+        response = await client.post(
+            "/auth/login",
+            data={"username": email, "password": PASSWORD},
+            headers={"X-Forwarded-For": client_address()}
+        )
+        statuses[response.status_code] += 1
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - start)
+
+
+async def phase(base_url: str, user, readers: int, logins: int, seconds: float) -> Dict:
+    summary_latencies, login_latencies = [], []
+    summary_errors, login_statuses = Counter(), Counter()
+    headers = auth_headers(user)
+
+    limits = httpx.Limits(max_connections=readers + logins)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        stop = time.monotonic() + seconds
+        await asyncio.gather(
+            *(read_summaries(client, headers, stop, summary_latencies, summary_errors) for _ in range(readers)),
+            *(log_in(client, user.email, stop, login_latencies, login_statuses) for _ in range(logins)),
+        )
+
+    return {
+        "summary": percentiles(summary_latencies),
+        "summary_rps": len(summary_latencies) / seconds,
+        "summary_errors": dict(summary_errors),
+        "login": percentiles(login_latencies),
+        "login_statuses": dict(login_statuses),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Summary latency during a login storm")
+    parser.add_argument("--readers", type=int, default=8, help="Concurrent summary clients")
+    parser.add_argument("--logins", type=int, default=32, help="Concurrent login clients during the storm")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Length of each phase")
+    parser.add_argument("--rows", type=int, default=5000, help="Expenses and incomes seeded for the user")
+    args = parser.parse_args()
+
+    with scratch_user(PASSWORD) as user, running_server() as base_url:
+        seed_transactions(user.id, expenses=args.rows, incomes=args.rows // 10)
+
+        # Warm up connections and the compiled-statement cache
+        asyncio.run(phase(base_url, user, args.readers, 0, 2.0))
+
+        results = {
+            "quiet": asyncio.run(phase(base_url, user, args.readers, 0, args.seconds)),
+            "storm": asyncio.run(phase(base_url, user, args.readers, args.logins, args.seconds)),
+        }
+
+    print(f"{'phase':<7} {'summary p50':>12} {'p95':>8} {'max':>8} {'req/s':>7}   logins (status: count)")
+    for name, result in results.items():
+        p50, p95, worst = result["summary"]
+        print(
+            f"{name:<7} {p50 * 1000:10.1f}ms {p95 * 1000:6.1f}ms {worst * 1000:6.1f}ms "
+            f"{result['summary_rps']:7.1f}   {result['login_statuses'] or '-'}"
+        )
+        if result["summary_errors"]:
+            print(f"        summary errors (status: count): {result['summary_errors']}")
+
+    login_p50, login_p95, _ = results["storm"]["login"]
+    print(f"successful logins during the storm: p50 {login_p50 * 1000:.0f}ms, p95 {login_p95 * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Check that rate limits hold exactly across several workers sharing
+database:// storage.
+
+    python -m app.commands.load_rate_limits --workers 4 --burst 60 --rounds 5
+
+Starts --workers uvicorn workers with RATE_LIMIT_STORAGE_URI=database://
+(or --storage). Each round sends --burst concurrent requests to each
+limited route from one fresh X-Forwarded-For address, every request on a
+new connection so the workers share the burst. Then it counts how many got past the
+limiter, i.e. were not 429. A round passes when that count equals the
+limit: 5 for /auth/login and 3 for /auth/register. Users created by
+register are deleted afterwards. Exits 1 if any round fails.
+"""
+
+import argparse
+import asyncio
+import secrets
+import sys
+from collections import Counter
+from typing import Callable, Dict
+
+import httpx
+
+from app.commands.benchmarking import client_address, running_server
+from app.database import SessionLocal
+from app.models.user import User
+
+
+def login_request(run_id: str, i: int) -> Dict:
+    return {"url": "/auth/login", "data": {"username": f"nobody-{run_id}@example.com", "password": "wrong"}}
+
+
+def register_request(run_id: str, i: int) -> Dict:
+    return {
+        "url": "/auth/register",
+        "json": {
+            "full_name": "Rate limit check",
+            "email": f"ratelimit-{run_id}-{i}@example.com",
+            "password": secrets.token_urlsafe(12),
+        },
+    }
+
+
+# (route, limit per window, request builder)
+LIMITED_ROUTES = [
+    ("/auth/login", 5, login_request),
+    ("/auth/register", 3, register_request),
+]
+
+
+async def burst(base_url: str, size: int, build: Callable[[str, int], Dict], run_id: str) -> Counter:
+    headers = {"X-Forwarded-For": client_address()}
+    # No keep-alive: every request is a new connection, accepted by whichever worker is free
+    limits = httpx.Limits(max_connections=size, max_keepalive_connections=0)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        responses = await asyncio.gather(*(
+            client.post(headers=headers, **build(run_id, i)) for i in range(size)
+        ))
+    return Counter(response.status_code for response in responses)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shared rate limits across workers")
+    parser.add_argument("--workers", type=int, default=4, help="uvicorn worker processes")
+    parser.add_argument("--burst", type=int, default=60, help="Concurrent requests per route per round")
+    parser.add_argument("--rounds", type=int, default=5, help="Bursts per route, each from a new address")
+    parser.add_argument(
+        "--storage", default="database://",
+        help="RATE_LIMIT_STORAGE_URI for the workers (memory:// shows per-worker counting)"
+    )
+    args = parser.parse_args()
+
+    run_id = secrets.token_hex(4)
+    failures = 0
+
+    try:
+        with running_server(workers=args.workers, RATE_LIMIT_STORAGE_URI=args.storage) as base_url:
+            print(f"{'route':<16} {'round':>5} {'limit':>5} {'allowed':>8}   statuses")
+            for route, limit, build in LIMITED_ROUTES:
+                for round_number in range(1, args.rounds + 1):
+                    statuses = asyncio.run(burst(base_url, args.burst, build, f"{run_id}-{round_number}"))
+                    allowed = sum(count for status, count in statuses.items() if status != 429)
+                    failures += allowed != limit
+                    print(
+                        f"{route:<16} {round_number:>5} {limit:>5} {allowed:>8}   "
+                        f"{dict(sorted(statuses.items()))}{'' if allowed == limit else '  MISMATCH'}"
+                    )
+    finally:
+        with SessionLocal() as db:
+            db.query(User).filter(
+                User.email.like(f"ratelimit-{run_id}-%")
+            ).delete(synchronize_session=False)
+            db.commit()
+
+    print("limits held exactly" if not failures else f"{failures} round(s) let the wrong number through")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
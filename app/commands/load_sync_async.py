@@ -0,0 +1,96 @@
+"""
+Requests per second of one worker serving the read endpoints sync
+(psycopg2 on the threadpool) versus async (DATABASE_ASYNC, asyncpg).
+
+    python -m app.commands.load_sync_async --clients 32 --seconds 20
+
+Seeds a throwaway user with transaction history. For each mode it then
+starts one uvicorn worker, warms it up, and has --clients concurrent
+clients loop over the summary, listing and balance endpoints for
+--seconds. It reports requests/sec, p50/p95/max latency and any
+non-200 responses. Needs the asyncpg package for the async run.
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import Dict
+
+import httpx
+
+from app.commands.benchmarking import (
+    auth_headers,
+    percentiles,
+    running_server,
+    scratch_user,
+    seed_transactions,
+)
+
+READ_PATHS = [
+    "/summary/daily",
+    "/summary/monthly",
+    "/summary/safe-to-spend",
+    "/buckets/balances",
+    "/expense?limit=50",
+    "/income?limit=50",
+]
+
+
+async def drive(base_url: str, headers: Dict, clients: int, seconds: float) -> Dict:
+    latencies, errors = [], Counter()
+
+    async def client_loop(client: httpx.AsyncClient, offset: int):
+        i = offset
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            path = READ_PATHS[i % len(READ_PATHS)]
+            i += 1
+            try:
+                response = await client.get(path, headers=headers)
+            except httpx.TransportError as exc:
+                # e.g. a keep-alive connection the server closed as it was reused
+                errors[type(exc).__name__] += 1
+                continue
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors[response.status_code] += 1
+
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        stop = time.monotonic() + seconds
+        await asyncio.gather(*(client_loop(client, n) for n in range(clients)))
+
+    return {"rps": len(latencies) / seconds, "latency": percentiles(latencies), "errors": dict(errors)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Read requests/sec per worker, sync vs async engine")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Measured run length per mode")
+    parser.add_argument("--rows", type=int, default=5000, help="Expenses and incomes seeded for the user")
+    args = parser.parse_args()
+
+    results = {}
+    with scratch_user() as user:
+        seed_transactions(user.id, expenses=args.rows, incomes=args.rows // 10)
+        headers = auth_headers(user)
+
+        for mode, database_async in (("sync", "false"), ("async", "true")):
+            with running_server(DATABASE_ASYNC=database_async) as base_url:
+                asyncio.run(drive(base_url, headers, args.clients, 3.0))
+                results[mode] = asyncio.run(drive(base_url, headers, args.clients, args.seconds))
+
+    print(f"{'mode':<6} {'req/s':>8} {'p50':>9} {'p95':>9} {'max':>9}   errors")
+    for mode, result in results.items():
+        p50, p95, worst = result["latency"]
+        print(
+            f"{mode:<6} {result['rps']:8.1f} {p50 * 1000:7.1f}ms {p95 * 1000:7.1f}ms "
+            f"{worst * 1000:7.1f}ms   {result['errors'] or '-'}"
+        )
+    print(f"async/sync: {results['async']['rps'] / results['sync']['rps']:.2f}x requests/sec per worker")
+
+
+if __name__ == "__main__":
+    main()
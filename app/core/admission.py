@@ -0,0 +1,113 @@
+import asyncio
+import json
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+
+# =========================
+# Admission control
+# =========================
+# Caps in-flight requests per route class so a slow class (e.g. a heavy
+# admin report) cannot take every worker thread and pooled connection
+# from user-facing endpoints. A request waits up to the queue timeout
+# for a slot, then gets 503 with Retry-After.
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+class _RouteClass:
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def snapshot(self) -> Dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+_route_classes: Dict[str, _RouteClass] = {
+    "admin": _RouteClass("admin", settings.ADMISSION_ADMIN_LIMIT),
+    "summary": _RouteClass("summary", settings.ADMISSION_SUMMARY_LIMIT),
+    "auth": _RouteClass("auth", settings.ADMISSION_AUTH_LIMIT),
+    "write": _RouteClass("write", settings.ADMISSION_WRITE_LIMIT),
+}
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """Route class for a request, or None for unlimited (e.g. plain reads)."""
+    if path.startswith("/admin"):
+        return "admin"
+    if path.startswith("/summary"):
+        return "summary"
+    if path.startswith("/auth"):
+        return "auth"
+    if method in WRITE_METHODS:
+        return "write"
+    return None
+
+
+def admission_metrics() -> Dict[str, Dict]:
+    return {name: route_class.snapshot() for name, route_class in _route_classes.items()}
+
+
+class AdmissionControlMiddleware:
+    """Pure ASGI so the slot is held until a streamed body has been sent."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        name = classify(scope["method"], scope["path"])
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = _route_classes[name]
+        route_class.waiting += 1
+        try:
+            await asyncio.wait_for(
+                route_class.semaphore.acquire(),
+                timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            route_class.rejected += 1
+            await self._reject(send)
+            return
+        finally:
+            route_class.waiting -= 1
+
+        route_class.admitted += 1
+        route_class.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route_class.in_flight -= 1
+            route_class.semaphore.release()
+
+    async def _reject(self, send) -> None:
+        body = json.dumps({"detail": "Server is busy. Please retry shortly."}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode("ascii")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
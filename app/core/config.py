@@ -1,5 +1,7 @@
 # app/core/config.py
 
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,13 +14,82 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    REFRESH_TOKEN_PURGE_INTERVAL_SECONDS: float = 300.0
+
+    # Authenticated-user cache; bounds how long a revoked token can still
+    # be accepted by another worker process
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    USER_CACHE_SIZE: int = 1024
+
+    # Admission control: max in-flight requests per route class; requests
+    # wait up to the queue timeout for a slot, then get 503 + Retry-After
+    ADMISSION_ADMIN_LIMIT: int = 2
+    ADMISSION_SUMMARY_LIMIT: int = 16
+    ADMISSION_AUTH_LIMIT: int = 8
+    ADMISSION_WRITE_LIMIT: int = 16
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 2
+
+    # bcrypt cost; pick it per machine with `python -m app.commands.calibrate_bcrypt`
+    BCRYPT_ROUNDS: int = 12
+
+    # bcrypt runs on its own pool; requests beyond the queue limit get 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
 
     # Database
     DATABASE_URL: str
 
+    # Connection pool (per process, per engine)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Compiled SQL kept per engine, and prepared statements kept per
+    # asyncpg connection (DATABASE_ASYNC only)
+    DB_QUERY_CACHE_SIZE: int = 500
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+
+    # Server-side guards applied to every connection (0 disables)
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = 60000
+
+    # AnyIO threads that run sync endpoints and dependencies. Each may hold
+    # a connection, as may the 3 admin dashboard workers, so keep this
+    # within DB_POOL_SIZE + DB_MAX_OVERFLOW - 3 (a startup warning fires
+    # otherwise).
+    ANYIO_THREAD_LIMIT: int = 17
+
+    # Serve summary, listing and balance endpoints from an asyncpg engine
+    # (same DATABASE_URL; needs the asyncpg package)
+    DATABASE_ASYNC: bool = False
+
+    DATABASE_REPLICA_URL: Optional[str] = None
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_HEALTH_CHECK_SECONDS: float = 5.0
+    REPLICA_STICKY_SECONDS: float = 30.0
+
+    # Rate limiting: memory:// (per worker), database:// (shared via Postgres) or redis://
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
+
+    # database:// only: the limiter's own connection pool (per worker)
+    RATE_LIMIT_DB_POOL_SIZE: int = 2
+    RATE_LIMIT_DB_MAX_OVERFLOW: int = 2
+    RATE_LIMIT_DB_POOL_TIMEOUT_SECONDS: float = 1.0
+
     # Password reset
     PASSWORD_RESET_EXPIRE_MINUTES: int = 30
 
+    # Admin dashboard
+    ADMIN_SECTION_TIMEOUT_SECONDS: float = 10.0
+
+    # Idempotency-Key replay window
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 300.0
+
     model_config = SettingsConfigDict(
         env_file=".env",
         extra="forbid",  
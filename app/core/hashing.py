@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.security import hash_password, verify_password, verify_and_update_password
+
+
+# =========================
+# Bounded bcrypt executor
+# =========================
+# bcrypt is deliberately slow. Running it on FastAPI's shared threadpool
+# lets a login burst starve every other endpoint, so hashing gets its
+# own small pool. Callers await the result without holding a threadpool
+# thread, and once PASSWORD_HASH_QUEUE_LIMIT requests are waiting new
+# ones are turned away with 503 instead of queueing indefinitely.
+
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+
+_stats_lock = threading.Lock()
+_stats = {
+    "queued": 0,
+    "running": 0,
+    "completed": 0,
+    "rejected": 0,
+    "total_seconds": 0.0,
+    "max_seconds": 0.0,
+}
+
+
+def _timed(fn: Callable, *args) -> Any:
+    with _stats_lock:
+        _stats["queued"] -= 1
+        _stats["running"] += 1
+
+    start = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        elapsed = time.perf_counter() - start
+        with _stats_lock:
+            _stats["running"] -= 1
+            _stats["completed"] += 1
+            _stats["total_seconds"] += elapsed
+            _stats["max_seconds"] = max(_stats["max_seconds"], elapsed)
+
+
+def _drop_cancelled(future) -> None:
+    # A request cancelled before its job started never reaches _timed
+    if future.cancelled():
+        with _stats_lock:
+            _stats["queued"] -= 1
+
+
+async def _run(fn: Callable, *args) -> Any:
+    with _stats_lock:
+        if _stats["queued"] >= settings.PASSWORD_HASH_QUEUE_LIMIT:
+            _stats["rejected"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-in requests right now. Please try again shortly.",
+                headers={"Retry-After": "1"},
+            )
+        _stats["queued"] += 1
+
+    future = _hash_executor.submit(_timed, fn, *args)
+    future.add_done_callback(_drop_cancelled)
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await _run(verify_and_update_password, plain_password, hashed_password)
+
+
+def password_hash_metrics() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+
+    completed = stats["completed"]
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "queue_limit": settings.PASSWORD_HASH_QUEUE_LIMIT,
+        "queue_depth": stats["queued"],
+        "running": stats["running"],
+        "completed": completed,
+        "rejected": stats["rejected"],
+        "avg_hash_ms": round(stats["total_seconds"] / completed * 1000, 2) if completed else None,
+        "max_hash_ms": round(stats["max_seconds"] * 1000, 2),
+    }
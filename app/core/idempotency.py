@@ -0,0 +1,46 @@
+from typing import Iterator, Optional
+
+from fastapi import Depends, Header, Request
+from sqlalchemy.orm import Session
+
+from app.core.security import get_current_user
+from app.database import get_db
+from app.models.user import User
+from app.services.idempotency import (
+    IdempotencyClaim,
+    claim_idempotency_key,
+    release_idempotency_key
+)
+
+
+# =========================
+# Idempotency-Key dependency
+# =========================
+
+def idempotency_key(
+    request: Request,
+    key: Optional[str] = Header(None, alias="Idempotency-Key", min_length=1, max_length=255),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> Iterator[Optional[IdempotencyClaim]]:
+    """
+    Claim the request's Idempotency-Key, or replay the stored response.
+    Yields None when the header is absent. If the handler fails the claim
+    is released so the same key can be retried.
+    """
+    if key is None:
+        yield None
+        return
+
+    claim = claim_idempotency_key(
+        db,
+        current_user.id,
+        key,
+        f"{request.method} {request.url.path}"
+    )
+    try:
+        yield claim
+    except Exception:
+        db.rollback()
+        release_idempotency_key(db, claim)
+        raise
@@ -1,4 +1,14 @@
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-limiter = Limiter(key_func=get_remote_address)
+from app.core.config import settings
+# Registers the "database://" storage scheme with limits
+from app.core import rate_limit_storage  # noqa: F401
+
+# memory:// keeps per-worker counters; use database:// (or redis://)
+# so every worker enforces the same limits
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    in_memory_fallback_enabled=settings.RATE_LIMIT_STORAGE_URI != "memory://"
+)
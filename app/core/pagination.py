@@ -0,0 +1,56 @@
+import base64
+import binascii
+import json
+from datetime import date
+from typing import Any, List, Tuple
+
+from fastapi import HTTPException, status
+
+
+# =========================
+# Keyset cursors
+# =========================
+# A cursor marks the last row of a page in (date desc, id desc) order,
+# or (rank desc, id desc) for search results.
+# It is opaque to clients: base64url-encoded JSON.
+
+def _encode(values: List[Any]) -> str:
+    payload = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str) -> Any:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+
+def encode_cursor(row_date: date, row_id: int) -> str:
+    return _encode([row_date.isoformat(), row_id])
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        row_date, row_id = _decode(cursor)
+        return date.fromisoformat(row_date), int(row_id)
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise _invalid_cursor()
+
+
+def encode_rank_cursor(rank: float, row_id: int) -> str:
+    # JSON keeps a float8 exactly; search ranks are cast to float8 to match
+    return _encode([rank, row_id])
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        rank, row_id = _decode(cursor)
+        return float(rank), int(row_id)
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise _invalid_cursor()
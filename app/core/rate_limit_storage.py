@@ -0,0 +1,131 @@
+"""
+Postgres-backed storage for slowapi / limits, selected with
+RATE_LIMIT_STORAGE_URI=database://
+
+Counters live in the UNLOGGED rate_limit_counters table on the primary
+database, so every worker (and a restarted one) enforces the same
+limits without running Redis. Each hit is one atomic upsert.
+
+The limiter has its own small connection pool, so a flood of limited
+requests (e.g. logins) can't starve the application pool, and a full
+limiter pool fails fast instead of queueing.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from limits.storage import Storage
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PURGE_INTERVAL_SECONDS = 60.0
+PURGE_BATCH_SIZE = 1000
+
+# Starts a fresh window once the previous one has expired, otherwise adds
+_INCR = text("""
+    INSERT INTO rate_limit_counters AS c (key, count, expires_at)
+    VALUES (:key, :amount, now() + make_interval(secs => :expiry))
+    ON CONFLICT (key) DO UPDATE SET
+        count = CASE WHEN c.expires_at <= now()
+                     THEN EXCLUDED.count ELSE c.count + EXCLUDED.count END,
+        expires_at = CASE WHEN c.expires_at <= now()
+                          THEN EXCLUDED.expires_at ELSE c.expires_at END
+    RETURNING count
+""")
+
+_GET = text("""
+    SELECT count FROM rate_limit_counters
+    WHERE key = :key AND expires_at > now()
+""")
+
+_GET_EXPIRY = text("""
+    SELECT extract(epoch FROM expires_at) FROM rate_limit_counters
+    WHERE key = :key AND expires_at > now()
+""")
+
+_PURGE = text("""
+    DELETE FROM rate_limit_counters
+    WHERE key IN (
+        SELECT key FROM rate_limit_counters
+        WHERE expires_at <= now()
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+""")
+
+
+class DatabaseStorage(Storage):
+    """Fixed-window counters in Postgres (limits storage scheme "database")."""
+
+    STORAGE_SCHEME = ["database"]
+
+    def __init__(self, uri: Optional[str] = None, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._engine = create_engine(
+            settings.DATABASE_URL,
+            pool_size=settings.RATE_LIMIT_DB_POOL_SIZE,
+            max_overflow=settings.RATE_LIMIT_DB_MAX_OVERFLOW,
+            pool_timeout=settings.RATE_LIMIT_DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+        self._last_purge = 0.0
+        self._purge_lock = threading.Lock()
+
+    @property
+    def base_exceptions(self):
+        return SQLAlchemyError
+
+    def incr(self, key: str, expiry: int, amount: int = 1, **kwargs) -> int:
+        with self._engine.begin() as conn:
+            count = conn.execute(
+                _INCR, {"key": key, "amount": amount, "expiry": expiry}
+            ).scalar_one()
+        self._maybe_purge()
+        return count
+
+    def get(self, key: str) -> int:
+        with self._engine.connect() as conn:
+            return conn.execute(_GET, {"key": key}).scalar() or 0
+
+    def get_expiry(self, key: str) -> float:
+        with self._engine.connect() as conn:
+            expiry = conn.execute(_GET_EXPIRY, {"key": key}).scalar()
+        return float(expiry) if expiry is not None else time.time()
+
+    def check(self) -> bool:
+        try:
+            with self._engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return True
+        except SQLAlchemyError:
+            return False
+
+    def reset(self) -> Optional[int]:
+        with self._engine.begin() as conn:
+            return conn.execute(text("DELETE FROM rate_limit_counters")).rowcount
+
+    def clear(self, key: str) -> None:
+        with self._engine.begin() as conn:
+            conn.execute(text("DELETE FROM rate_limit_counters WHERE key = :key"), {"key": key})
+
+    def _maybe_purge(self) -> None:
+        """Drop one batch of expired windows at most once per interval."""
+        now = time.monotonic()
+        with self._purge_lock:
+            if now - self._last_purge < PURGE_INTERVAL_SECONDS:
+                return
+            self._last_purge = now
+
+        # Housekeeping only: a failed purge must not fail the hit that triggered it
+        try:
+            with self._engine.begin() as conn:
+                conn.execute(_PURGE, {"batch_size": PURGE_BATCH_SIZE})
+        except SQLAlchemyError:
+            logger.warning("Purging expired rate-limit counters failed", exc_info=True)
@@ -0,0 +1,54 @@
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import (
+    get_current_user,
+    get_user_read_db,
+    get_current_user_async,
+    get_user_async_read_db,
+)
+from app.models.user import User
+
+
+# =========================
+# Per-user read endpoints
+# =========================
+# Summary, listing and balance endpoints are thin wrappers around a sync
+# service(db, user_id, **params). With DATABASE_ASYNC enabled they are
+# served from the async engine instead: the service runs inside
+# AsyncSession.run_sync, so the endpoint holds no worker thread while it
+# waits on the database.
+
+def _no_params() -> Dict[str, Any]:
+    return {}
+
+
+def user_read_endpoint(service: Callable, params: Optional[Callable] = None) -> Callable:
+    """
+    Build the endpoint for service(db, user_id, **params()).
+
+    `params` is a dependency returning the service's keyword arguments
+    (typically the route's query parameters).
+    """
+    params_dependency = Depends(params or _no_params)
+
+    if not settings.DATABASE_ASYNC:
+        def endpoint(
+            kwargs: dict = params_dependency,
+            db: Session = Depends(get_user_read_db),
+            current_user: User = Depends(get_current_user)
+        ):
+            return service(db, current_user.id, **kwargs)
+
+    else:
+        async def endpoint(
+            kwargs: dict = params_dependency,
+            db=Depends(get_user_async_read_db),
+            current_user: User = Depends(get_current_user_async)
+        ):
+            return await db.run_sync(service, current_user.id, **kwargs)
+
+    return endpoint
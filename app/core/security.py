@@ -1,5 +1,8 @@
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
@@ -8,7 +11,7 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.database import get_db
+from app.database import get_db, read_session, get_async_db, async_read_session
 from app.models.user import User
 
 
@@ -16,28 +19,41 @@ from app.models.user import User
 # Password hashing
 # =========================
 
+# Pinning min and max to the configured cost makes needs_update() flag
+# any stored hash made with a different cost, so logins migrate it.
 pwd_context = CryptContext(
     schemes=["bcrypt"],
-    deprecated="auto"
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
 )
 
 
+def _truncate(password: str) -> str:
+    return password.encode("utf-8")[:72].decode("utf-8", errors="ignore")
+
+
 def hash_password(password: str) -> str:
-    safe_password = password.encode("utf-8")[:72].decode("utf-8", errors="ignore")
-    return pwd_context.hash(safe_password)
+    return pwd_context.hash(_truncate(password))
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    safe_password = plain_password.encode("utf-8")[:72].decode("utf-8", errors="ignore")
-    return pwd_context.verify(safe_password, hashed_password)
+    return pwd_context.verify(_truncate(plain_password), hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify, and return a replacement hash if the stored one uses an outdated cost."""
+    return pwd_context.verify_and_update(_truncate(plain_password), hashed_password)
 
 # =========================
 # JWT Token creation
 # =========================
 
 def create_access_token(
-    user_id: dict,
-    expires_delta: Optional[timedelta] = None
+    user_id: int,
+    expires_delta: Optional[timedelta] = None,
+    token_version: int = 0
 ) -> str:
     expire = datetime.utcnow() + (
         expires_delta
@@ -48,7 +64,8 @@ def create_access_token(
     payload = {
         "sub": str(user_id),
         "exp": expire,
-        "iat": datetime.utcnow()
+        "iat": datetime.utcnow(),
+        "ver": token_version
     }
 
     return jwt.encode(
@@ -68,20 +85,86 @@ oauth2_scheme = OAuth2PasswordBearer(
     )
 
 
+# =========================
+# Authenticated-user cache
+# =========================
+# Per-process LRU of users keyed by id. An entry is only used while its
+# token_version matches the token's "ver" claim, so bumping the version
+# revokes immediately in this process and within USER_CACHE_TTL_SECONDS
+# everywhere else.
+
+_user_cache: "OrderedDict[int, tuple]" = OrderedDict()
+_user_cache_lock = threading.Lock()
+
+
+def _cached_user(user_id: int, token_version: int) -> Optional[User]:
+    with _user_cache_lock:
+        entry = _user_cache.get(user_id)
+        if entry is None:
+            return None
+        expires, user = entry
+        if expires <= time.monotonic():
+            del _user_cache[user_id]
+            return None
+        if user.token_version != token_version:
+            return None
+        _user_cache.move_to_end(user_id)
+        return user
+
+
+def _cache_user(user: User) -> User:
+    """Cache and return a transient copy of the user: no password hash, never attached to a session."""
+    snapshot = User(
+        id=user.id,
+        full_name=user.full_name,
+        email=user.email,
+        is_admin=user.is_admin,
+        token_version=user.token_version,
+        created_at=user.created_at
+    )
+    with _user_cache_lock:
+        _user_cache[user.id] = (time.monotonic() + settings.USER_CACHE_TTL_SECONDS, snapshot)
+        _user_cache.move_to_end(user.id)
+        while len(_user_cache) > settings.USER_CACHE_SIZE:
+            _user_cache.popitem(last=False)
+    return snapshot
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
+def revoke_user_tokens(db: Session, user_id: int) -> bool:
+    """
+    Invalidate every access and refresh token issued to the user so far.
+    Commits. Returns False if there is no such user.
+    """
+    updated = db.query(User).filter(User.id == user_id).update(
+        {User.token_version: User.token_version + 1},
+        synchronize_session=False
+    )
+    db.commit()
+    invalidate_cached_user(user_id)
+    return bool(updated)
+
+
 # =========================
 # Get current authenticated user
 # =========================
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def _decode_access_token(token: str) -> Tuple[int, int]:
+    """Validate an access token and return (user_id, token_version)."""
+    credentials_exception = _credentials_exception()
+
     try:
         payload = jwt.decode(
             token,
@@ -102,19 +185,80 @@ def get_current_user(
 
         try:
             user_id = int(sub)
+            # Tokens issued before versioning count as version 0
+            token_version = int(payload.get("ver", 0))
         except (TypeError, ValueError):
             raise credentials_exception
 
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
+    return user_id, token_version
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    user_id, token_version = _decode_access_token(token)
+
+    # Fast path: no database round trip while the cached version matches
+    user = _cached_user(user_id, token_version)
 
     if user is None:
-        raise credentials_exception
+        # Primary-key get reuses SQLAlchemy's cached identity-lookup statement
+        user = db.get(User, user_id)
+
+        if user is None or user.token_version != token_version:
+            raise _credentials_exception()
+
+        user = _cache_user(user)
+        # Return the connection now rather than holding it next to the
+        # read session's for the rest of the request
+        db.rollback()
+
+    # Lets the session remember this user as a recent writer (replica routing)
+    db.info["user_id"] = user.id
+
+    return user
+
+
+def get_user_read_db(current_user: User = Depends(get_current_user)):
+    """
+    Read-only session for the current user's data. Uses the replica unless
+    it is down, lagging, or the user wrote recently (read-your-writes).
+    """
+    yield from read_session(current_user.id)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db=Depends(get_async_db)
+) -> User:
+    """get_current_user for endpoints served from the async engine."""
+    user_id, token_version = _decode_access_token(token)
+
+    user = _cached_user(user_id, token_version)
+
+    if user is None:
+        user = await db.get(User, user_id)
+
+        if user is None or user.token_version != token_version:
+            raise _credentials_exception()
+
+        user = _cache_user(user)
+        await db.rollback()
+
+    db.info["user_id"] = user.id
 
     return user
 
+
+async def get_user_async_read_db(current_user: User = Depends(get_current_user_async)):
+    """Async counterpart of get_user_read_db."""
+    async for db in async_read_session(current_user.id):
+        yield db
+
 def get_current_admin(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -0,0 +1,60 @@
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List
+
+
+# =========================
+# CSV / NDJSON encoding
+# =========================
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _plain(value: Any) -> Any:
+    """JSON-safe scalar for enums, dates and decimals."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_records(
+    records: Iterable[Dict[str, Any]],
+    fields: List[str],
+    export_format: str = "csv",
+    batch_size: int = 1000,
+    include_header: bool = True
+) -> Iterator[str]:
+    """
+    Encode records as CSV (with header) or NDJSON, yielding one chunk of
+    text per `batch_size` records so only a single batch is ever buffered.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+    if export_format == "csv" and include_header:
+        writer.writeheader()
+
+    for i, record in enumerate(records, start=1):
+        record = {key: _plain(value) for key, value in record.items()}
+        if export_format == "csv":
+            writer.writerow(record)
+        else:
+            buffer.write(json.dumps(record))
+            buffer.write("\n")
+
+        if i % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
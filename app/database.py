@@ -1,18 +1,69 @@
 # app/database.py  
 
-import os
-from sqlalchemy import create_engine
+import logging
+import threading
+import time
+from anyio import to_thread
+from sqlalchemy import create_engine, event, make_url, text
 from sqlalchemy.orm import sessionmaker, declarative_base
-from dotenv import load_dotenv
+from sqlalchemy.pool import QueuePool
 
-load_dotenv()
+from app.core.config import settings
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+logger = logging.getLogger(__name__)
 
-if not DATABASE_URL:
-    raise RuntimeError("DATABASE_URL environment variable not set")
+DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+
+def _server_settings() -> dict:
+    settings_ = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        settings_["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    if settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS:
+        settings_["idle_in_transaction_session_timeout"] = str(settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS)
+    return settings_
+
+
+def _shared_options() -> dict:
+    return {
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _engine_options() -> dict:
+    """Pool and server-side timeout settings shared by primary and replica."""
+    options = " ".join(f"-c {name}={value}" for name, value in _server_settings().items())
+    return {
+        **_shared_options(),
+        "connect_args": {"options": options} if options else {},
+    }
+
+
+_pool_stats_lock = threading.Lock()
+_pool_stats = {"checkouts": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+
+class _TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited (see pool_metrics)."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            with _pool_stats_lock:
+                _pool_stats["checkouts"] += 1
+                _pool_stats["total_wait_seconds"] += waited
+                _pool_stats["max_wait_seconds"] = max(_pool_stats["max_wait_seconds"], waited)
+
+
+engine = create_engine(DATABASE_URL, poolclass=_TimedQueuePool, **_engine_options())
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -25,4 +76,292 @@ def get_db():
         db.close()
 
 
-        
\ No newline at end of file
+# =========================
+# Async engine (optional)
+# =========================
+# With DATABASE_ASYNC enabled, the read-heavy endpoints run on an asyncpg
+# engine pointed at the same database, so their queries wait on the event
+# loop instead of holding an AnyIO worker thread. Services stay sync and
+# are called through AsyncSession.run_sync.
+
+DATABASE_ASYNC = settings.DATABASE_ASYNC
+
+
+def _async_url(url: str):
+    # asyncpg prepares every statement server-side; the dialect keeps the
+    # prepared handles per connection, keyed by the cached compiled SQL.
+    # (psycopg2, used by the sync engine, has no server-side prepare.)
+    return make_url(url).set(drivername="postgresql+asyncpg").update_query_dict({
+        "prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)
+    })
+
+
+def _create_async_engine(url: str):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    return create_async_engine(
+        _async_url(url),
+        **_shared_options(),
+        connect_args={"server_settings": _server_settings()}
+    )
+
+
+def _async_sessionmaker(bind):
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    return async_sessionmaker(bind=bind, autoflush=False, expire_on_commit=False)
+
+
+async_engine = _create_async_engine(DATABASE_URL) if DATABASE_ASYNC else None
+
+AsyncSessionLocal = _async_sessionmaker(async_engine) if async_engine is not None else None
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def lift_session_timeouts(db) -> None:
+    """
+    Disable the statement and idle-in-transaction timeouts for the current
+    transaction only. For work paced by the client (streamed exports,
+    COPY from an upload) rather than by the database.
+    """
+    db.execute(text(
+        "SELECT set_config('statement_timeout', '0', true), "
+        "set_config('idle_in_transaction_session_timeout', '0', true)"
+    ))
+
+
+# =========================
+# Pool capacity and checkout waits
+# =========================
+
+def pool_capacity() -> int:
+    """Connections one process can hold from the primary pool."""
+    return settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+
+def check_pool_capacity(worker_threads: int) -> None:
+    """Warn when more threads can run DB work at once than the pool can serve."""
+    if worker_threads > pool_capacity():
+        logger.warning(
+            "%d worker threads can use the database but the pool holds only %d "
+            "connections (DB_POOL_SIZE=%d + DB_MAX_OVERFLOW=%d); excess requests "
+            "will wait up to DB_POOL_TIMEOUT_SECONDS=%s for a connection",
+            worker_threads,
+            pool_capacity(),
+            settings.DB_POOL_SIZE,
+            settings.DB_MAX_OVERFLOW,
+            settings.DB_POOL_TIMEOUT_SECONDS,
+        )
+
+
+def pool_metrics() -> dict:
+    with _pool_stats_lock:
+        stats = dict(_pool_stats)
+
+    checkouts = stats["checkouts"]
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_out": engine.pool.checkedout(),
+        "overflow": engine.pool.overflow(),
+        "checkouts": checkouts,
+        "avg_checkout_wait_ms": round(stats["total_wait_seconds"] / checkouts * 1000, 2) if checkouts else None,
+        "max_checkout_wait_ms": round(stats["max_wait_seconds"] * 1000, 2),
+    }
+
+
+# =========================
+# Read replica routing
+# =========================
+
+DATABASE_REPLICA_URL = settings.DATABASE_REPLICA_URL
+
+# Replica is skipped when replay lag exceeds this
+REPLICA_MAX_LAG_SECONDS = settings.REPLICA_MAX_LAG_SECONDS
+
+# How long a replica health/lag result is trusted before re-checking
+REPLICA_HEALTH_CHECK_SECONDS = settings.REPLICA_HEALTH_CHECK_SECONDS
+
+# After a user writes, their reads stay on the primary for this long
+REPLICA_STICKY_SECONDS = settings.REPLICA_STICKY_SECONDS
+
+replica_engine = (
+    create_engine(DATABASE_REPLICA_URL, **_engine_options())
+    if DATABASE_REPLICA_URL else None
+)
+
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    if replica_engine is not None else None
+)
+
+async_replica_engine = (
+    _create_async_engine(DATABASE_REPLICA_URL)
+    if DATABASE_ASYNC and DATABASE_REPLICA_URL else None
+)
+
+AsyncReplicaSessionLocal = (
+    _async_sessionmaker(async_replica_engine)
+    if async_replica_engine is not None else None
+)
+
+_replica_state = {"healthy": False, "checked_at": float("-inf")}
+_replica_lock = threading.Lock()
+
+_recent_writers = {}
+_recent_writers_lock = threading.Lock()
+
+
+def _check_replica() -> bool:
+    """Replica is usable if reachable and its replay lag is within bounds."""
+    try:
+        with replica_engine.connect() as conn:
+            # Lag is zero when caught up, or when the target is not a standby at all
+            lag = conn.execute(text("""
+                SELECT CASE
+                    WHEN NOT pg_is_in_recovery() THEN 0
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                END
+            """)).scalar()
+    except Exception:
+        logger.warning("Read replica unreachable, routing reads to primary", exc_info=True)
+        return False
+
+    if lag > REPLICA_MAX_LAG_SECONDS:
+        logger.warning("Read replica lagging %.1fs, routing reads to primary", lag)
+        return False
+    return True
+
+
+def replica_available() -> bool:
+    if replica_engine is None:
+        return False
+
+    now = time.monotonic()
+    with _replica_lock:
+        if now - _replica_state["checked_at"] < REPLICA_HEALTH_CHECK_SECONDS:
+            return _replica_state["healthy"]
+        # Claim this check window so concurrent requests don't all probe
+        _replica_state["checked_at"] = now
+
+    healthy = _check_replica()
+    with _replica_lock:
+        _replica_state["healthy"] = healthy
+    return healthy
+
+
+def _has_recent_write(user_id: int) -> bool:
+    """
+    Whether the user wrote within REPLICA_STICKY_SECONDS on any worker.
+    This worker's own writes are answered from memory; otherwise the
+    shared recent_writes marker is looked up on the primary.
+    """
+    with _recent_writers_lock:
+        written_at = _recent_writers.get(user_id)
+    if written_at is not None and time.monotonic() - written_at < REPLICA_STICKY_SECONDS:
+        return True
+
+    with engine.connect() as conn:
+        return conn.execute(
+            _RECENT_WRITE_SQL, {"user_id": user_id}
+        ).first() is not None
+
+
+def _remember_write(user_id: int) -> None:
+    now = time.monotonic()
+    with _recent_writers_lock:
+        _recent_writers[user_id] = now
+        if len(_recent_writers) > 10000:
+            for uid, written_at in list(_recent_writers.items()):
+                if now - written_at >= REPLICA_STICKY_SECONDS:
+                    del _recent_writers[uid]
+
+
+def _use_replica(user_id: int = None) -> bool:
+    # Marker lookup only matters when the replica would otherwise be used
+    if not replica_available():
+        return False
+    return user_id is None or not _has_recent_write(user_id)
+
+
+def read_sessionmaker(user_id: int = None) -> sessionmaker:
+    """Replica session factory when safe to use, otherwise the primary's."""
+    return ReplicaSessionLocal if _use_replica(user_id) else SessionLocal
+
+
+def read_session(user_id: int = None):
+    db = read_sessionmaker(user_id)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db():
+    """Session for read-only workloads with no per-user freshness needs."""
+    yield from read_session()
+
+
+async def async_read_sessionmaker(user_id: int = None):
+    """Async counterpart of read_sessionmaker, using the same routing rules."""
+    # The health probe and marker lookup are blocking sync queries; keep them off the event loop
+    if AsyncReplicaSessionLocal is not None and await to_thread.run_sync(_use_replica, user_id):
+        return AsyncReplicaSessionLocal
+    return AsyncSessionLocal
+
+
+async def async_read_session(user_id: int = None):
+    async with (await async_read_sessionmaker(user_id))() as db:
+        yield db
+
+
+# Primary sessions tagged with session.info["user_id"] (see get_current_user)
+# record the user as a recent writer when they commit changes. The marker
+# is written in the committing transaction to the shared recent_writes
+# table, so every worker routes the user's next reads to the primary.
+
+_RECENT_WRITE_SQL = text("""
+    SELECT 1 FROM recent_writes
+    WHERE user_id = :user_id AND sticky_until > now()
+""")
+
+_MARK_WRITE_SQL = text("""
+    INSERT INTO recent_writes (user_id, sticky_until)
+    VALUES (:user_id, now() + make_interval(secs => :seconds))
+    ON CONFLICT (user_id) DO UPDATE SET sticky_until = EXCLUDED.sticky_until
+""")
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _flag_flush(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _mark_writer(session):
+    if replica_engine is None or "user_id" not in session.info:
+        return
+    # Flush now so pending changes count as writes before deciding
+    session.flush()
+    if session.info.get("has_writes"):
+        session.execute(
+            _MARK_WRITE_SQL,
+            {"user_id": session.info["user_id"], "seconds": REPLICA_STICKY_SECONDS}
+        )
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _flag_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _record_writer(session):
+    if session.info.pop("has_writes", False) and "user_id" in session.info:
+        _remember_write(session.info["user_id"])
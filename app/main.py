@@ -1,5 +1,7 @@
 import logging
+from contextlib import asynccontextmanager
 
+import anyio.to_thread
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -7,18 +9,37 @@ from fastapi.middleware.cors import CORSMiddleware
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
+from app.core.config import settings
 from app.core.limiter import limiter
-from app.routers import auth, income, expense, summary, buckets, committed, admin
+from app.database import check_pool_capacity
+from app.services.admin_analytics import DASHBOARD_WORKERS
+from app.core.admission import AdmissionControlMiddleware
+from app.services.idempotency import IdempotentReplay
+from app.routers import auth, income, expense, summary, buckets, committed, admin, imports, account
 
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync endpoints run on AnyIO's default thread limiter
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.ANYIO_THREAD_LIMIT
+    # Admin dashboard sections run on their own executor on top of that
+    check_pool_capacity(settings.ANYIO_THREAD_LIMIT + DASHBOARD_WORKERS)
+    yield
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Fundivis API",
     description="Multi-user personal finance awareness system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Per-route-class concurrency caps. Added before CORS so CORS wraps it
+# and its 503 responses still carry CORS headers.
+app.add_middleware(AdmissionControlMiddleware)
+
 # CORS - MUST be first middleware (before SlowAPI)
 app.add_middleware(
     CORSMiddleware,
@@ -38,6 +59,14 @@ def rate_limit_handler(request: Request, exc: RateLimitExceeded):
         content={"detail": "Too many login attempts. Please try again later."},
     )
 
+@app.exception_handler(IdempotentReplay)
+def idempotent_replay_handler(request: Request, exc: IdempotentReplay):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content=exc.body,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
 app.include_router(auth.router)
 app.include_router(income.router)
 app.include_router(expense.router)
@@ -45,6 +74,8 @@ app.include_router(summary.router)
 app.include_router(buckets.router)
 app.include_router(committed.router)
 app.include_router(admin.router)
+app.include_router(imports.router)
+app.include_router(account.router)
 
 # Health check
 @app.get("/")
@@ -3,4 +3,12 @@ from .income import Income
 from .expense import Expense
 from .bucket_activity import BucketActivity, ActivityType
 from .committed_expense import CommittedExpense
-from .custom_bucket import CustomBucket
\ No newline at end of file
+from .custom_bucket import CustomBucket
+from .cohort_activity import CohortActivity
+from .daily_active_sketch import DailyActiveSketch
+from .transaction_count import TransactionCount
+from .statement_import import StatementImport, ImportStatus
+from .idempotency_key import IdempotencyKey
+from .refresh_token import RefreshToken
+from .rate_limit_counter import RateLimitCounter
+from .recent_write import RecentWrite
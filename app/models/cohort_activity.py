@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey, Index
+from app.database import Base
+
+
+class CohortActivity(Base):
+    """
+    One row per (user, week since signup) in which the user logged
+    any income or expense.
+
+    Rows are written incrementally as transactions are recorded, so the
+    weekly signup-cohort retention matrix is a single grouped read over
+    this table instead of a scan of incomes and expenses.
+    """
+    __tablename__ = "cohort_activity"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # Weeks between the user's signup week and the activity week (0 = signup week)
+    week_offset = Column(Integer, primary_key=True)
+
+    # Monday of the week the user signed up
+    cohort_week = Column(Date, nullable=False)
+
+    __table_args__ = (
+        Index("ix_cohort_activity_cohort_offset", "cohort_week", "week_offset"),
+    )
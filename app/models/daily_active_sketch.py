@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Date, DateTime, LargeBinary, SmallInteger
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+# Writers for a day are spread over this many rows (user_id % SKETCH_SHARDS)
+# so concurrent transaction writes don't all queue on one row lock.
+SKETCH_SHARDS = 16
+
+
+class DailyActiveSketch(Base):
+    """
+    HyperLogLog sketch of the user ids active (any income or expense)
+    on a given transaction date, split into shards that are merged on
+    read. See app/services/hyperloglog.py.
+    """
+    __tablename__ = "daily_active_sketches"
+
+    day = Column(Date, primary_key=True)
+
+    shard = Column(SmallInteger, primary_key=True, server_default="0")
+
+    registers = Column(LargeBinary, nullable=False)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
@@ -1,5 +1,6 @@
 from sqlalchemy import (
     Column,
+    Computed,
     Integer,
     Numeric,
     String,
@@ -9,6 +10,8 @@ from sqlalchemy import (
     Enum,
     Index
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
@@ -69,6 +72,17 @@ class Expense(Base):
         server_default=func.now()
     )
 
+    # Full-text search over category (weighted higher) and description.
+    # Deferred so ordinary listings never load it.
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(category, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True
+        )
+    ))
+
     __table_args__ = (
         # Most important composite index (used in all summaries)
         Index("ix_expense_user_date", "user_id", "date"),
@@ -78,4 +92,10 @@ class Expense(Base):
 
         # Optional filter performance
         Index("ix_expense_user_category", "user_id", "category"),
+
+        # Keyset pagination on (date desc, id desc)
+        Index("ix_expense_user_date_id", "user_id", "date", "id"),
+
+        # Per-user full-text search (btree_gin lets user_id share the GIN index)
+        Index("ix_expense_user_search", "user_id", "search_vector", postgresql_using="gin"),
     )
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, SmallInteger, String, ForeignKey, DateTime, JSON, Index
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Response recorded for a client-supplied Idempotency-Key, so a retried
+    write replays the original result instead of executing again.
+
+    A row with no status_code is a claim for a request still in flight.
+    """
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    key = Column(String(255), primary_key=True)
+
+    # "METHOD /path" the key was first used on
+    endpoint = Column(String(120), nullable=False)
+
+    status_code = Column(SmallInteger, nullable=True)
+
+    response = Column(JSON, nullable=True)
+
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_idempotency_key_expires", "expires_at"),
+    )
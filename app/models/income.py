@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, Numeric, String, Date, ForeignKey, DateTime, Index
+from sqlalchemy import Column, Computed, Integer, Numeric, String, Date, ForeignKey, DateTime, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -22,10 +24,29 @@ class Income(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Full-text search over source (weighted higher) and description
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(source, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True
+        )
+    ))
+
     __table_args__ = (
         # Composite index (most important for performance)
         Index("ix_income_user_date", "user_id", "date"),
 
         # Additional filter optimization
         Index("ix_income_user_created", "user_id", "created_at"),
+
+        # Keyset pagination on (date desc, id desc)
+        Index("ix_income_user_date_id", "user_id", "date", "id"),
+
+        # Source filter on listings
+        Index("ix_income_user_source", "user_id", "source"),
+
+        # Per-user full-text search (btree_gin lets user_id share the GIN index)
+        Index("ix_income_user_search", "user_id", "search_vector", postgresql_using="gin"),
     )
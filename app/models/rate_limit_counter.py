@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.database import Base
+
+
+class RateLimitCounter(Base):
+    """
+    Fixed-window rate-limit counters shared by every worker; used when
+    RATE_LIMIT_STORAGE_URI is "database://". See app/core/rate_limit_storage.py.
+
+    Created UNLOGGED: counters are disposable, so they skip the WAL.
+    """
+    __tablename__ = "rate_limit_counters"
+    __table_args__ = (
+        Index("ix_rate_limit_counter_expires", "expires_at"),
+        {"prefixes": ["UNLOGGED"]},
+    )
+
+    key = Column(String(255), primary_key=True)
+
+    count = Column(Integer, nullable=False)
+
+    expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, DateTime
+from app.database import Base
+
+
+class RecentWrite(Base):
+    """
+    Per-user read-your-writes marker shared by every worker: until
+    sticky_until, the user's reads stay on the primary. Written in the
+    same transaction as the user's changes; see app/database.py.
+
+    Created UNLOGGED: markers are short-lived, so they skip the WAL.
+    """
+    __tablename__ = "recent_writes"
+    __table_args__ = ({"prefixes": ["UNLOGGED"]},)
+
+    user_id = Column(Integer, primary_key=True)
+
+    sticky_until = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class RefreshToken(Base):
+    """
+    One link in a rotating refresh-token chain. Only an HMAC of the token
+    is stored. A token is usable once; presenting a used one again means
+    it leaked, and the whole family is revoked.
+    """
+    __tablename__ = "refresh_tokens"
+
+    # HMAC-SHA256 of the token, hex
+    token_hash = Column(String(64), primary_key=True)
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # Shared by every token rotated from the same login
+    family_id = Column(String(32), nullable=False)
+
+    # users.token_version at issue time; a later bump revokes the chain
+    token_version = Column(Integer, nullable=False)
+
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    used_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index("ix_refresh_token_expires", "expires_at"),
+        Index("ix_refresh_token_family", "family_id"),
+    )
@@ -0,0 +1,68 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    ForeignKey,
+    DateTime,
+    Enum,
+    Index,
+    JSON,
+)
+from sqlalchemy.sql import func
+from app.database import Base
+import enum
+
+
+class ImportStatus(str, enum.Enum):
+    pending = "pending"
+    loading = "loading"
+    processing = "processing"
+    completed = "completed"
+    failed = "failed"
+
+
+class StatementImport(Base):
+    """
+    One bank-statement CSV upload and its progress.
+
+    Progress fields are committed on their own session while the import
+    runs, so clients can poll them mid-import.
+    """
+    __tablename__ = "statement_imports"
+
+    id = Column(Integer, primary_key=True)
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    filename = Column(String(255), nullable=True)
+
+    status = Column(
+        Enum(ImportStatus, name="import_status_enum", create_constraint=True),
+        nullable=False,
+        default=ImportStatus.pending
+    )
+
+    rows_received = Column(Integer, nullable=False, default=0)
+    expenses_imported = Column(Integer, nullable=False, default=0)
+    incomes_imported = Column(Integer, nullable=False, default=0)
+    rows_rejected = Column(Integer, nullable=False, default=0)
+
+    # First few rejected rows: [{"line": int, "error": str}, ...]
+    rejected_samples = Column(JSON, nullable=True)
+
+    error = Column(String(500), nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now()
+    )
+
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_statement_import_user_created", "user_id", "created_at"),
+    )
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from app.database import Base
+
+
+class TransactionCount(Base):
+    """
+    Running per-user count of income and expense rows.
+
+    Kept in step by every handler that inserts or deletes transactions,
+    so paginated listings can report `total` without a COUNT(*).
+    """
+    __tablename__ = "transaction_counts"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    income_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    expense_count = Column(Integer, nullable=False, default=0, server_default="0")
@@ -16,6 +16,9 @@ class User(Base):
 
     is_admin = Column(Boolean, default=False, nullable=False)
 
+    # Bumped to revoke every token issued so far (password change, role change)
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Explicit index (Postgres optimized)
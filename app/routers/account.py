@@ -0,0 +1,26 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.core.security import get_current_user
+from app.models.user import User
+from app.services.account_export import iter_account_export
+
+router = APIRouter(
+    prefix="/account",
+    tags=["Account"]
+)
+
+
+@router.get("/export")
+def export_account(
+    current_user: User = Depends(get_current_user)
+):
+    """Download all of the user's data as a zip of CSV files."""
+    filename = f"fundivis-export-{date.today().isoformat()}.zip"
+    return StreamingResponse(
+        iter_account_export(current_user.id),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
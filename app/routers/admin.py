@@ -1,14 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Literal
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.core.security import get_current_admin
+from app.database import get_db, get_read_db, pool_metrics
+from app.core.security import get_current_admin, revoke_user_tokens
+from app.core.hashing import password_hash_metrics
+from app.core.admission import admission_metrics
+from app.core.streaming import EXPORT_MEDIA_TYPES
 from app.models.user import User
 from app.services.admin_analytics import (
-    get_user_metrics,
     get_financial_metrics,
     get_engagement_metrics,
+    get_dashboard,
     get_user_list,
+    iter_user_export,
+    get_cohort_retention,
+    get_active_user_estimates,
     get_behavioral_intelligence
 )
 
@@ -20,40 +28,82 @@ router = APIRouter(
 
 @router.get("/dashboard")
 def admin_dashboard(
-    db: Session = Depends(get_db),
+    days: int = Query(7, ge=1, le=365, description="Trend window in days"),
     admin: User = Depends(get_current_admin)
 ):
-    """Get all dashboard metrics in one call."""
-    return {
-        "users": get_user_metrics(db),
-        "financial": get_financial_metrics(db),
-        "engagement": get_engagement_metrics(db),
-    }
+    """Get all dashboard metrics in one call. Sections run concurrently."""
+    return get_dashboard(days=days)
 
 
 @router.get("/users")
 def list_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin: User = Depends(get_current_admin)
 ):
     """List users with behavioral summaries."""
     return get_user_list(db, skip, limit)
 
 
+@router.post("/users/{user_id}/revoke-sessions")
+def revoke_sessions(
+    user_id: int,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin)
+):
+    """Sign the user out everywhere: every access and refresh token stops working."""
+    if not revoke_user_tokens(db, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    return {"message": "Sessions revoked"}
+
+
+@router.get("/users/export")
+def export_users(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    admin: User = Depends(get_current_admin)
+):
+    """Stream every user with behavioral summaries (same fields as /admin/users)."""
+    return StreamingResponse(
+        iter_user_export(format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'}
+    )
+
+
 @router.get("/behavior")
 def behavior_metrics(
-    db: Session = Depends(get_db),
+    days: int = Query(7, ge=1, le=365, description="Trend window in days"),
+    db: Session = Depends(get_read_db),
     admin: User = Depends(get_current_admin)
 ):
     """Get engagement and adoption metrics."""
-    return get_engagement_metrics(db)
+    return get_engagement_metrics(db, days=days)
+
+
+@router.get("/behavior/retention")
+def cohort_retention(
+    weeks: int = Query(12, ge=1, le=52, description="Number of weekly signup cohorts"),
+    db: Session = Depends(get_read_db),
+    admin: User = Depends(get_current_admin)
+):
+    """Get the weekly signup-cohort retention matrix."""
+    return get_cohort_retention(db, weeks=weeks)
+
+
+@router.get("/behavior/active-users")
+def active_users(
+    days: int = Query(30, ge=1, le=365, description="Trend window in days"),
+    db: Session = Depends(get_read_db),
+    admin: User = Depends(get_current_admin)
+):
+    """Get approximate DAU/WAU/MAU from daily distinct-user sketches."""
+    return get_active_user_estimates(db, days=days)
 
 
 @router.get("/financial")
 def financial_overview(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin: User = Depends(get_current_admin)
 ):
     """Get aggregate financial metrics."""
@@ -61,8 +111,20 @@ def financial_overview(
 
 @router.get("/behavior/intelligence")
 def behavioral_intelligence(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin: User = Depends(get_current_admin)
 ):
     """Get all behavioral intelligence metrics."""
     return get_behavioral_intelligence(db)
+
+
+@router.get("/metrics")
+def runtime_metrics(
+    admin: User = Depends(get_current_admin)
+):
+    """Per-process runtime counters for capacity tuning."""
+    return {
+        "password_hashing": password_hash_metrics(),
+        "admission": admission_metrics(),
+        "database_pool": pool_metrics()
+    }
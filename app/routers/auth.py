@@ -3,9 +3,11 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.schemas.auth import UserRegister, Token
-from app.services.auth import register_user, authenticate_user
+from app.schemas.auth import UserRegister, Token, RefreshRequest, ChangePasswordRequest
+from app.services.auth import register_user, authenticate_user, rotate_refresh_token, change_password
 from app.core.limiter import limiter
+from app.core.security import get_current_user
+from app.models.user import User
 
 router = APIRouter(
     prefix="/auth",
@@ -15,8 +17,8 @@ router = APIRouter(
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
 @limiter.limit("3/minute")
-def register(request: Request, user_data: UserRegister, db: Session = Depends(get_db)):
-    user = register_user(db, user_data)
+async def register(request: Request, user_data: UserRegister, db: Session = Depends(get_db)):
+    user = await register_user(db, user_data)
 
     if not user:
         raise HTTPException(
@@ -31,21 +33,53 @@ def register(request: Request, user_data: UserRegister, db: Session = Depends(ge
 
 @router.post("/login", response_model=Token, status_code=status.HTTP_200_OK)
 @limiter.limit("5/minute")
-def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(),  db: Session = Depends(get_db)):
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(),  db: Session = Depends(get_db)):
     
-    access_token = authenticate_user(
+    tokens = await authenticate_user(
         db,
         email=form_data.username,
         password=form_data.password
     )
 
-    if not access_token:
+    if not tokens:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+    return tokens
+
+
+@router.post("/refresh", response_model=Token, status_code=status.HTTP_200_OK)
+@limiter.limit("30/minute")
+def refresh(request: Request, payload: RefreshRequest, db: Session = Depends(get_db)):
+    """Swap a refresh token for a new access token and a new refresh token."""
+    tokens = rotate_refresh_token(db, payload.refresh_token)
+
+    if not tokens:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token"
+        )
+
+    return tokens
+
+
+@router.post("/change-password", response_model=Token, status_code=status.HTTP_200_OK)
+@limiter.limit("5/minute")
+async def change_password_endpoint(
+    request: Request,
+    payload: ChangePasswordRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Change the password, sign out every other session and return new tokens."""
+    tokens = await change_password(db, current_user.id, payload.current_password, payload.new_password)
+
+    if not tokens:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Current password is incorrect"
+        )
+
+    return tokens
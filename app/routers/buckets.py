@@ -3,7 +3,9 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from app.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_user_read_db
+from app.core.idempotency import idempotency_key
+from app.core.read_routes import user_read_endpoint
 from app.models.user import User
 from app.schemas.bucket import (
     BucketAllocate,
@@ -15,6 +17,7 @@ from app.schemas.bucket import (
     CustomBucketResponse,
     BucketDeleteResponse
 )
+from app.services.idempotency import IdempotencyClaim, store_idempotent_response
 from app.services.bucket_service import (
     allocate_funds,
     withdraw_from_bucket,
@@ -36,15 +39,22 @@ router = APIRouter(
 def allocate(
     data: BucketAllocate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    idempotency: Optional[IdempotencyClaim] = Depends(idempotency_key)
 ):
     """Allocate funds to a wealth bucket."""
     try:
-        activity = allocate_funds(db, current_user.id, data)
-        return activity
+        activity = allocate_funds(db, current_user.id, data, commit=False)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    # The stored response commits together with the allocation
+    response = store_idempotent_response(
+        db, idempotency, 200, BucketActivityResponse.model_validate(activity), commit=False
+    )
+    db.commit()
+    return response
+
 
 @router.post("/withdraw", response_model=BucketActivityResponse)
 def withdraw(
@@ -66,12 +76,13 @@ def withdraw(
 def transfer(
     data: BucketTransfer,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    idempotency: Optional[IdempotencyClaim] = Depends(idempotency_key)
 ):
     """Transfer funds between buckets."""
     try:
-        result = transfer_between_buckets(db, current_user.id, data)
-        return {
+        result = transfer_between_buckets(db, current_user.id, data, commit=False)
+        response = {
             "message": f"Successfully transferred ₦{data.amount:,.2f} from {data.from_bucket} to {data.to_bucket}",
             "transfer_out": BucketActivityResponse.model_validate(result["transfer_out"]),
             "transfer_in": BucketActivityResponse.model_validate(result["transfer_in"])
@@ -81,13 +92,18 @@ def transfer(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    # The stored response commits together with the transfer
+    response = store_idempotent_response(db, idempotency, 200, response, commit=False)
+    db.commit()
+    return response
+
 
 @router.get("/history", response_model=list[BucketActivityResponse])
 def history(
     bucket_name: Optional[str] = Query(None, description="Filter by bucket name"),
     limit: int = Query(50, ge=1, le=100),
     skip: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_user_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get activity history for buckets."""
@@ -100,13 +116,13 @@ def history(
     )
 
 
-@router.get("/balances", response_model=BucketsSummaryResponse)
-def balances(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Get current balances for all buckets calculated from activity log."""
-    return calculate_all_bucket_balances(db, current_user.id)
+router.add_api_route(
+    "/balances",
+    user_read_endpoint(calculate_all_bucket_balances),
+    name="balances",
+    response_model=BucketsSummaryResponse,
+    description="Get current balances for all buckets calculated from activity log."
+)
 
 @router.post("/custom", response_model=CustomBucketResponse)
 def create_custom(
@@ -3,13 +3,15 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from app.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_user_read_db
+from app.core.idempotency import idempotency_key
 from app.models.user import User
 from app.schemas.committed import (
     CommittedExpenseCreate,
     CommittedExpenseResponse,
     CommittedExpenseUpdate
 )
+from app.services.idempotency import IdempotencyClaim, store_idempotent_response
 from app.services.committed_service import (
     create_committed_expense,
     get_committed_expenses,
@@ -36,7 +38,7 @@ def create(
 @router.get("/", response_model=list[CommittedExpenseResponse])
 def list_expenses(
     unpaid_only: bool = Query(False),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_user_read_db),
     current_user: User = Depends(get_current_user)
 ):
     return get_committed_expenses(db, current_user.id, unpaid_only=unpaid_only)
@@ -71,9 +73,15 @@ def delete(
 def pay(
     expense_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    idempotency: Optional[IdempotencyClaim] = Depends(idempotency_key)
 ):
-    result = mark_as_paid(db, expense_id, current_user.id)
+    result = mark_as_paid(db, expense_id, current_user.id, commit=False)
     if not result:
         raise HTTPException(status_code=404, detail="Committed expense not found")
-    return result
\ No newline at end of file
+    # The stored response commits together with the payment
+    response = store_idempotent_response(
+        db, idempotency, 200, CommittedExpenseResponse.model_validate(result), commit=False
+    )
+    db.commit()
+    return response
\ No newline at end of file
@@ -1,13 +1,29 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import Literal, Optional
+from datetime import date
 
 from app.database import get_db
-from app.models.expense import Expense
-from app.schemas.expense import ExpenseCreate, ExpenseResponse
-from app.schemas.common import PaginatedResponse
-from app.core.security import get_current_user
+from app.models.expense import Expense, NecessityType
+from app.schemas.expense import ExpenseCreate, ExpenseResponse, ExpenseBulkSelection, ExpenseBulkUpdate
+from app.schemas.common import PaginatedResponse, BulkCreateRequest, BulkCreateResponse, BulkMutationResponse
+from app.core.security import get_current_user, get_user_read_db
+from app.core.read_routes import user_read_endpoint
+from app.core.idempotency import idempotency_key
 from app.models.user import User
+from app.services.activity_tracking import record_activity
+from app.services.transaction_counts import adjust_transaction_counts
+from app.services.idempotency import IdempotencyClaim, store_idempotent_response
+from app.services.transaction_service import (
+    list_expenses,
+    bulk_create_expenses,
+    bulk_update_expenses,
+    bulk_delete_expenses,
+    iter_expense_export,
+    search_transactions
+)
+from app.core.streaming import EXPORT_MEDIA_TYPES
 
 router = APIRouter(
     prefix="/expense",
@@ -23,7 +39,8 @@ router = APIRouter(
 def add_expense(
     expense_data: ExpenseCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    idempotency: Optional[IdempotencyClaim] = Depends(idempotency_key)
 ):
     new_expense = Expense(
         amount=expense_data.amount,
@@ -37,41 +54,124 @@ def add_expense(
     )
 
     db.add(new_expense)
-    db.commit()
+    record_activity(db, current_user.id, new_expense.date)
+    adjust_transaction_counts(db, current_user.id, expenses=1)
+    db.flush()
     db.refresh(new_expense)
 
-    return new_expense
+    # The stored response commits together with the new row
+    response = store_idempotent_response(
+        db, idempotency, status.HTTP_201_CREATED, ExpenseResponse.model_validate(new_expense), commit=False
+    )
+    db.commit()
+    return response
 
 
-@router.get("", response_model=PaginatedResponse[ExpenseResponse])
-def get_expenses(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=BulkCreateResponse[ExpenseResponse]
+)
+def add_expenses_bulk(
+    payload: BulkCreateRequest,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    base_query = db.query(Expense).filter(
-        Expense.user_id == current_user.id
-    )
+    """
+    Create up to 1,000 expenses in one statement; invalid items are reported per index.
+
+    The valid items are inserted all-or-nothing: a database error fails the
+    whole batch. Returns 422 (same body) when no item was created.
+    """
+    result = bulk_create_expenses(db, current_user.id, payload.items)
+    if not result["created"]:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    return result
 
-    total = base_query.with_entities(func.count()).scalar()
 
-    expenses = (
-        base_query
-        .order_by(Expense.date.desc(), Expense.id.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+@router.patch("/bulk", response_model=BulkMutationResponse)
+def update_expenses_bulk(
+    payload: ExpenseBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Apply the same changes to every selected expense in one statement."""
+    return bulk_update_expenses(
+        db, current_user.id, payload.where, payload.changes.model_dump(exclude_unset=True)
     )
 
+
+@router.delete("/bulk", response_model=BulkMutationResponse)
+def delete_expenses_bulk(
+    where: ExpenseBulkSelection,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete every selected expense in one statement."""
+    return bulk_delete_expenses(db, current_user.id, where)
+
+
+def expense_list_params(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides skip"),
+    include_total: bool = Query(True, description="Set false to skip the total count"),
+    category: Optional[str] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    necessity_type: Optional[NecessityType] = Query(None),
+    wealth_bucket: Optional[str] = Query(None),
+    payment_method: Optional[str] = Query(None),
+):
     return {
-        "total": total,
         "skip": skip,
         "limit": limit,
-        "data": expenses
+        "cursor": cursor,
+        "include_total": include_total,
+        "category": category,
+        "start_date": start_date,
+        "end_date": end_date,
+        "necessity_type": necessity_type,
+        "wealth_bucket": wealth_bucket,
+        "payment_method": payment_method,
     }
 
 
+router.add_api_route(
+    "",
+    user_read_endpoint(list_expenses, params=expense_list_params),
+    name="get_expenses",
+    response_model=PaginatedResponse[ExpenseResponse]
+)
+
+
+@router.get("/search", response_model=PaginatedResponse[ExpenseResponse])
+def search_expenses(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to match; supports \"quoted phrases\" and -exclusions"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_user_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Full-text search over category and description, best matches first."""
+    return search_transactions(db, Expense, current_user.id, q, limit, cursor)
+
+
+@router.get("/export")
+def export_expenses(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream all expenses (optionally within a date range) as CSV or NDJSON."""
+    return StreamingResponse(
+        iter_expense_export(current_user.id, format, start_date=start_date, end_date=end_date),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="expenses.{format}"'}
+    )
+
 
 @router.put("/{expense_id}", response_model=ExpenseResponse)
 def update_expense(
@@ -97,6 +197,7 @@ def update_expense(
     expense.date = expense_data.date
     expense.description = expense_data.description
 
+    record_activity(db, current_user.id, expense.date)
     db.commit()
     db.refresh(expense)
 
@@ -119,6 +220,7 @@ def delete_expense(
         raise HTTPException(status_code=404, detail="Expense not found")
 
     db.delete(expense)
+    adjust_transaction_counts(db, current_user.id, expenses=-1)
     db.commit()
 
     return {"message": "Expense deleted successfully"}
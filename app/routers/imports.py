@@ -0,0 +1,75 @@
+from typing import Iterator, Optional
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.core.security import get_current_user
+from app.models.user import User
+from app.schemas.statement_import import StatementImportResponse
+from app.services.import_service import (
+    run_statement_import,
+    get_statement_import,
+    list_statement_imports
+)
+
+router = APIRouter(
+    prefix="/import",
+    tags=["Import"]
+)
+
+
+def _iter_body(request: Request) -> Iterator[bytes]:
+    """Pull request body chunks from the event loop into the worker thread."""
+    stream = request.stream()
+    while True:
+        try:
+            yield anyio.from_thread.run(stream.__anext__)
+        except StopAsyncIteration:
+            return
+
+
+@router.post(
+    "/statement",
+    status_code=status.HTTP_201_CREATED,
+    response_model=StatementImportResponse
+)
+async def import_statement(
+    request: Request,
+    filename: Optional[str] = Query(None, max_length=255),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Import a bank statement sent as the raw request body (Content-Type: text/csv).
+    The body is streamed straight into Postgres; poll GET /import for progress.
+    """
+    return await run_in_threadpool(
+        run_statement_import,
+        current_user.id,
+        _iter_body(request),
+        filename
+    )
+
+
+@router.get("", response_model=list[StatementImportResponse])
+def list_imports(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Recent imports, including any still in progress."""
+    return list_statement_imports(db, current_user.id, limit=limit)
+
+
+@router.get("/{import_id}", response_model=StatementImportResponse)
+def get_import(
+    import_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    statement_import = get_statement_import(db, current_user.id, import_id)
+    if not statement_import:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return statement_import
@@ -1,13 +1,29 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import Literal, Optional
+from datetime import date
 
 from app.database import get_db
 from app.models.income import Income
-from app.schemas.income import IncomeCreate, IncomeResponse
-from app.schemas.common import PaginatedResponse
-from app.core.security import get_current_user
+from app.schemas.income import IncomeCreate, IncomeResponse, IncomeBulkSelection, IncomeBulkUpdate
+from app.schemas.common import PaginatedResponse, BulkCreateRequest, BulkCreateResponse, BulkMutationResponse
+from app.core.security import get_current_user, get_user_read_db
+from app.core.read_routes import user_read_endpoint
+from app.core.idempotency import idempotency_key
 from app.models.user import User
+from app.services.activity_tracking import record_activity
+from app.services.transaction_counts import adjust_transaction_counts
+from app.services.idempotency import IdempotencyClaim, store_idempotent_response
+from app.services.transaction_service import (
+    list_incomes,
+    bulk_create_incomes,
+    bulk_update_incomes,
+    bulk_delete_incomes,
+    iter_income_export,
+    search_transactions
+)
+from app.core.streaming import EXPORT_MEDIA_TYPES
 
 router = APIRouter(
     prefix="/income",
@@ -23,7 +39,8 @@ router = APIRouter(
 def add_income(
     income_data: IncomeCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    idempotency: Optional[IdempotencyClaim] = Depends(idempotency_key)
 ):
     new_income = Income(
         amount=income_data.amount,
@@ -35,41 +52,118 @@ def add_income(
     )
 
     db.add(new_income)
-    db.commit()
+    record_activity(db, current_user.id, new_income.date)
+    adjust_transaction_counts(db, current_user.id, incomes=1)
+    db.flush()
     db.refresh(new_income)
 
-    return new_income
+    # The stored response commits together with the new row
+    response = store_idempotent_response(
+        db, idempotency, status.HTTP_201_CREATED, IncomeResponse.model_validate(new_income), commit=False
+    )
+    db.commit()
+    return response
 
 
-@router.get("", response_model=PaginatedResponse[IncomeResponse])
-def get_incomes(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=BulkCreateResponse[IncomeResponse]
+)
+def add_incomes_bulk(
+    payload: BulkCreateRequest,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    base_query = db.query(Income).filter(
-        Income.user_id == current_user.id
-    )
+    """
+    Create up to 1,000 incomes in one statement; invalid items are reported per index.
+
+    The valid items are inserted all-or-nothing: a database error fails the
+    whole batch. Returns 422 (same body) when no item was created.
+    """
+    result = bulk_create_incomes(db, current_user.id, payload.items)
+    if not result["created"]:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    return result
 
-    total = base_query.with_entities(func.count()).scalar()
 
-    incomes = (
-        base_query
-        .order_by(Income.date.desc(), Income.id.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+@router.patch("/bulk", response_model=BulkMutationResponse)
+def update_incomes_bulk(
+    payload: IncomeBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Apply the same changes to every selected income in one statement."""
+    return bulk_update_incomes(
+        db, current_user.id, payload.where, payload.changes.model_dump(exclude_unset=True)
     )
 
+
+@router.delete("/bulk", response_model=BulkMutationResponse)
+def delete_incomes_bulk(
+    where: IncomeBulkSelection,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete every selected income in one statement."""
+    return bulk_delete_incomes(db, current_user.id, where)
+
+
+def income_list_params(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides skip"),
+    include_total: bool = Query(True, description="Set false to skip the total count"),
+    source: Optional[str] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+):
     return {
-        "total": total,
         "skip": skip,
         "limit": limit,
-        "data": incomes
+        "cursor": cursor,
+        "include_total": include_total,
+        "source": source,
+        "start_date": start_date,
+        "end_date": end_date,
     }
 
 
+router.add_api_route(
+    "",
+    user_read_endpoint(list_incomes, params=income_list_params),
+    name="get_incomes",
+    response_model=PaginatedResponse[IncomeResponse]
+)
+
+
+@router.get("/search", response_model=PaginatedResponse[IncomeResponse])
+def search_incomes(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to match; supports \"quoted phrases\" and -exclusions"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_user_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Full-text search over source and description, best matches first."""
+    return search_transactions(db, Income, current_user.id, q, limit, cursor)
+
+
+@router.get("/export")
+def export_incomes(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream all incomes (optionally within a date range) as CSV or NDJSON."""
+    return StreamingResponse(
+        iter_income_export(current_user.id, format, start_date=start_date, end_date=end_date),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="incomes.{format}"'}
+    )
+
 
 @router.put("/{income_id}", response_model=IncomeResponse)
 def update_income(
@@ -93,6 +187,7 @@ def update_income(
     income.date = income_data.date
     income.description = income_data.description
 
+    record_activity(db, current_user.id, income.date)
     db.commit()
     db.refresh(income)
 
@@ -115,6 +210,7 @@ def delete_income(
         raise HTTPException(status_code=404, detail="Income not found")
 
     db.delete(income)
+    adjust_transaction_counts(db, current_user.id, incomes=-1)
     db.commit()
 
     return {"message": "Income deleted successfully"}    
@@ -1,9 +1,6 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter
 
-from app.database import get_db
-from app.core.security import get_current_user
-from app.models.user import User
+from app.core.read_routes import user_read_endpoint
 from app.schemas.summary import (
     DailySummaryResponse,
     MonthlySummaryResponse,
@@ -25,62 +22,56 @@ router = APIRouter(
     tags=["Summary"]
 )
 
+# Each endpoint runs on the user's read session; see app.core.read_routes
+# for the sync/async (DATABASE_ASYNC) split.
 
-@router.get("/daily", response_model=DailySummaryResponse)
-def daily_summary(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    return calculate_daily_summary(db, current_user.id)
-
-
-@router.get("/monthly", response_model=MonthlySummaryResponse)
-def monthly_summary(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    return calculate_monthly_summary(db, current_user.id)
-
-@router.get("/insights")
-def insights(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    return calculate_insights(db, current_user.id)
+router.add_api_route(
+    "/daily",
+    user_read_endpoint(calculate_daily_summary),
+    name="daily_summary",
+    response_model=DailySummaryResponse
+)
 
-@router.get("/streaks")
-def streaks(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    return calculate_streaks(db, current_user.id)
+router.add_api_route(
+    "/monthly",
+    user_read_endpoint(calculate_monthly_summary),
+    name="monthly_summary",
+    response_model=MonthlySummaryResponse
+)
 
+router.add_api_route(
+    "/insights",
+    user_read_endpoint(calculate_insights),
+    name="insights"
+)
 
-@router.get("/savings-trend")
-def savings_trend(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    return calculate_savings_trend(db, current_user.id)
+router.add_api_route(
+    "/streaks",
+    user_read_endpoint(calculate_streaks),
+    name="streaks"
+)
 
+router.add_api_route(
+    "/savings-trend",
+    user_read_endpoint(calculate_savings_trend),
+    name="savings_trend"
+)
 
-@router.get("/wealth-buckets")
-def wealth_buckets(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    return calculate_wealth_buckets(db, current_user.id)  
+router.add_api_route(
+    "/wealth-buckets",
+    user_read_endpoint(calculate_wealth_buckets),
+    name="wealth_buckets"
+)
 
-@router.get("/safe-to-spend", response_model=SafeToSpendResponse)
-def safe_to_spend(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    return calculate_safe_to_spend(db, current_user.id)
+router.add_api_route(
+    "/safe-to-spend",
+    user_read_endpoint(calculate_safe_to_spend),
+    name="safe_to_spend",
+    response_model=SafeToSpendResponse
+)
 
-@router.get("/income-intelligence")
-def income_intelligence(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    return calculate_income_intelligence(db, current_user.id)      
+router.add_api_route(
+    "/income-intelligence",
+    user_read_endpoint(calculate_income_intelligence),
+    name="income_intelligence"
+)
@@ -1,11 +1,37 @@
-from pydantic import BaseModel
-from typing import Generic, TypeVar, List
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Generic, TypeVar, List, Optional
 
 T = TypeVar("T")
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
     data: List[T]
+    next_cursor: Optional[str] = None
+
+
+MAX_BULK_ITEMS = 1000
+
+
+class BulkCreateRequest(BaseModel):
+    # Items are validated one by one so a bad item doesn't reject the batch
+    items: List[Dict[str, Any]] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkItemError(BaseModel):
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class BulkCreateResponse(BaseModel, Generic[T]):
+    created: int
+    failed: int
+    data: List[T]
+    errors: List[BulkItemError]
+
+
+class BulkMutationResponse(BaseModel):
+    count: int
+    ids: List[int]
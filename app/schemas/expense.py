@@ -1,46 +1,54 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import date
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 from decimal import Decimal
 from app.models.expense import NecessityType
+from app.schemas.common import MAX_BULK_ITEMS
+
+
+ExpenseCategory = Literal[
+    "Food",
+    "Transport",
+    "Rent / Housing",
+    "Utilities",
+    "Data & Internet",
+    "Subscriptions",
+    "Health",
+    "Education",
+    "Business / Work",
+    "Personal",
+    "Entertainment",
+    "Miscellaneous"
+]
+
+WealthBucket = Literal[
+    "family",
+    "freedom_fund",
+    "emergency_buffer",
+    "asset_building"
+]
+
+PaymentMethod = Literal[
+    "Cash",
+    "Bank Transfer",
+    "Debit Card",
+    "Credit Card",
+    "POS",
+    "Mobile Wallet",
+    "Other"
+]
 
 
 class ExpenseCreate(BaseModel):
     amount: Decimal = Field(gt=0)
 
-    category: Literal[
-        "Food",
-        "Transport",
-        "Rent / Housing",
-        "Utilities",
-        "Data & Internet",
-        "Subscriptions",
-        "Health",
-        "Education",
-        "Business / Work",
-        "Personal",
-        "Entertainment",
-        "Miscellaneous"
-    ]
+    category: ExpenseCategory
 
     necessity_type: NecessityType
 
-    wealth_bucket: Optional[Literal[
-        "family",
-        "freedom_fund",
-        "emergency_buffer",
-        "asset_building"
-    ]] = None
-
-    payment_method: Literal[
-        "Cash",
-        "Bank Transfer",
-        "Debit Card",
-        "Credit Card",
-        "POS",
-        "Mobile Wallet",
-        "Other"
-    ]
+    wealth_bucket: Optional[WealthBucket] = None
+
+    payment_method: PaymentMethod
 
     date: date
     description: Optional[str] = None
@@ -58,3 +66,43 @@ class ExpenseResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ExpenseBulkSelection(BaseModel):
+    """Which of the user's expenses a bulk change applies to. All given criteria must match."""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=MAX_BULK_ITEMS)
+    category: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+    @model_validator(mode="after")
+    def require_criteria(self):
+        if not self.ids and all(
+            getattr(self, f) is None for f in ("category", "start_date", "end_date")
+        ):
+            raise ValueError("Provide ids or at least one filter")
+        return self
+
+
+class ExpenseBulkChanges(BaseModel):
+    """Fields to set on every selected expense; only fields sent are changed."""
+    category: Optional[ExpenseCategory] = None
+    necessity_type: Optional[NecessityType] = None
+    wealth_bucket: Optional[WealthBucket] = None
+    payment_method: Optional[PaymentMethod] = None
+    description: Optional[str] = None
+
+    @model_validator(mode="after")
+    def require_changes(self):
+        if not self.model_fields_set:
+            raise ValueError("Provide at least one field to change")
+        # Only wealth_bucket and description may be cleared
+        for field in ("category", "necessity_type", "payment_method"):
+            if field in self.model_fields_set and getattr(self, field) is None:
+                raise ValueError(f"{field} cannot be null")
+        return self
+
+
+class ExpenseBulkUpdate(BaseModel):
+    where: ExpenseBulkSelection
+    changes: ExpenseBulkChanges
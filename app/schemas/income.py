@@ -1,32 +1,29 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import date
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 from decimal import Decimal
+from app.schemas.common import MAX_BULK_ITEMS
+from app.schemas.expense import PaymentMethod
+
+
+IncomeSource = Literal[
+    "Salary",
+    "Freelance",
+    "Business",
+    "Consultation",
+    "Gift",
+    "Bonus",
+    "Refund",
+    "Other"
+]
 
 
 class IncomeCreate(BaseModel):
     amount: Decimal = Field(gt=0)
 
-    source: Literal[
-        "Salary",
-        "Freelance",
-        "Business",
-        "Consultation",
-        "Gift",
-        "Bonus",
-        "Refund",
-        "Other"
-    ]
-
-    payment_method: Literal[
-        "Cash",
-        "Bank Transfer",
-        "Debit Card",
-        "Credit Card",
-        "POS",
-        "Mobile Wallet",
-        "Other"
-    ]
+    source: IncomeSource
+
+    payment_method: PaymentMethod
 
     date: date
     description: Optional[str] = None
@@ -42,3 +39,40 @@ class IncomeResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class IncomeBulkSelection(BaseModel):
+    """Which of the user's incomes a bulk change applies to. All given criteria must match."""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=MAX_BULK_ITEMS)
+    source: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+    @model_validator(mode="after")
+    def require_criteria(self):
+        if not self.ids and all(
+            getattr(self, f) is None for f in ("source", "start_date", "end_date")
+        ):
+            raise ValueError("Provide ids or at least one filter")
+        return self
+
+
+class IncomeBulkChanges(BaseModel):
+    """Fields to set on every selected income; only fields sent are changed."""
+    source: Optional[IncomeSource] = None
+    payment_method: Optional[PaymentMethod] = None
+    description: Optional[str] = None
+
+    @model_validator(mode="after")
+    def require_changes(self):
+        if not self.model_fields_set:
+            raise ValueError("Provide at least one field to change")
+        for field in ("source", "payment_method"):
+            if field in self.model_fields_set and getattr(self, field) is None:
+                raise ValueError(f"{field} cannot be null")
+        return self
+
+
+class IncomeBulkUpdate(BaseModel):
+    where: IncomeBulkSelection
+    changes: IncomeBulkChanges
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+from app.models.statement_import import ImportStatus
+
+
+class StatementImportResponse(BaseModel):
+    id: int
+    filename: Optional[str] = None
+    status: ImportStatus
+    rows_received: int
+    expenses_imported: int
+    incomes_imported: int
+    rows_rejected: int
+    rejected_samples: Optional[List[Dict[str, Any]]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,85 @@
+"""
+Incremental bookkeeping for admin analytics.
+
+Every income or expense write calls record_activity() inside the same
+transaction, so analytics tables stay current without rescanning
+transaction history on each admin request.
+"""
+
+from datetime import date, timedelta
+from typing import Iterable, List
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, cast, values, column, Date
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.user import User
+from app.models.cohort_activity import CohortActivity
+from app.models.daily_active_sketch import DailyActiveSketch, SKETCH_SHARDS
+from app.services import hyperloglog
+
+
+def record_activity(db: Session, user_id: int, activity_date: date) -> None:
+    """Mark the user as active on activity_date for retention and DAU tracking."""
+    record_activity_dates(db, user_id, [activity_date])
+
+
+def record_activity_dates(db: Session, user_id: int, activity_dates: Iterable[date]) -> None:
+    """Same as record_activity for many dates, in two statements total."""
+    days = sorted(set(activity_dates))
+    if not days:
+        return
+    _record_cohort_activity(db, user_id, days)
+    _record_daily_sketch(db, user_id, days)
+
+
+def _record_cohort_activity(db: Session, user_id: int, days: List[date]) -> None:
+    """Mark the user as active in each week containing one of the days."""
+    weeks = sorted({d - timedelta(days=d.weekday()) for d in days})
+    activity_weeks = values(column("week", Date), name="activity_weeks").data(
+        [(w,) for w in weeks]
+    )
+    cohort_week = cast(func.date_trunc("week", User.created_at), Date)
+
+    # Activity backdated before the signup week has no cohort offset
+    stmt = (
+        insert(CohortActivity)
+        .from_select(
+            ["user_id", "week_offset", "cohort_week"],
+            select(
+                User.id,
+                (activity_weeks.c.week - cohort_week) // 7,
+                cohort_week
+            )
+            .where(User.id == user_id, cohort_week <= activity_weeks.c.week)
+        )
+        .on_conflict_do_nothing()
+    )
+    db.execute(stmt)
+
+
+def _record_daily_sketch(db: Session, user_id: int, days: List[date]) -> None:
+    """
+    Add the user to each day's HyperLogLog sketch with a single-register
+    update on the user's shard row. ON CONFLICT locks the row even when
+    the WHERE skips the write, so sharding keeps concurrent writers from
+    serializing on one row per day.
+    """
+    index, rank = hyperloglog.register_for(user_id)
+    shard = user_id % SKETCH_SHARDS
+
+    initial = bytearray(hyperloglog.REGISTER_COUNT)
+    initial[index] = rank
+
+    stmt = insert(DailyActiveSketch).values(
+        [{"day": d, "shard": shard, "registers": bytes(initial)} for d in days]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailyActiveSketch.day, DailyActiveSketch.shard],
+        set_={
+            "registers": func.set_byte(DailyActiveSketch.registers, index, rank),
+            "updated_at": func.now(),
+        },
+        # Registers only ever grow; skip the write when this rank adds nothing
+        where=func.get_byte(DailyActiveSketch.registers, index) < rank,
+    )
+    db.execute(stmt)
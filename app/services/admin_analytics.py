@@ -6,35 +6,67 @@ ANALYTICS DEFINITIONS:
   Active User: A user who has logged at least one income OR expense record.
   Last Active: The most recent date of any income or expense record.
   Retention: A user "returned" if they logged any transaction in the window.
+  Cohort: Users grouped by the week (Monday start) they signed up.
   Streak: Consecutive days with at least one transaction (income or expense).
   STS: Safe to Spend = monthly earned income - expenses - bucket allocations - committed bills.
   Low STS: Safe to Spend below ₦1,000.
 """
 
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from sqlalchemy import event, func, case, cast, select, true, union, union_all, text, Date
+from sqlalchemy.orm import aliased
 from decimal import Decimal
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List
 
+from app.core.config import settings
+from app.core.streaming import encode_records
+from app.database import read_sessionmaker, lift_session_timeouts
 from app.models.user import User
 from app.models.income import Income
 from app.models.expense import Expense
 from app.models.bucket_activity import BucketActivity, ActivityType
 from app.models.committed_expense import CommittedExpense
+from app.models.cohort_activity import CohortActivity
+from app.models.daily_active_sketch import DailyActiveSketch
+from app.services import hyperloglog
 from app.services.finance import calculate_safe_to_spend
 
+logger = logging.getLogger(__name__)
+
+# Dashboard sections run side by side, each on its own pooled connection
+DASHBOARD_WORKERS = 3
+
+_dashboard_executor = ThreadPoolExecutor(max_workers=DASHBOARD_WORKERS, thread_name_prefix="admin-dashboard")
+
 
 def _to_decimal(value):
     return value if isinstance(value, Decimal) else Decimal(str(value))
 
 
+def _day_series(start: date, end: date):
+    """One row per calendar day from start to end (inclusive)."""
+    return (
+        select(
+            cast(
+                func.generate_series(start, end, text("interval '1 day'")),
+                Date
+            ).label("day")
+        )
+        .subquery()
+    )
+
+
 # ==========================================================
 # USER BEHAVIOR METRICS
 # ==========================================================
 
-def get_user_metrics(db: Session) -> Dict:
-    """Total users, signup trends, active users."""
+def get_user_metrics(db: Session, days: int = 7) -> Dict:
+    """Total users, signup trend over the last `days` days, active users."""
     today = date.today()
     week_ago = today - timedelta(days=7)
     month_start = today.replace(day=1)
@@ -85,17 +117,31 @@ def get_user_metrics(db: Session) -> Dict:
         func.coalesce(active_week_income.c.user_id, active_week_expense.c.user_id)
     ))).scalar() or 0
     
-    # Signup trend (last 7 days)
-    signup_trend = []
-    for i in range(6, -1, -1):
-        d = today - timedelta(days=i)
-        count = db.query(func.count(User.id)).filter(
-            func.date(User.created_at) == d
-        ).scalar()
-        signup_trend.append({
-            "date": d.isoformat(),
-            "count": count
-        })
+    # Signup trend (last N days) — one grouped query regardless of window
+    trend_start = today - timedelta(days=days - 1)
+    day_series = _day_series(trend_start, today)
+
+    daily_signups = (
+        db.query(
+            func.date(User.created_at).label("day"),
+            func.count(User.id).label("count")
+        )
+        .filter(User.created_at >= trend_start)
+        .group_by(func.date(User.created_at))
+        .subquery()
+    )
+
+    signup_rows = (
+        db.query(day_series.c.day, func.coalesce(daily_signups.c.count, 0))
+        .outerjoin(daily_signups, daily_signups.c.day == day_series.c.day)
+        .order_by(day_series.c.day)
+        .all()
+    )
+
+    signup_trend = [
+        {"date": d.isoformat(), "count": count}
+        for d, count in signup_rows
+    ]
     
     return {
         "total_users": total_users,
@@ -205,8 +251,8 @@ def get_financial_metrics(db: Session) -> Dict:
 # ENGAGEMENT METRICS
 # ==========================================================
 
-def get_engagement_metrics(db: Session) -> Dict:
-    """Feature adoption and engagement tracking."""
+def get_engagement_metrics(db: Session, days: int = 7) -> Dict:
+    """Feature adoption and engagement tracking over the last `days` days."""
     total_users = db.query(func.count(User.id)).scalar() or 1
     
     # Users with at least 1 income
@@ -221,21 +267,38 @@ def get_engagement_metrics(db: Session) -> Dict:
     # Users with bills
     users_with_bills = db.query(func.count(func.distinct(CommittedExpense.user_id))).scalar() or 0
     
-    # Daily activity trend (last 7 days)
+    # Daily activity trend (last N days) — one grouped query regardless of window
     today = date.today()
-    activity_trend = []
-    for i in range(6, -1, -1):
-        d = today - timedelta(days=i)
-        income_users = db.query(func.count(func.distinct(Income.user_id))).filter(
-            Income.date == d
-        ).scalar() or 0
-        expense_users = db.query(func.count(func.distinct(Expense.user_id))).filter(
-            Expense.date == d
-        ).scalar() or 0
-        activity_trend.append({
-            "date": d.isoformat(),
-            "active_users": max(income_users, expense_users)
-        })
+    trend_start = today - timedelta(days=days - 1)
+    day_series = _day_series(trend_start, today)
+
+    transactions = union_all(
+        select(Income.user_id, Income.date)
+        .where(Income.date >= trend_start, Income.date <= today),
+        select(Expense.user_id, Expense.date)
+        .where(Expense.date >= trend_start, Expense.date <= today),
+    ).subquery()
+
+    daily_active = (
+        db.query(
+            transactions.c.date.label("day"),
+            func.count(func.distinct(transactions.c.user_id)).label("active_users")
+        )
+        .group_by(transactions.c.date)
+        .subquery()
+    )
+
+    activity_rows = (
+        db.query(day_series.c.day, func.coalesce(daily_active.c.active_users, 0))
+        .outerjoin(daily_active, daily_active.c.day == day_series.c.day)
+        .order_by(day_series.c.day)
+        .all()
+    )
+
+    activity_trend = [
+        {"date": d.isoformat(), "active_users": active_users}
+        for d, active_users in activity_rows
+    ]
     
     return {
         "total_users": total_users,
@@ -251,50 +314,256 @@ def get_engagement_metrics(db: Session) -> Dict:
     }
 
 
+# ==========================================================
+# APPROXIMATE ACTIVE USERS (DAU / WAU / MAU)
+# ==========================================================
+
+def get_active_user_estimates(db: Session, days: int = 30) -> Dict:
+    """
+    DAU trend plus WAU, MAU and whole-window unique users, estimated from
+    the per-day HyperLogLog sketches (no scan of incomes or expenses).
+    """
+    today = date.today()
+    window_start = today - timedelta(days=max(days, 30) - 1)
+
+    shards = {}
+    for day, registers in (
+        db.query(DailyActiveSketch.day, DailyActiveSketch.registers)
+        .filter(DailyActiveSketch.day >= window_start, DailyActiveSketch.day <= today)
+    ):
+        shards.setdefault(day, []).append(registers)
+
+    # One sketch per day: the union of that day's shards
+    sketches = {day: hyperloglog.merge(rows) for day, rows in shards.items()}
+
+    def unique_between(start: date) -> int:
+        return hyperloglog.estimate(hyperloglog.merge(
+            registers for d, registers in sketches.items() if d >= start
+        ))
+
+    trend_start = today - timedelta(days=days - 1)
+    dau_trend = []
+    for i in range(days):
+        d = trend_start + timedelta(days=i)
+        registers = sketches.get(d)
+        dau_trend.append({
+            "date": d.isoformat(),
+            "active_users": hyperloglog.estimate(registers) if registers else 0
+        })
+
+    return {
+        "dau": dau_trend[-1]["active_users"],
+        "wau": unique_between(today - timedelta(days=6)),
+        "mau": unique_between(today - timedelta(days=29)),
+        "unique_in_window": unique_between(trend_start),
+        "dau_trend": dau_trend,
+        "standard_error": round(hyperloglog.STANDARD_ERROR, 4),
+    }
+
+
+# ==========================================================
+# DASHBOARD (CONCURRENT SECTIONS)
+# ==========================================================
+
+class SectionTimeout(Exception):
+    """A dashboard section ran past its budget or was abandoned by the caller."""
+
+
+def _run_section(
+    section: Callable[..., Dict],
+    timeout_seconds: float,
+    abandoned: threading.Event,
+    **kwargs
+) -> Dict:
+    """
+    Run one dashboard section on its own session.
+
+    The budget starts when the section starts running, not while it sits
+    in the executor queue. Sections issue many short statements, so the
+    deadline is checked before each one; statement_timeout bounds any
+    single long statement.
+    """
+    if abandoned.is_set():
+        raise SectionTimeout()
+
+    deadline = time.monotonic() + timeout_seconds
+    db = read_sessionmaker()()
+
+    def check_deadline(orm_execute_state):
+        if abandoned.is_set() or time.monotonic() > deadline:
+            raise SectionTimeout()
+
+    event.listen(db, "do_orm_execute", check_deadline)
+    try:
+        db.execute(
+            text("SELECT set_config('statement_timeout', :ms, true)"),
+            {"ms": str(int(timeout_seconds * 1000))}
+        )
+        return section(db, **kwargs)
+    finally:
+        db.close()
+
+
+def get_dashboard(days: int = 7, timeout_seconds: float = None) -> Dict:
+    """
+    User, financial and engagement metrics computed concurrently.
+
+    A section that fails or exceeds the timeout is returned as
+    {"error": ...} and the response is flagged partial.
+    """
+    timeout_seconds = timeout_seconds or settings.ADMIN_SECTION_TIMEOUT_SECONDS
+
+    sections = {
+        "users": (get_user_metrics, {"days": days}),
+        "financial": (get_financial_metrics, {}),
+        "engagement": (get_engagement_metrics, {"days": days}),
+    }
+
+    abandoned = threading.Event()
+    futures = {
+        name: _dashboard_executor.submit(_run_section, section, timeout_seconds, abandoned, **kwargs)
+        for name, (section, kwargs) in sections.items()
+    }
+
+    # Each section times itself from its own start; the wait here also
+    # allows one budget of queueing behind other dashboard loads.
+    deadline = time.monotonic() + 2 * timeout_seconds
+    result = {}
+    failed = []
+
+    try:
+        for name, future in futures.items():
+            try:
+                result[name] = future.result(timeout=max(deadline - time.monotonic(), 0))
+            except (FutureTimeout, SectionTimeout):
+                logger.warning("Admin dashboard section %s timed out after %ss", name, timeout_seconds)
+                result[name] = {"error": "timeout"}
+                failed.append(name)
+            except Exception:
+                logger.exception("Admin dashboard section %s failed", name)
+                result[name] = {"error": "failed"}
+                failed.append(name)
+    finally:
+        # Drop sections still queued and stop running ones at their next statement
+        abandoned.set()
+        for future in futures.values():
+            future.cancel()
+
+    result["partial"] = bool(failed)
+    result["failed_sections"] = failed
+    return result
+
+
 # ==========================================================
 # USER LIST (ANONYMIZED)
 # ==========================================================
 
+USER_EXPORT_FIELDS = [
+    "id", "name", "email", "created_at", "days_since_signup",
+    "income_count", "expense_count", "has_buckets", "has_bills",
+    "last_active", "days_since_active", "is_admin",
+]
+
+
+def _activity_stats(model, today: date):
+    return (
+        func.count(model.id).label("count"),
+        func.max(model.date).filter(model.date <= today).label("last_date")
+    )
+
+
+def _user_summary_query(db: Session, today: date, skip: int = None, limit: int = None):
+    """
+    Users joined to their per-user activity aggregates in one statement.
+
+    With skip/limit, only that page of users is selected first and each
+    one's counts come from a LATERAL lookup on ix_*_user_date. Without,
+    every user is joined to whole-table GROUP BY aggregates, which is
+    cheaper when all users are wanted (the export).
+    """
+    if limit is not None:
+        page = (
+            select(User)
+            .order_by(User.created_at.desc(), User.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .subquery()
+        )
+        user = aliased(User, page)
+
+        income_stats = select(*_activity_stats(Income, today)).where(Income.user_id == user.id).lateral()
+        expense_stats = select(*_activity_stats(Expense, today)).where(Expense.user_id == user.id).lateral()
+        income_join = expense_join = true()
+    else:
+        user = User
+
+        income_stats = (
+            select(Income.user_id, *_activity_stats(Income, today))
+            .group_by(Income.user_id)
+            .subquery()
+        )
+        expense_stats = (
+            select(Expense.user_id, *_activity_stats(Expense, today))
+            .group_by(Expense.user_id)
+            .subquery()
+        )
+        income_join = income_stats.c.user_id == User.id
+        expense_join = expense_stats.c.user_id == User.id
+
+    has_buckets = (
+        select(BucketActivity.id).where(BucketActivity.user_id == user.id).exists()
+    )
+    has_bills = (
+        select(CommittedExpense.id).where(CommittedExpense.user_id == user.id).exists()
+    )
+
+    return (
+        db.query(
+            user.id,
+            user.full_name,
+            user.email,
+            user.created_at,
+            user.is_admin,
+            func.coalesce(income_stats.c.count, 0),
+            func.coalesce(expense_stats.c.count, 0),
+            has_buckets,
+            has_bills,
+            # GREATEST ignores NULLs, so one-sided activity still counts
+            func.greatest(income_stats.c.last_date, expense_stats.c.last_date),
+        )
+        .select_from(user)
+        .outerjoin(income_stats, income_join)
+        .outerjoin(expense_stats, expense_join)
+        .order_by(user.created_at.desc(), user.id.desc())
+    )
+
+
+def _user_summary_row(row, today: date) -> Dict:
+    (user_id, full_name, email, created_at, is_admin,
+     income_count, expense_count, has_buckets, has_bills, last_active) = row
+
+    return {
+        "id": user_id,
+        "name": full_name,
+        "email": email,
+        "created_at": created_at.isoformat() if created_at else None,
+        "days_since_signup": (today - created_at.date()).days if created_at else 0,
+        "income_count": income_count,
+        "expense_count": expense_count,
+        "has_buckets": has_buckets,
+        "has_bills": has_bills,
+        "last_active": last_active.isoformat() if last_active else None,
+        "days_since_active": (today - last_active).days if last_active else None,
+        "is_admin": is_admin,
+    }
+
+
 def get_user_list(db: Session, skip: int = 0, limit: int = 50) -> List[Dict]:
     """Get user list with behavioral summaries (no financial details exposed)."""
-    users = db.query(User).order_by(User.created_at.desc()).offset(skip).limit(limit).all()
     today = date.today()
-    
-    result = []
-    for user in users:
-        # Days since signup
-        days_since_signup = (today - user.created_at.date()).days if user.created_at else 0
-        
-        # Transaction count
-        income_count = db.query(func.count(Income.id)).filter(Income.user_id == user.id).scalar()
-        expense_count = db.query(func.count(Expense.id)).filter(Expense.user_id == user.id).scalar()
-        
-        # Has buckets
-        has_buckets = db.query(BucketActivity).filter(BucketActivity.user_id == user.id).first() is not None
-        
-        # Has bills
-        has_bills = db.query(CommittedExpense).filter(CommittedExpense.user_id == user.id).first() is not None
-        
-        # Last active date
-        last_income = db.query(func.max(Income.date)).filter(Income.user_id == user.id, Income.date <= today).scalar()
-        last_expense = db.query(func.max(Expense.date)).filter(Expense.user_id == user.id, Expense.date <= today).scalar()
-        last_active = max(last_income, last_expense) if last_income or last_expense else None
-        days_since_active = (today - last_active).days if last_active else None
-
-        result.append({
-            "id": user.id,
-            "name": user.full_name,
-            "email": user.email,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "days_since_signup": days_since_signup,
-            "income_count": income_count,
-            "expense_count": expense_count,
-            "has_buckets": has_buckets,
-            "has_bills": has_bills,
-            "last_active": last_active.isoformat() if last_active else None,
-            "days_since_active": days_since_active,
-            "is_admin": user.is_admin,
-        })
+
+    rows = _user_summary_query(db, today, skip, limit).all()
+    result = [_user_summary_row(row, today) for row in rows]
     
     total_users = db.query(func.count(User.id)).scalar()
     
@@ -305,53 +574,128 @@ def get_user_list(db: Session, skip: int = 0, limit: int = 50) -> List[Dict]:
         "data": result
     }
 
+
+def iter_user_export(export_format: str = "csv", batch_size: int = 1000) -> Iterator[str]:
+    """
+    Stream every user's behavioral summary as CSV or NDJSON.
+
+    Rows come off a server-side cursor in batches of `batch_size`, so
+    memory stays flat however many users there are. Owns its session
+    because it outlives the request's dependencies.
+    """
+    today = date.today()
+    db = read_sessionmaker()()
+
+    try:
+        # The client sets the pace; don't let idle gaps between batches time out
+        lift_session_timeouts(db)
+        rows = (
+            _user_summary_query(db, today)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from encode_records(
+            (_user_summary_row(row, today) for row in rows),
+            USER_EXPORT_FIELDS,
+            export_format,
+            batch_size
+        )
+    finally:
+        db.close()
+
 # ==========================================================
 # RETENTION ANALYTICS
 # ==========================================================
 
 def get_retention_metrics(db: Session) -> Dict:
-    """Day 1, Day 7, Day 30 retention rates."""
+    """Day 1, Day 7, Day 30 retention rates plus the weekly cohort matrix."""
     today = date.today()
-    
-    # All users who signed up at least N days ago
-    day1_cutoff = today - timedelta(days=1)
-    day7_cutoff = today - timedelta(days=7)
-    day30_cutoff = today - timedelta(days=30)
-    
-    # Users eligible for each retention window
-    eligible_day1 = db.query(User.id).filter(User.created_at <= day1_cutoff).all()
-    eligible_day7 = db.query(User.id).filter(User.created_at <= day7_cutoff).all()
-    eligible_day30 = db.query(User.id).filter(User.created_at <= day30_cutoff).all()
-    
-    def count_returned(user_ids, within_days):
-        if not user_ids:
-            return 0, 0
+
+    def count_returned(within_days):
         cutoff = today - timedelta(days=within_days)
-        ids = [u[0] for u in user_ids]
-        returned = db.query(func.count(func.distinct(Income.user_id))).filter(
-            Income.user_id.in_(ids),
-            Income.date >= cutoff,
-            Income.date <= today
-        ).scalar() or 0
-        # Also check expenses
-        returned_exp = db.query(func.count(func.distinct(Expense.user_id))).filter(
-            Expense.user_id.in_(ids),
-            Expense.date >= cutoff,
-            Expense.date <= today
-        ).scalar() or 0
-        return max(returned, returned_exp), len(ids)
-    
-    d1_returned, d1_total = count_returned(eligible_day1, 1)
-    d7_returned, d7_total = count_returned(eligible_day7, 7)
-    d30_returned, d30_total = count_returned(eligible_day30, 30)
-    
+
+        recently_active = union(
+            select(Income.user_id).where(Income.date >= cutoff, Income.date <= today),
+            select(Expense.user_id).where(Expense.date >= cutoff, Expense.date <= today),
+        ).subquery()
+
+        # Users who signed up at least N days ago, and how many of them returned
+        total, returned = (
+            db.query(func.count(User.id), func.count(recently_active.c.user_id))
+            .outerjoin(recently_active, recently_active.c.user_id == User.id)
+            .filter(User.created_at <= cutoff)
+            .one()
+        )
+        return returned, total
+
+    d1_returned, d1_total = count_returned(1)
+    d7_returned, d7_total = count_returned(7)
+    d30_returned, d30_total = count_returned(30)
+
     return {
         "day1": {"returned": d1_returned, "total": d1_total, "rate": round((d1_returned / d1_total * 100), 1) if d1_total > 0 else 0},
         "day7": {"returned": d7_returned, "total": d7_total, "rate": round((d7_returned / d7_total * 100), 1) if d7_total > 0 else 0},
         "day30": {"returned": d30_returned, "total": d30_total, "rate": round((d30_returned / d30_total * 100), 1) if d30_total > 0 else 0},
+        "cohorts": get_cohort_retention(db),
     }
 
 
+def get_cohort_retention(db: Session, weeks: int = 12) -> Dict:
+    """
+    Weekly signup cohort x weeks-since-signup retention matrix.
+
+    Read straight from the incrementally maintained cohort_activity table;
+    cohort sizes come from one grouped count over users.
+    """
+    today = date.today()
+    current_week = today - timedelta(days=today.weekday())
+    first_cohort = current_week - timedelta(weeks=weeks - 1)
+
+    signup_week = cast(func.date_trunc("week", User.created_at), Date)
+
+    cohort_sizes = dict(
+        db.query(signup_week, func.count(User.id))
+        .filter(User.created_at >= first_cohort)
+        .group_by(signup_week)
+        .all()
+    )
+
+    active_rows = (
+        db.query(
+            CohortActivity.cohort_week,
+            CohortActivity.week_offset,
+            func.count(CohortActivity.user_id)
+        )
+        .filter(CohortActivity.cohort_week >= first_cohort)
+        .group_by(CohortActivity.cohort_week, CohortActivity.week_offset)
+        .all()
+    )
+
+    active = {(cohort, offset): count for cohort, offset, count in active_rows}
+
+    cohorts = []
+    for i in range(weeks):
+        cohort = first_cohort + timedelta(weeks=i)
+        size = cohort_sizes.get(cohort, 0)
+        elapsed_weeks = (current_week - cohort).days // 7
+
+        retention = []
+        for offset in range(elapsed_weeks + 1):
+            count = active.get((cohort, offset), 0)
+            retention.append({
+                "week": offset,
+                "active": count,
+                "rate": round((count / size * 100), 1) if size > 0 else 0
+            })
+
+        cohorts.append({
+            "cohort_week": cohort.isoformat(),
+            "size": size,
+            "retention": retention
+        })
+
+    return {"weeks": weeks, "cohorts": cohorts}
+
+
 # ==========================================================
 # STREAK DISTRIBUTION
 # ==========================================================
@@ -1,39 +1,187 @@
+import hashlib
+import hmac
+import logging
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.user import User
+from app.models.refresh_token import RefreshToken
 from app.schemas.auth import UserRegister
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.config import settings
+from app.core.security import create_access_token, invalidate_cached_user
+from app.core.hashing import hash_password_async, verify_password_async, verify_and_update_password_async
+from app.services.expiry import purge_periodically
+
+logger = logging.getLogger(__name__)
+
 
+# Database work runs on the threadpool; bcrypt runs on the bounded hash
+# executor (app/core/hashing.py) so a login burst can't starve other routes.
 
-def register_user(db: Session, user_data: UserRegister):
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+def _get_user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def _add_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+async def register_user(db: Session, user_data: UserRegister):
+    existing_user = await run_in_threadpool(_get_user_by_email, db, user_data.email)
     if existing_user:
         return None
 
     new_user = User(
         full_name=user_data.full_name,
         email=user_data.email,
-        hashed_password=hash_password(user_data.password)
+        hashed_password=await hash_password_async(user_data.password)
     )
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    return await run_in_threadpool(_add_user, db, new_user)
+
+
+_fake_hash_value: Optional[str] = None
 
-    return new_user
 
+async def _fake_hash() -> str:
+    """Hash at the configured cost, so unknown emails take as long as real ones."""
+    global _fake_hash_value
+    if _fake_hash_value is None:
+        _fake_hash_value = await hash_password_async(secrets.token_urlsafe(16))
+    return _fake_hash_value
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
+
+async def authenticate_user(db: Session, email: str, password: str) -> Optional[Dict]:
+    user = await run_in_threadpool(_get_user_by_email, db, email)
 
     # Fake hash to normalize timing
-    fake_hash = "$2b$12$C6UzMDM.H6dfI/f/IKcEeO5mZ8n6vFQ2uXk8rj/3dD1h5a6V7Wc8W"
+    hashed_password = user.hashed_password if user else await _fake_hash()
 
-    hashed_password = user.hashed_password if user else fake_hash
+    valid, new_hash = await verify_and_update_password_async(password, hashed_password)
 
-    if not verify_password(password, hashed_password):
+    if not valid or not user:
         return None
 
-    if not user:
+    return await run_in_threadpool(_start_session, db, user, new_hash)
+
+
+def _get_user(db: Session, user_id: int) -> Optional[User]:
+    return db.get(User, user_id)
+
+
+def _replace_password(db: Session, user: User, new_hash: str) -> Dict:
+    # A new version invalidates every existing access and refresh token
+    user.token_version = user.token_version + 1
+    tokens = _start_session(db, user, new_hash)
+    invalidate_cached_user(user.id)
+    return tokens
+
+
+async def change_password(db: Session, user_id: int, current_password: str, new_password: str) -> Optional[Dict]:
+    """
+    Replace the user's password and sign out every other session.
+    Returns a fresh token pair for the caller, or None if the current
+    password is wrong.
+    """
+    user = await run_in_threadpool(_get_user, db, user_id)
+    if user is None or not await verify_password_async(current_password, user.hashed_password):
         return None
 
-    return create_access_token(user_id=user.id)
+    new_hash = await hash_password_async(new_password)
+    return await run_in_threadpool(_replace_password, db, user, new_hash)
+
+
+# =========================
+# Refresh tokens
+# =========================
+# Clients trade a refresh token for a new access token without a bcrypt
+# verify. Each refresh token works once and is replaced by a new one in
+# the same family; presenting a used token revokes the whole family.
+
+def _hash_refresh_token(token: str) -> str:
+    return hmac.new(
+        settings.SECRET_KEY.encode("utf-8"),
+        token.encode("utf-8"),
+        hashlib.sha256
+    ).hexdigest()
+
+
+def _issue_refresh_token(db: Session, user: User, family_id: Optional[str] = None) -> str:
+    token = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        token_hash=_hash_refresh_token(token),
+        user_id=user.id,
+        family_id=family_id or secrets.token_hex(16),
+        token_version=user.token_version,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    ))
+    return token
+
+
+def _token_pair(user: User, refresh_token: str) -> Dict:
+    return {
+        "access_token": create_access_token(
+            user_id=user.id,
+            token_version=user.token_version
+        ),
+        "token_type": "bearer",
+        "refresh_token": refresh_token
+    }
+
+
+def _start_session(db: Session, user: User, new_hash: Optional[str] = None) -> Dict:
+    if new_hash:
+        # Stored hash used a different bcrypt cost; upgrade it now that we know the password
+        user.hashed_password = new_hash
+
+    tokens = _token_pair(user, _issue_refresh_token(db, user))
+    db.commit()
+
+    purge_periodically(db, RefreshToken, settings.REFRESH_TOKEN_PURGE_INTERVAL_SECONDS)
+    return tokens
+
+
+def rotate_refresh_token(db: Session, token: str) -> Optional[Dict]:
+    """
+    Exchange a refresh token for a new token pair. One primary-key lookup
+    (joined to the user for the current token version) plus an HMAC.
+    """
+    row = db.execute(
+        select(RefreshToken, User)
+        .join(User, User.id == RefreshToken.user_id)
+        .where(RefreshToken.token_hash == _hash_refresh_token(token))
+        .with_for_update(of=RefreshToken)
+    ).first()
+
+    if row is None:
+        return None
+
+    stored, user = row
+    now = datetime.now(timezone.utc)
+
+    if stored.used_at is not None:
+        # Already rotated: either the client or an attacker holds a copy.
+        # Read what the log needs first; the commit expires the deleted row.
+        user_id, family_id = stored.user_id, stored.family_id
+        db.query(RefreshToken).filter(
+            RefreshToken.family_id == family_id
+        ).delete(synchronize_session=False)
+        db.commit()
+        logger.warning("Refresh token reuse detected for user %s; family revoked", user_id)
+        return None
+
+    if stored.expires_at <= now or stored.token_version != user.token_version:
+        db.rollback()
+        return None
+
+    stored.used_at = now
+    tokens = _token_pair(user, _issue_refresh_token(db, user, stored.family_id))
+    db.commit()
+    return tokens
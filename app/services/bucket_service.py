@@ -1,6 +1,6 @@
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, lambda_stmt, select
 from decimal import Decimal, ROUND_HALF_UP
 from typing import List, Dict, Optional
 
@@ -8,6 +8,8 @@ from app.models.bucket_activity import BucketActivity, ActivityType
 from app.models.expense import Expense
 from app.models.income import Income
 from app.models.custom_bucket import CustomBucket
+from app.services.activity_tracking import record_activity
+from app.services.transaction_counts import adjust_transaction_counts
 from app.schemas.bucket import (
     BucketAllocate,
     BucketWithdraw, 
@@ -22,70 +24,69 @@ def _to_decimal(value):
     return value if isinstance(value, Decimal) else Decimal(str(value))
 
 
-def _get_bucket_balance(db: Session, user_id: int, bucket_name: str) -> Decimal:
-    """Calculate current balance for a specific bucket from activity log."""
-    
-    # All allocations (positive)
-    allocations = _to_decimal(
-        db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-        .filter(
-            BucketActivity.user_id == user_id,
-            BucketActivity.bucket_name == bucket_name,
-            BucketActivity.activity_type == ActivityType.allocation
-        )
-        .scalar()
-    )
-    
-    # Transfers in (positive)
-    transfers_in = _to_decimal(
-        db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-        .filter(
-            BucketActivity.user_id == user_id,
-            BucketActivity.bucket_name == bucket_name,
-            BucketActivity.activity_type == ActivityType.transfer_in
-        )
-        .scalar()
-    )
-    
-    # Withdrawals - transfer only (negative, no expense created)
-    withdrawals_transfer = _to_decimal(
-        db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-        .filter(
-            BucketActivity.user_id == user_id,
-            BucketActivity.bucket_name == bucket_name,
-            BucketActivity.activity_type == ActivityType.withdrawal_transfer
-        )
-        .scalar()
-    )
-    
-    # Withdrawals - use as expense (negative, expense was created)
-    withdrawals_expense = _to_decimal(
-        db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-        .filter(
-            BucketActivity.user_id == user_id,
-            BucketActivity.bucket_name == bucket_name,
-            BucketActivity.activity_type == ActivityType.withdrawal_expense
+# ==========================================================
+# CACHED AGGREGATES
+# ==========================================================
+# lambda_stmt caches the built statement and its compiled SQL by the
+# lambda's code location; user_id and bucket_name are pulled out as bound
+# parameters on each call, so hot summary requests skip statement
+# construction and compilation entirely.
+
+def bucket_activity_totals(
+    db: Session,
+    user_id: int,
+    bucket_name: Optional[str] = None
+) -> Dict[str, Dict[ActivityType, Decimal]]:
+    """Sum of activity amounts per bucket and activity type, in one grouped query."""
+    stmt = lambda_stmt(
+        lambda: select(
+            BucketActivity.bucket_name,
+            BucketActivity.activity_type,
+            func.sum(BucketActivity.amount)
         )
-        .scalar()
+        .where(BucketActivity.user_id == user_id)
+        .group_by(BucketActivity.bucket_name, BucketActivity.activity_type)
     )
-    
-    # Transfers out (negative)
-    transfers_out = _to_decimal(
-        db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-        .filter(
-            BucketActivity.user_id == user_id,
-            BucketActivity.bucket_name == bucket_name,
-            BucketActivity.activity_type == ActivityType.transfer_out
-        )
-        .scalar()
+    if bucket_name is not None:
+        stmt += lambda s: s.where(BucketActivity.bucket_name == bucket_name)
+
+    totals: Dict[str, Dict[ActivityType, Decimal]] = {}
+    for name, activity_type, amount in db.execute(stmt):
+        totals.setdefault(name, {})[activity_type] = _to_decimal(amount)
+    return totals
+
+
+def bucket_breakdown(totals: Dict[ActivityType, Decimal]) -> Dict[str, Decimal]:
+    """Allocations, transfers and withdrawals of one bucket, and its balance."""
+    zero = Decimal("0.00")
+    allocations = totals.get(ActivityType.allocation, zero)
+    transfers_in = totals.get(ActivityType.transfer_in, zero)
+    withdrawals = (
+        totals.get(ActivityType.withdrawal_transfer, zero)
+        + totals.get(ActivityType.withdrawal_expense, zero)
     )
-    
-    balance = allocations + transfers_in - withdrawals_transfer - withdrawals_expense - transfers_out
-    return balance
+    transfers_out = totals.get(ActivityType.transfer_out, zero)
 
+    return {
+        "allocations": allocations,
+        "transfers_in": transfers_in,
+        "withdrawals": withdrawals,
+        "transfers_out": transfers_out,
+        "balance": allocations + transfers_in - withdrawals - transfers_out,
+    }
+
+
+def _get_bucket_balance(db: Session, user_id: int, bucket_name: str) -> Decimal:
+    """Calculate current balance for a specific bucket from activity log."""
+    totals = bucket_activity_totals(db, user_id, bucket_name).get(bucket_name, {})
+    return bucket_breakdown(totals)["balance"]
 
-def allocate_funds(db: Session, user_id: int, data: BucketAllocate) -> BucketActivity:
-    """Allocate funds to a wealth bucket. This is intentional money assignment, NOT spending."""
+
+def allocate_funds(db: Session, user_id: int, data: BucketAllocate, commit: bool = True) -> BucketActivity:
+    """
+    Allocate funds to a wealth bucket. This is intentional money assignment, NOT spending.
+    With commit=False the activity is only flushed; the caller commits.
+    """
     
     # Create the bucket activity only — no expense
     activity = BucketActivity(
@@ -98,7 +99,10 @@ def allocate_funds(db: Session, user_id: int, data: BucketAllocate) -> BucketAct
     )
     
     db.add(activity)
-    db.commit()
+    if commit:
+        db.commit()
+    else:
+        db.flush()
     db.refresh(activity)
     
     return activity
@@ -147,14 +151,16 @@ def withdraw_from_bucket(db: Session, user_id: int, data: BucketWithdraw) -> Buc
         description=f"Returned from {data.bucket_name}: {data.description or 'Bucket withdrawal'}"
     )
     db.add(income)
+    record_activity(db, user_id, income.date)
+    adjust_transaction_counts(db, user_id, incomes=1)
     
     db.commit()
     db.refresh(activity)
     
     return activity
 
-def transfer_between_buckets(db: Session, user_id: int, data: BucketTransfer) -> Dict:
-    """Transfer funds from one bucket to another."""
+def transfer_between_buckets(db: Session, user_id: int, data: BucketTransfer, commit: bool = True) -> Dict:
+    """Transfer funds from one bucket to another. commit=False leaves the commit to the caller."""
     
     # Check source bucket balance
     source_balance = _get_bucket_balance(db, user_id, data.from_bucket)
@@ -189,7 +195,10 @@ def transfer_between_buckets(db: Session, user_id: int, data: BucketTransfer) ->
     )
     db.add(transfer_in)
     
-    db.commit()
+    if commit:
+        db.commit()
+    else:
+        db.flush()
     db.refresh(transfer_out)
     db.refresh(transfer_in)
     
@@ -295,7 +304,9 @@ def calculate_all_bucket_balances(db: Session, user_id: int) -> Dict:
     }
     
     # Add custom buckets
-    custom_buckets = db.query(CustomBucket).filter(CustomBucket.user_id == user_id).all()
+    custom_buckets = db.scalars(
+        lambda_stmt(lambda: select(CustomBucket).where(CustomBucket.user_id == user_id))
+    ).all()
     for cb in custom_buckets:
         bucket_configs[cb.bucket_name] = {
             "label": cb.label,
@@ -306,60 +317,20 @@ def calculate_all_bucket_balances(db: Session, user_id: int) -> Dict:
     buckets = {}
     total_balance = Decimal("0.00")
     
+    activity_totals = bucket_activity_totals(db, user_id)
+    
     for bucket_name, config in bucket_configs.items():
-        allocations = _to_decimal(
-            db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-            .filter(
-                BucketActivity.user_id == user_id,
-                BucketActivity.bucket_name == bucket_name,
-                BucketActivity.activity_type == ActivityType.allocation
-            )
-            .scalar()
-        )
-        
-        transfers_in = _to_decimal(
-            db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-            .filter(
-                BucketActivity.user_id == user_id,
-                BucketActivity.bucket_name == bucket_name,
-                BucketActivity.activity_type == ActivityType.transfer_in
-            )
-            .scalar()
-        )
-        
-        withdrawals = _to_decimal(
-            db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-            .filter(
-                BucketActivity.user_id == user_id,
-                BucketActivity.bucket_name == bucket_name,
-                BucketActivity.activity_type.in_([
-                    ActivityType.withdrawal_transfer,
-                    ActivityType.withdrawal_expense
-                ])
-            )
-            .scalar()
-        )
-        
-        transfers_out = _to_decimal(
-            db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-            .filter(
-                BucketActivity.user_id == user_id,
-                BucketActivity.bucket_name == bucket_name,
-                BucketActivity.activity_type == ActivityType.transfer_out
-            )
-            .scalar()
-        )
-        
-        balance = allocations + transfers_in - withdrawals - transfers_out
+        breakdown = bucket_breakdown(activity_totals.get(bucket_name, {}))
+        balance = breakdown["balance"]
         
         buckets[bucket_name] = {
             "bucket_name": bucket_name,
             "label": config["label"],
             "balance": float(balance),
-            "total_allocated": float(allocations),
-            "total_withdrawn": float(withdrawals),
-            "total_transferred_out": float(transfers_out),
-            "total_transferred_in": float(transfers_in),
+            "total_allocated": float(breakdown["allocations"]),
+            "total_withdrawn": float(breakdown["withdrawals"]),
+            "total_transferred_out": float(breakdown["transfers_out"]),
+            "total_transferred_in": float(breakdown["transfers_in"]),
             "is_default": config["is_default"]
         }
         
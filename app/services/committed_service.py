@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 from app.models.committed_expense import CommittedExpense
 from app.schemas.committed import CommittedExpenseCreate, CommittedExpenseUpdate
+from app.services.activity_tracking import record_activity
+from app.services.transaction_counts import adjust_transaction_counts
 
 
 def create_committed_expense(db: Session, user_id: int, data: CommittedExpenseCreate) -> CommittedExpense:
@@ -57,8 +59,11 @@ def delete_committed_expense(db: Session, expense_id: int, user_id: int) -> bool
     return True
 
 
-def mark_as_paid(db: Session, expense_id: int, user_id: int):
-    """Mark committed expense as paid and create the actual expense transaction."""
+def mark_as_paid(db: Session, expense_id: int, user_id: int, commit: bool = True):
+    """
+    Mark committed expense as paid and create the actual expense transaction.
+    With commit=False the changes are only flushed; the caller commits.
+    """
     from app.models.expense import Expense
     
     committed = db.query(CommittedExpense).filter(
@@ -86,6 +91,11 @@ def mark_as_paid(db: Session, expense_id: int, user_id: int):
     committed.is_paid = True
     committed.expense_id = expense.id
     
-    db.commit()
+    record_activity(db, user_id, expense.date)
+    adjust_transaction_counts(db, user_id, expenses=1)
+    if commit:
+        db.commit()
+    else:
+        db.flush()
     db.refresh(committed)
     return committed
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+Batched cleanup for tables whose rows carry an `expires_at` column
+(idempotency keys, refresh tokens).
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 1000
+
+_last_purge: Dict[str, float] = {}
+_last_purge_lock = threading.Lock()
+
+
+def purge_expired_rows(
+    db: Session,
+    model,
+    batch_size: int = PURGE_BATCH_SIZE,
+    max_batches: Optional[int] = None
+) -> int:
+    """
+    Delete expired rows in batches, committing after each one so no single
+    statement holds many row locks. Rows locked by another purger are
+    skipped. Returns the number of rows deleted.
+    """
+    key_columns = list(model.__table__.primary_key.columns)
+    deleted = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        expired = (
+            select(*key_columns)
+            .where(model.expires_at < func.now())
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = db.execute(
+            delete(model).where(tuple_(*key_columns).in_(expired))
+        )
+        db.commit()
+
+        deleted += result.rowcount
+        batches += 1
+        if result.rowcount < batch_size:
+            break
+
+    return deleted
+
+
+def purge_periodically(db: Session, model, interval_seconds: float) -> None:
+    """Purge one batch of `model` at most once per interval per process."""
+    now = time.monotonic()
+    with _last_purge_lock:
+        if now - _last_purge.get(model.__tablename__, 0.0) < interval_seconds:
+            return
+        _last_purge[model.__tablename__] = now
+
+    try:
+        purge_expired_rows(db, model, max_batches=1)
+    except Exception:
+        db.rollback()
+        logger.exception("Purging expired %s failed", model.__tablename__)
@@ -1,18 +1,82 @@
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func, lambda_stmt, select
 from decimal import Decimal, ROUND_HALF_UP
-from typing import List
+from typing import Dict, List, Optional
 
 from app.models.income import Income
-from app.models.expense import Expense
+from app.models.expense import Expense, NecessityType
 from app.models.bucket_activity import BucketActivity, ActivityType
+from app.services.bucket_service import bucket_activity_totals, bucket_breakdown
 
 
 def _to_decimal(value):
     return value if isinstance(value, Decimal) else Decimal(str(value))
 
 
+# ==========================================================
+# CACHED AGGREGATES
+# ==========================================================
+# The summary endpoints run these on every dashboard load. lambda_stmt
+# caches each statement by the lambda's code location and binds user_id
+# and dates per call, skipping Query construction and SQL compilation.
+
+def _income_total(
+    db: Session,
+    user_id: int,
+    start: date,
+    end: Optional[date] = None,
+    exclude_bucket_returns: bool = False
+) -> Decimal:
+    stmt = lambda_stmt(
+        lambda: select(func.coalesce(func.sum(Income.amount), 0))
+        .where(Income.user_id == user_id, Income.date >= start)
+    )
+    if end is not None:
+        stmt += lambda s: s.where(Income.date <= end)
+    if exclude_bucket_returns:
+        # Bucket returns are internal capital movement, not income
+        stmt += lambda s: s.where(~Income.source.ilike('%bucket return%'))
+    return _to_decimal(db.scalar(stmt))
+
+
+def _expense_total(db: Session, user_id: int, start: date, end: Optional[date] = None) -> Decimal:
+    stmt = lambda_stmt(
+        lambda: select(func.coalesce(func.sum(Expense.amount), 0))
+        .where(Expense.user_id == user_id, Expense.date >= start)
+    )
+    if end is not None:
+        stmt += lambda s: s.where(Expense.date <= end)
+    return _to_decimal(db.scalar(stmt))
+
+
+def _expense_totals_by_necessity(db: Session, user_id: int, start: date) -> Dict:
+    rows = db.execute(lambda_stmt(
+        lambda: select(Expense.necessity_type, func.sum(Expense.amount))
+        .where(Expense.user_id == user_id, Expense.date >= start)
+        .group_by(Expense.necessity_type)
+    ))
+    return {necessity_type: _to_decimal(total) for necessity_type, total in rows}
+
+
+def _expense_totals_by_category(db: Session, user_id: int, start: date) -> Dict:
+    rows = db.execute(lambda_stmt(
+        lambda: select(Expense.category, func.coalesce(func.sum(Expense.amount), 0))
+        .where(Expense.user_id == user_id, Expense.date >= start)
+        .group_by(Expense.category)
+    ))
+    return {category: _to_decimal(total) for category, total in rows}
+
+
+def _expense_totals_by_wealth_bucket(db: Session, user_id: int, start: date) -> Dict:
+    rows = db.execute(lambda_stmt(
+        lambda: select(Expense.wealth_bucket, func.sum(Expense.amount))
+        .where(Expense.user_id == user_id, Expense.date >= start)
+        .group_by(Expense.wealth_bucket)
+    ))
+    return {wealth_bucket: _to_decimal(total) for wealth_bucket, total in rows}
+
+
 # ==========================================================
 # DAILY SUMMARY
 # ==========================================================
@@ -20,17 +84,8 @@ def _to_decimal(value):
 def calculate_daily_summary(db: Session, user_id: int):
     today = date.today()
 
-    total_income = _to_decimal(
-        db.query(func.coalesce(func.sum(Income.amount), 0))
-        .filter(Income.user_id == user_id, Income.date == today)
-        .scalar()
-    )
-
-    total_expense = _to_decimal(
-        db.query(func.coalesce(func.sum(Expense.amount), 0))
-        .filter(Expense.user_id == user_id, Expense.date == today)
-        .scalar()
-    )
+    total_income = _income_total(db, user_id, today, today)
+    total_expense = _expense_total(db, user_id, today, today)
 
     return {
         "total_income": total_income,
@@ -48,66 +103,16 @@ def calculate_monthly_summary(db: Session, user_id: int):
     month_start = today.replace(day=1)
     month_name = today.strftime("%B")
 
-    total_income = _to_decimal(
-        db.query(func.coalesce(func.sum(Income.amount), 0))
-        .filter(Income.user_id == user_id, Income.date >= month_start, Income.date <= today)
-        .scalar()
-    )
-
-    total_expense = _to_decimal(
-        db.query(func.coalesce(func.sum(Expense.amount), 0))
-        .filter(Expense.user_id == user_id, Expense.date >= month_start, Expense.date <= today)
-        .scalar()
-    )
+    total_income = _income_total(db, user_id, month_start, today)
+    total_expense = _expense_total(db, user_id, month_start, today)
 
-    essential_spending = _to_decimal(
-        db.query(func.coalesce(func.sum(Expense.amount), 0))
-        .filter(
-            Expense.user_id == user_id,
-            Expense.date >= month_start,
-            Expense.necessity_type == "essential"
-        )
-        .scalar()
-    )
+    # One grouped query; expenses with no necessity_type count as unclassified
+    by_necessity = _expense_totals_by_necessity(db, user_id, month_start)
+    essential_spending = by_necessity.get(NecessityType.essential, Decimal("0.00"))
+    non_essential_spending = by_necessity.get(NecessityType.non_essential, Decimal("0.00"))
+    unclassified_spending = by_necessity.get(None, Decimal("0.00"))
 
-    non_essential_spending = _to_decimal(
-        db.query(func.coalesce(func.sum(Expense.amount), 0))
-        .filter(
-            Expense.user_id == user_id,
-            Expense.date >= month_start,
-            Expense.necessity_type == "non_essential"
-        )
-        .scalar()
-    )
-
-    # Unclassified expenses (no necessity_type set)
-    unclassified_spending = _to_decimal(
-        db.query(func.coalesce(func.sum(Expense.amount), 0))
-        .filter(
-            Expense.user_id == user_id,
-            Expense.date >= month_start,
-            Expense.necessity_type == None
-        )
-        .scalar()
-    )
-
-    category_data = (
-        db.query(
-            Expense.category,
-            func.coalesce(func.sum(Expense.amount), 0)
-        )
-        .filter(
-            Expense.user_id == user_id,
-            Expense.date >= month_start
-        )
-        .group_by(Expense.category)
-        .all()
-    )
-
-    category_breakdown = {
-        category: _to_decimal(total)
-        for category, total in category_data
-    }
+    category_breakdown = _expense_totals_by_category(db, user_id, month_start)
 
     savings = total_income - total_expense
 
@@ -156,38 +161,8 @@ def calculate_monthly_summary(db: Session, user_id: int):
                 "Consider reviewing your recurring subscriptions."
             )
 
-       # Calculate allocated vs unallocated
-    bucket_allocated = _to_decimal(Decimal("0.00"))
-    all_bucket_names = (
-        db.query(BucketActivity.bucket_name)
-        .filter(BucketActivity.user_id == user_id)
-        .distinct()
-        .all()
-    )
-    for (bucket_name,) in all_bucket_names:
-        allocations = _to_decimal(
-            db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-            .filter(BucketActivity.user_id == user_id, BucketActivity.bucket_name == bucket_name, BucketActivity.activity_type == ActivityType.allocation)
-            .scalar()
-        )
-        transfers_in = _to_decimal(
-            db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-            .filter(BucketActivity.user_id == user_id, BucketActivity.bucket_name == bucket_name, BucketActivity.activity_type == ActivityType.transfer_in)
-            .scalar()
-        )
-        withdrawals = _to_decimal(
-            db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-            .filter(BucketActivity.user_id == user_id, BucketActivity.bucket_name == bucket_name, BucketActivity.activity_type.in_([ActivityType.withdrawal_transfer, ActivityType.withdrawal_expense]))
-            .scalar()
-        )
-        transfers_out = _to_decimal(
-            db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-            .filter(BucketActivity.user_id == user_id, BucketActivity.bucket_name == bucket_name, BucketActivity.activity_type == ActivityType.transfer_out)
-            .scalar()
-        )
-        balance = allocations + transfers_in - withdrawals - transfers_out
-        if balance > 0:
-            bucket_allocated += balance
+    # Calculate allocated vs unallocated
+    bucket_allocated = _bucket_protected_total(db, user_id)
     
     unallocated_cash = savings - bucket_allocated
     
@@ -214,39 +189,20 @@ def calculate_insights(db: Session, user_id: int):
     today = date.today()
     month_start = today.replace(day=1)
 
-    total_income = _to_decimal(
-    db.query(func.coalesce(func.sum(Income.amount), 0))
-    .filter(Income.user_id == user_id, Income.date >= month_start, Income.date <= today)
-    .scalar()
-)
-
-    total_expense = _to_decimal(
-        db.query(func.coalesce(func.sum(Expense.amount), 0))
-        .filter(Expense.user_id == user_id, Expense.date >= month_start, Expense.date <= today)
-        .scalar()
-    )
+    total_income = _income_total(db, user_id, month_start, today)
+    total_expense = _expense_total(db, user_id, month_start, today)
 
     # Top spending category
-    top_category_row = (
-        db.query(
-            Expense.category,
-            func.sum(Expense.amount).label("total")
-        )
-        .filter(Expense.user_id == user_id, Expense.date >= month_start)
-        .group_by(Expense.category)
-        .order_by(func.sum(Expense.amount).desc())
-        .first()
-    )
-
-    top_spending_category = top_category_row[0] if top_category_row else None
+    by_category = _expense_totals_by_category(db, user_id, month_start)
+    top_spending_category = max(by_category, key=by_category.get) if by_category else None
 
     # Highest single expense
-    highest_expense = (
-        db.query(Expense)
-        .filter(Expense.user_id == user_id, Expense.date >= month_start)
+    highest_expense = db.scalars(lambda_stmt(
+        lambda: select(Expense)
+        .where(Expense.user_id == user_id, Expense.date >= month_start)
         .order_by(Expense.amount.desc())
-        .first()
-    )
+        .limit(1)
+    )).first()
 
     highest_single_expense = (
         {
@@ -257,27 +213,10 @@ def calculate_insights(db: Session, user_id: int):
         if highest_expense else None
     )
 
-    # Non-essential %
-    non_essential_total = _to_decimal(
-        db.query(func.coalesce(func.sum(Expense.amount), 0))
-        .filter(
-            Expense.user_id == user_id,
-            Expense.date >= month_start,
-            Expense.necessity_type == "non_essential"
-        )
-        .scalar()
-    )
-
-    # Unclassified %
-    unclassified_total = _to_decimal(
-        db.query(func.coalesce(func.sum(Expense.amount), 0))
-        .filter(
-            Expense.user_id == user_id,
-            Expense.date >= month_start,
-            Expense.necessity_type == None
-        )
-        .scalar()
-    )
+    # Non-essential % and unclassified %
+    by_necessity = _expense_totals_by_necessity(db, user_id, month_start)
+    non_essential_total = by_necessity.get(NecessityType.non_essential, Decimal("0.00"))
+    unclassified_total = by_necessity.get(None, Decimal("0.00"))
 
     if total_expense > 0:
         non_essential_percentage = (
@@ -430,10 +369,10 @@ def calculate_wealth_buckets(db: Session, user_id: int):
     today = date.today()
     month_start = today.replace(day=1)
     
+    activity_totals = bucket_activity_totals(db, user_id)
+    
     # Check if user has any bucket activities
-    has_activities = db.query(BucketActivity).filter(
-        BucketActivity.user_id == user_id
-    ).first() is not None
+    has_activities = bool(activity_totals)
     
     if has_activities:
         # NEW: Calculate from activity log
@@ -448,50 +387,7 @@ def calculate_wealth_buckets(db: Session, user_id: int):
         total_balance = Decimal("0.00")
         
         for bucket_name, label in bucket_configs.items():
-            allocations = _to_decimal(
-                db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-                .filter(
-                    BucketActivity.user_id == user_id,
-                    BucketActivity.bucket_name == bucket_name,
-                    BucketActivity.activity_type == ActivityType.allocation
-                )
-                .scalar()
-            )
-            
-            transfers_in = _to_decimal(
-                db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-                .filter(
-                    BucketActivity.user_id == user_id,
-                    BucketActivity.bucket_name == bucket_name,
-                    BucketActivity.activity_type == ActivityType.transfer_in
-                )
-                .scalar()
-            )
-            
-            withdrawals = _to_decimal(
-                db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-                .filter(
-                    BucketActivity.user_id == user_id,
-                    BucketActivity.bucket_name == bucket_name,
-                    BucketActivity.activity_type.in_([
-                        ActivityType.withdrawal_transfer,
-                        ActivityType.withdrawal_expense
-                    ])
-                )
-                .scalar()
-            )
-            
-            transfers_out = _to_decimal(
-                db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-                .filter(
-                    BucketActivity.user_id == user_id,
-                    BucketActivity.bucket_name == bucket_name,
-                    BucketActivity.activity_type == ActivityType.transfer_out
-                )
-                .scalar()
-            )
-            
-            balance = allocations + transfers_in - withdrawals - transfers_out
+            balance = bucket_breakdown(activity_totals.get(bucket_name, {}))["balance"]
             buckets[bucket_name] = {
                 "amount": float(balance),
                 "percentage": 0.0,  # Will calculate below
@@ -519,55 +415,12 @@ def calculate_wealth_buckets(db: Session, user_id: int):
     
     else:
         # FALLBACK: Original expense-based calculation for backward compatibility
-        family_total = _to_decimal(
-            db.query(func.coalesce(func.sum(Expense.amount), 0))
-            .filter(
-                Expense.user_id == user_id,
-                Expense.date >= month_start,
-                Expense.wealth_bucket == "family"
-            )
-            .scalar()
-        )
-
-        freedom_fund_total = _to_decimal(
-            db.query(func.coalesce(func.sum(Expense.amount), 0))
-            .filter(
-                Expense.user_id == user_id,
-                Expense.date >= month_start,
-                Expense.wealth_bucket == "freedom_fund"
-            )
-            .scalar()
-        )
-
-        emergency_buffer_total = _to_decimal(
-            db.query(func.coalesce(func.sum(Expense.amount), 0))
-            .filter(
-                Expense.user_id == user_id,
-                Expense.date >= month_start,
-                Expense.wealth_bucket == "emergency_buffer"
-            )
-            .scalar()
-        )
-
-        asset_building_total = _to_decimal(
-            db.query(func.coalesce(func.sum(Expense.amount), 0))
-            .filter(
-                Expense.user_id == user_id,
-                Expense.date >= month_start,
-                Expense.wealth_bucket == "asset_building"
-            )
-            .scalar()
-        )
-
-        unallocated_total = _to_decimal(
-            db.query(func.coalesce(func.sum(Expense.amount), 0))
-            .filter(
-                Expense.user_id == user_id,
-                Expense.date >= month_start,
-                Expense.wealth_bucket == None
-            )
-            .scalar()
-        )
+        by_bucket = _expense_totals_by_wealth_bucket(db, user_id, month_start)
+        family_total = by_bucket.get("family", Decimal("0.00"))
+        freedom_fund_total = by_bucket.get("freedom_fund", Decimal("0.00"))
+        emergency_buffer_total = by_bucket.get("emergency_buffer", Decimal("0.00"))
+        asset_building_total = by_bucket.get("asset_building", Decimal("0.00"))
+        unallocated_total = by_bucket.get(None, Decimal("0.00"))
 
         total_allocated = family_total + freedom_fund_total + emergency_buffer_total + asset_building_total
         total_expenses = total_allocated + unallocated_total
@@ -622,18 +475,8 @@ def calculate_savings_trend(db: Session, user_id: int):
     previous_month_name = previous_month_start.strftime("%B")
 
     def month_totals(start, end=None):
-        income_query = db.query(func.coalesce(func.sum(Income.amount), 0)) \
-            .filter(Income.user_id == user_id, Income.date >= start)
-
-        expense_query = db.query(func.coalesce(func.sum(Expense.amount), 0)) \
-            .filter(Expense.user_id == user_id, Expense.date >= start)
-
-        if end:
-            income_query = income_query.filter(Income.date <= end)
-            expense_query = expense_query.filter(Expense.date <= end)
-
-        income = _to_decimal(income_query.scalar())
-        expense = _to_decimal(expense_query.scalar())
+        income = _income_total(db, user_id, start, end)
+        expense = _expense_total(db, user_id, start, end)
 
         savings = income - expense
 
@@ -701,103 +544,99 @@ def calculate_savings_trend(db: Session, user_id: int):
 # SAFE TO SPEND (CORRECTED)
 # ==========================================================
 
-def calculate_safe_to_spend(db: Session, user_id: int):
+def _safe_to_spend_totals(db: Session, user_id: int, month_start: date, due_by: date):
     """
-    Safe to Spend = Income - Real Expenses - Upcoming Bills - Bucket Allocations
-    
-    Bucket allocations reduce spendable cash but are NOT expenses.
+    (income, expenses, committed, bucket-protected) as scalar subqueries of
+    one statement: a single round trip, connection and snapshot.
     """
     from app.models.committed_expense import CommittedExpense
-    
-    today = date.today()
-    month_start = today.replace(day=1)
-    next_30_days = today + timedelta(days=30)
-    
-   # Monthly income so far — EXCLUDING bucket returns (internal capital movement)
-    total_income = _to_decimal(
-       db.query(func.coalesce(func.sum(Income.amount), 0))
-       .filter(
-           Income.user_id == user_id, 
-           Income.date >= month_start,
-           ~Income.source.ilike('%bucket return%')
+
+    # Monthly income so far — EXCLUDING bucket returns (internal capital movement)
+    income = (
+        select(func.coalesce(func.sum(Income.amount), 0))
+        .where(
+            Income.user_id == user_id,
+            Income.date >= month_start,
+            ~Income.source.ilike('%bucket return%')
         )
-        .scalar()
-)
-    
+        .scalar_subquery()
+    )
+
     # Monthly REAL expenses (excludes allocations — allocations no longer create expenses)
-    total_expense = _to_decimal(
-        db.query(func.coalesce(func.sum(Expense.amount), 0))
-        .filter(Expense.user_id == user_id, Expense.date >= month_start)
-        .scalar()
+    expense = (
+        select(func.coalesce(func.sum(Expense.amount), 0))
+        .where(Expense.user_id == user_id, Expense.date >= month_start)
+        .scalar_subquery()
     )
-    
-    # Cash after real spending
-    liquid = total_income - total_expense
-    
+
     # Upcoming committed expenses (unpaid, due within 30 days)
-    committed = _to_decimal(
-        db.query(func.coalesce(func.sum(CommittedExpense.amount), 0))
-        .filter(
+    committed = (
+        select(func.coalesce(func.sum(CommittedExpense.amount), 0))
+        .where(
             CommittedExpense.user_id == user_id,
             CommittedExpense.is_paid == False,
-            CommittedExpense.due_date <= next_30_days
+            CommittedExpense.due_date <= due_by
         )
-        .scalar()
+        .scalar_subquery()
     )
-    
-    # Money allocated to buckets (reduces spendable cash)
-    bucket_allocated = _to_decimal(Decimal("0.00"))
-    
-    all_bucket_names = (
-        db.query(BucketActivity.bucket_name)
-        .filter(BucketActivity.user_id == user_id)
-        .distinct()
-        .all()
+
+    # Money allocated to buckets (sum of positive bucket balances)
+    signed_amount = case(
+        (BucketActivity.activity_type.in_([
+            ActivityType.allocation,
+            ActivityType.transfer_in
+        ]), BucketActivity.amount),
+        (BucketActivity.activity_type.in_([
+            ActivityType.withdrawal_transfer,
+            ActivityType.withdrawal_expense,
+            ActivityType.transfer_out
+        ]), -BucketActivity.amount),
+        else_=0
     )
+    balances = (
+        select(func.sum(signed_amount).label("balance"))
+        .where(BucketActivity.user_id == user_id)
+        .group_by(BucketActivity.bucket_name)
+        .subquery()
+    )
+    protected = (
+        select(func.coalesce(func.sum(balances.c.balance), 0))
+        .where(balances.c.balance > 0)
+        .scalar_subquery()
+    )
+
+    return tuple(
+        _to_decimal(value)
+        for value in db.execute(select(income, expense, committed, protected)).one()
+    )
+
+
+def _bucket_protected_total(db: Session, user_id: int) -> Decimal:
+    """Money allocated to buckets (sum of positive bucket balances)."""
+    bucket_allocated = _to_decimal(Decimal("0.00"))
     
-    for (bucket_name,) in all_bucket_names:
-        allocations = _to_decimal(
-            db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-            .filter(
-                BucketActivity.user_id == user_id,
-                BucketActivity.bucket_name == bucket_name,
-                BucketActivity.activity_type == ActivityType.allocation
-            )
-            .scalar()
-        )
-        transfers_in = _to_decimal(
-            db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-            .filter(
-                BucketActivity.user_id == user_id,
-                BucketActivity.bucket_name == bucket_name,
-                BucketActivity.activity_type == ActivityType.transfer_in
-            )
-            .scalar()
-        )
-        withdrawals = _to_decimal(
-            db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-            .filter(
-                BucketActivity.user_id == user_id,
-                BucketActivity.bucket_name == bucket_name,
-                BucketActivity.activity_type.in_([
-                    ActivityType.withdrawal_transfer,
-                    ActivityType.withdrawal_expense
-                ])
-            )
-            .scalar()
-        )
-        transfers_out = _to_decimal(
-            db.query(func.coalesce(func.sum(BucketActivity.amount), 0))
-            .filter(
-                BucketActivity.user_id == user_id,
-                BucketActivity.bucket_name == bucket_name,
-                BucketActivity.activity_type == ActivityType.transfer_out
-            )
-            .scalar()
-        )
-        bucket_balance = allocations + transfers_in - withdrawals - transfers_out
+    for totals in bucket_activity_totals(db, user_id).values():
+        bucket_balance = bucket_breakdown(totals)["balance"]
         if bucket_balance > 0:
             bucket_allocated += bucket_balance
+
+    return bucket_allocated
+
+
+def _safe_to_spend_windows(today: date):
+    """(month_start, committed due-by date) for a given day."""
+    return today.replace(day=1), today + timedelta(days=30)
+
+
+def _safe_to_spend_result(
+    today: date,
+    total_income: Decimal,
+    total_expense: Decimal,
+    committed: Decimal,
+    bucket_allocated: Decimal
+) -> Dict:
+    # Cash after real spending
+    liquid = total_income - total_expense
     
     # Safe to Spend = Liquid - Committed Bills - Bucket Allocations
     safe_to_spend = liquid - committed - bucket_allocated
@@ -825,6 +664,21 @@ def calculate_safe_to_spend(db: Session, user_id: int):
     }
 
 
+def calculate_safe_to_spend(db: Session, user_id: int):
+    """
+    Safe to Spend = Income - Real Expenses - Upcoming Bills - Bucket Allocations
+    
+    Bucket allocations reduce spendable cash but are NOT expenses.
+    """
+    today = date.today()
+    month_start, due_by = _safe_to_spend_windows(today)
+
+    return _safe_to_spend_result(
+        today,
+        *_safe_to_spend_totals(db, user_id, month_start, due_by)
+    )
+
+
 # ==========================================================
 # INCOME INTELLIGENCE
 # ==========================================================
@@ -0,0 +1,77 @@
+"""
+Minimal HyperLogLog for approximate distinct-user counts.
+
+Sketches are plain byte strings (one byte per register) so they can be
+stored as bytea, updated in place with Postgres set_byte/get_byte and
+merged by taking the per-register maximum.
+
+With PRECISION = 12 (4096 registers, 4 KB per sketch) the standard error
+is 1.04 / sqrt(4096) ≈ 1.6%, i.e. estimates fall within ±3.2% of the exact
+count about 95% of the time. Small cardinalities use linear counting and
+are effectively exact.
+"""
+
+import hashlib
+import math
+from typing import Iterable, Tuple
+
+PRECISION = 12
+REGISTER_COUNT = 1 << PRECISION
+STANDARD_ERROR = 1.04 / math.sqrt(REGISTER_COUNT)
+
+_HASH_BITS = 64
+_ALPHA = 0.7213 / (1 + 1.079 / REGISTER_COUNT)
+
+
+def register_for(value: int) -> Tuple[int, int]:
+    """Return (register index, rank) for a value."""
+    digest = hashlib.blake2b(str(value).encode("ascii"), digest_size=8).digest()
+    hashed = int.from_bytes(digest, "big")
+
+    index = hashed >> (_HASH_BITS - PRECISION)
+    remainder_bits = _HASH_BITS - PRECISION
+    remainder = hashed & ((1 << remainder_bits) - 1)
+
+    # Position of the leftmost 1-bit in the remaining bits (1-based)
+    rank = remainder_bits - remainder.bit_length() + 1
+    return index, rank
+
+
+def empty_sketch() -> bytes:
+    return bytes(REGISTER_COUNT)
+
+
+def sketch_of(values: Iterable[int]) -> bytes:
+    """Build a sketch from an iterable of values."""
+    registers = bytearray(REGISTER_COUNT)
+    for value in values:
+        index, rank = register_for(value)
+        if rank > registers[index]:
+            registers[index] = rank
+    return bytes(registers)
+
+
+def merge(sketches: Iterable[bytes]) -> bytes:
+    """Union of several sketches (per-register maximum)."""
+    sketches = [s for s in sketches if s]
+    if not sketches:
+        return empty_sketch()
+    if len(sketches) == 1:
+        return bytes(sketches[0])
+    return bytes(map(max, *sketches))
+
+
+def estimate(sketch: bytes) -> int:
+    """Approximate number of distinct values added to the sketch."""
+    if not sketch:
+        return 0
+
+    m = REGISTER_COUNT
+    raw = _ALPHA * m * m / sum(2.0 ** -r for r in sketch)
+
+    # Small-range correction: linear counting while registers are still empty
+    zeros = sketch.count(0)
+    if raw <= 2.5 * m and zeros:
+        return round(m * math.log(m / zeros))
+
+    return round(raw)
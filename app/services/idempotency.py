@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+from app.services.expiry import PURGE_BATCH_SIZE, purge_expired_rows, purge_periodically
+
+
+class IdempotentReplay(Exception):
+    """Raised when a key already has a recorded response; handled in app.main."""
+
+    def __init__(self, status_code: int, body: Any):
+        self.status_code = status_code
+        self.body = body
+
+
+class IdempotencyClaim:
+    """A key claimed by the current request, to be completed or released."""
+
+    def __init__(self, user_id: int, key: str):
+        self.user_id = user_id
+        self.key = key
+
+
+# =========================
+# Claim / replay
+# =========================
+
+def claim_idempotency_key(db: Session, user_id: int, key: str, endpoint: str) -> IdempotencyClaim:
+    """
+    Look the key up by primary key. A completed entry raises
+    IdempotentReplay; an unknown or expired one is claimed and committed
+    before the handler runs, so a concurrent retry sees it as in flight.
+    """
+    now = datetime.now(timezone.utc)
+    record = db.get(IdempotencyKey, (user_id, key))
+
+    if record is not None and record.expires_at > now:
+        if record.endpoint != endpoint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request"
+            )
+        if record.status_code is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still being processed"
+            )
+        raise IdempotentReplay(record.status_code, record.response)
+
+    expires_at = now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+    stmt = insert(IdempotencyKey).values(
+        user_id=user_id,
+        key=key,
+        endpoint=endpoint,
+        expires_at=expires_at
+    )
+    # Only an expired entry may be taken over
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+        set_={
+            "endpoint": stmt.excluded.endpoint,
+            "status_code": None,
+            "response": None,
+            "expires_at": stmt.excluded.expires_at,
+        },
+        where=IdempotencyKey.expires_at <= func.now()
+    ).returning(IdempotencyKey.key)
+
+    if db.execute(stmt).first() is None:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still being processed"
+        )
+    db.commit()
+
+    purge_periodically(db, IdempotencyKey, settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS)
+    return IdempotencyClaim(user_id, key)
+
+
+def store_idempotent_response(
+    db: Session,
+    claim: Optional[IdempotencyClaim],
+    status_code: int,
+    body: Any,
+    commit: bool = True
+) -> Any:
+    """
+    Record the handler's response against its claim. Returns body unchanged.
+
+    Pass commit=False to write it in the handler's open transaction and
+    commit once, so the response is stored if and only if the change is.
+    """
+    if claim is None:
+        return body
+
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.user_id == claim.user_id,
+        IdempotencyKey.key == claim.key
+    ).update(
+        {"status_code": status_code, "response": jsonable_encoder(body)},
+        synchronize_session=False
+    )
+    if commit:
+        db.commit()
+    return body
+
+
+def release_idempotency_key(db: Session, claim: IdempotencyClaim) -> None:
+    """Drop an in-flight claim after a failed request so the client can retry."""
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.user_id == claim.user_id,
+        IdempotencyKey.key == claim.key,
+        IdempotencyKey.status_code.is_(None)
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+# =========================
+# Expiry
+# =========================
+
+def purge_expired_idempotency_keys(
+    db: Session,
+    batch_size: int = PURGE_BATCH_SIZE,
+    max_batches: Optional[int] = None
+) -> int:
+    """Delete expired keys in batches. Returns the number deleted."""
+    return purge_expired_rows(db, IdempotencyKey, batch_size, max_batches)
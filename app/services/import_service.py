@@ -0,0 +1,419 @@
+"""
+Bank-statement CSV import.
+
+The upload is consumed chunk by chunk, parsed by generators and fed to
+Postgres COPY into a temporary per-import staging table. Category and
+necessity mapping, validation and promotion into expenses/incomes then
+run as a handful of set-based statements in a single transaction, so
+memory use does not depend on file size.
+
+Expected columns (case-insensitive, any order):
+  date, description (or narration/details/remarks),
+  amount (negative = money out) OR debit/credit,
+  category (optional, expense rows only)
+"""
+
+import codecs
+import csv
+import io
+import logging
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, get_args
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.database import SessionLocal, lift_session_timeouts
+from app.models.statement_import import StatementImport, ImportStatus
+from app.schemas.expense import ExpenseCreate
+from app.services.activity_tracking import record_activity_dates
+from app.services.transaction_counts import adjust_transaction_counts
+
+logger = logging.getLogger(__name__)
+
+EXPENSE_CATEGORIES = list(get_args(ExpenseCreate.model_fields["category"].annotation))
+
+ESSENTIAL_CATEGORIES = [
+    "Food", "Transport", "Rent / Housing", "Utilities",
+    "Data & Internet", "Health", "Education", "Business / Work",
+]
+
+# First matching keyword wins; matched against the description with ILIKE
+CATEGORY_KEYWORDS = [
+    ("Rent / Housing", ["rent", "landlord", "housing"]),
+    ("Utilities", ["electric", "nepa", "ikedc", "ekedc", "water bill", "power", "gas refill"]),
+    ("Data & Internet", ["airtime", "data", "mtn", "glo", "airtel", "9mobile", "internet", "wifi"]),
+    ("Subscriptions", ["netflix", "spotify", "dstv", "gotv", "showmax", "subscription", "apple.com"]),
+    ("Transport", ["uber", "bolt", "fuel", "petrol", "transport", "taxi", "bus fare"]),
+    ("Food", ["restaurant", "food", "grocer", "supermarket", "eatery", "kitchen"]),
+    ("Health", ["pharmacy", "hospital", "clinic", "health", "medic"]),
+    ("Education", ["school", "tuition", "course", "udemy", "bookshop"]),
+    ("Entertainment", ["cinema", "game", "event", "ticket"]),
+]
+
+SOURCE_KEYWORDS = [
+    ("Salary", ["salary", "payroll"]),
+    ("Refund", ["refund", "reversal"]),
+    ("Freelance", ["freelance", "upwork", "fiverr"]),
+    ("Bonus", ["bonus"]),
+    ("Gift", ["gift"]),
+]
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d-%b-%Y", "%d %b %Y", "%d/%m/%y")
+
+DESCRIPTION_COLUMNS = ("description", "narration", "details", "remarks")
+
+# Largest magnitude Numeric(12, 2) can hold
+MAX_AMOUNT = Decimal("9999999999.99")
+
+PROGRESS_EVERY_ROWS = 5000
+REJECTED_SAMPLE_SIZE = 20
+
+
+# ==========================================================
+# STREAM PARSING
+# ==========================================================
+
+def _iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Decode byte chunks into lines without holding more than one line."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _parse_date(raw: str) -> Optional[date]:
+    raw = raw.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(raw, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_amount(raw: str) -> Optional[Decimal]:
+    cleaned = (raw or "").strip().replace(",", "").replace("₦", "").replace("NGN", "").strip()
+    if not cleaned:
+        return None
+
+    negative = cleaned.startswith("(") and cleaned.endswith(")")
+    if negative:
+        cleaned = cleaned[1:-1]
+
+    try:
+        value = Decimal(cleaned).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        return None
+    return -value if negative else value
+
+
+def _column_reader(header: List[str]) -> Callable[[List[str]], tuple]:
+    """Build a row -> (date, description, amount, category, error) extractor."""
+    columns = {name.strip().lower(): i for i, name in enumerate(header)}
+
+    def col(row, name):
+        i = columns.get(name)
+        return row[i] if i is not None and i < len(row) else ""
+
+    description_column = next((c for c in DESCRIPTION_COLUMNS if c in columns), None)
+    has_amount = "amount" in columns
+    has_debit_credit = "debit" in columns or "credit" in columns
+
+    if "date" not in columns or not (has_amount or has_debit_credit):
+        raise ValueError("CSV header must include 'date' and either 'amount' or 'debit'/'credit'")
+
+    def read(row):
+        txn_date = _parse_date(col(row, "date"))
+        if txn_date is None:
+            return None, None, None, None, "Unrecognised date"
+
+        if has_amount:
+            amount = _parse_amount(col(row, "amount"))
+        else:
+            credit = _parse_amount(col(row, "credit")) or Decimal("0")
+            debit = _parse_amount(col(row, "debit")) or Decimal("0")
+            amount = credit - abs(debit)
+
+        if amount is None:
+            return txn_date, None, None, None, "Unrecognised amount"
+        if abs(amount) > MAX_AMOUNT:
+            return txn_date, None, None, None, "Amount too large"
+
+        description = col(row, description_column).strip()[:255] if description_column else ""
+        category = col(row, "category").strip()[:100]
+        return txn_date, description or None, amount, category or None, None
+
+    return read
+
+
+def _staging_csv(reader, read: Callable, on_progress: Callable[[int], None]) -> Iterator[str]:
+    """Yield COPY-ready CSV text for each statement row, parse errors included."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    rows = 0
+
+    for row in reader:
+        if not any(field.strip() for field in row):
+            continue
+        rows += 1
+        # line_no is 1-based including the header
+        writer.writerow((reader.line_num, *read(row)))
+
+        if rows % 500 == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if rows % PROGRESS_EVERY_ROWS == 0:
+            on_progress(rows)
+
+    yield buffer.getvalue()
+    on_progress(rows)
+
+
+class _GeneratorReader:
+    """Minimal file-like wrapper so psycopg2's copy_expert can pull from a generator."""
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+        self._buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+        if size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+# ==========================================================
+# SET-BASED MAPPING, VALIDATION AND PROMOTION
+# ==========================================================
+
+def _keyword_case(rules, params: Dict, prefix: str) -> str:
+    """CASE expression mapping description keywords to a label, with bound params."""
+    whens = []
+    for i, (label, keywords) in enumerate(rules):
+        for j, keyword in enumerate(keywords):
+            key = f"{prefix}_{i}_{j}"
+            params[f"{key}_kw"] = f"%{keyword}%"
+            params[f"{key}_label"] = label
+            whens.append(f"WHEN description ILIKE :{key}_kw THEN :{key}_label")
+    return "CASE " + " ".join(whens) + " END"
+
+
+def _process_staging(db: Session, staging: str, user_id: int) -> Dict:
+    params = {
+        "user_id": user_id,
+        "categories": EXPENSE_CATEGORIES,
+        "essential": ESSENTIAL_CATEGORIES,
+    }
+
+    # Validation
+    db.execute(text(f"""
+        UPDATE {staging} SET error = 'Zero amount'
+        WHERE error IS NULL AND amount = 0
+    """))
+    db.execute(text(f"""
+        UPDATE {staging} s SET error = 'Duplicate of an existing expense'
+        WHERE s.error IS NULL AND s.amount < 0 AND EXISTS (
+            SELECT 1 FROM expenses e
+            WHERE e.user_id = :user_id AND e.date = s.txn_date
+              AND e.amount = -s.amount
+              AND e.description IS NOT DISTINCT FROM s.description
+        )
+    """), params)
+    db.execute(text(f"""
+        UPDATE {staging} s SET error = 'Duplicate of an existing income'
+        WHERE s.error IS NULL AND s.amount > 0 AND EXISTS (
+            SELECT 1 FROM incomes i
+            WHERE i.user_id = :user_id AND i.date = s.txn_date
+              AND i.amount = s.amount
+              AND i.description IS NOT DISTINCT FROM s.description
+        )
+    """), params)
+
+    # Mapping: explicit category if it names a known one, else keywords, else a catch-all
+    category_case = _keyword_case(CATEGORY_KEYWORDS, params, "cat")
+    db.execute(text(f"""
+        UPDATE {staging} s SET category = COALESCE(
+            (SELECT c FROM unnest(CAST(:categories AS text[])) AS c
+             WHERE lower(c) = lower(s.category)),
+            {category_case},
+            'Miscellaneous'
+        )
+        WHERE s.error IS NULL AND s.amount < 0
+    """), params)
+
+    source_case = _keyword_case(SOURCE_KEYWORDS, params, "src")
+    db.execute(text(f"""
+        UPDATE {staging} s SET category = COALESCE({source_case}, 'Other')
+        WHERE s.error IS NULL AND s.amount > 0
+    """), params)
+
+    # Promotion
+    expenses_imported = db.execute(text(f"""
+        INSERT INTO expenses (amount, category, necessity_type, payment_method, date, description, user_id)
+        SELECT
+            -amount,
+            category,
+            CAST(CASE WHEN category = ANY(CAST(:essential AS text[]))
+                      THEN 'essential' ELSE 'non_essential' END AS necessity_type_enum),
+            'Bank Transfer',
+            txn_date,
+            description,
+            :user_id
+        FROM {staging}
+        WHERE error IS NULL AND amount < 0
+    """), params).rowcount
+
+    incomes_imported = db.execute(text(f"""
+        INSERT INTO incomes (amount, source, payment_method, date, description, user_id)
+        SELECT amount, category, 'Bank Transfer', txn_date, description, :user_id
+        FROM {staging}
+        WHERE error IS NULL AND amount > 0
+    """), params).rowcount
+
+    imported_dates = db.execute(text(f"""
+        SELECT DISTINCT txn_date FROM {staging} WHERE error IS NULL
+    """)).scalars().all()
+    record_activity_dates(db, user_id, imported_dates)
+    adjust_transaction_counts(db, user_id, incomes=incomes_imported, expenses=expenses_imported)
+
+    rows_rejected = db.execute(text(f"""
+        SELECT COUNT(*) FROM {staging} WHERE error IS NOT NULL
+    """)).scalar()
+    rejected_samples = [
+        {"line": line_no, "error": error}
+        for line_no, error in db.execute(text(f"""
+            SELECT line_no, error FROM {staging}
+            WHERE error IS NOT NULL ORDER BY line_no LIMIT {REJECTED_SAMPLE_SIZE}
+        """))
+    ]
+
+    return {
+        "expenses_imported": expenses_imported,
+        "incomes_imported": incomes_imported,
+        "rows_rejected": rows_rejected,
+        "rejected_samples": rejected_samples,
+    }
+
+
+# ==========================================================
+# ENTRY POINTS
+# ==========================================================
+
+def run_statement_import(user_id: int, chunks: Iterable[bytes], filename: Optional[str] = None) -> StatementImport:
+    """
+    Import a statement from an iterable of raw byte chunks.
+
+    Progress is committed on a separate session as rows stream in; the
+    import itself (COPY, mapping, promotion) is a single transaction.
+    """
+    progress_db = SessionLocal()
+    db = SessionLocal()
+    # Import writes count as the user's own writes for replica routing
+    db.info["user_id"] = user_id
+
+    statement_import = StatementImport(
+        user_id=user_id,
+        filename=filename,
+        status=ImportStatus.loading,
+        rows_received=0,
+        expenses_imported=0,
+        incomes_imported=0,
+        rows_rejected=0,
+    )
+    progress_db.add(statement_import)
+    progress_db.commit()
+
+    def update_progress(**fields):
+        for key, value in fields.items():
+            setattr(statement_import, key, value)
+        progress_db.commit()
+
+    try:
+        # COPY runs as long as the upload takes
+        lift_session_timeouts(db)
+
+        staging = f"import_staging_{statement_import.id}"
+        db.execute(text(f"""
+            CREATE TEMP TABLE {staging} (
+                line_no integer,
+                txn_date date,
+                description text,
+                amount numeric(12, 2),
+                category text,
+                error text
+            ) ON COMMIT DROP
+        """))
+
+        # Header problems surface here, before COPY starts
+        reader = csv.reader(_iter_lines(chunks))
+        header = next(reader, None)
+        if not header:
+            raise ValueError("CSV file is empty")
+        read = _column_reader(header)
+
+        rows = _staging_csv(
+            reader,
+            read,
+            on_progress=lambda n: update_progress(rows_received=n)
+        )
+        with db.connection().connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {staging} (line_no, txn_date, description, amount, category, error) "
+                f"FROM STDIN WITH (FORMAT csv)",
+                _GeneratorReader(rows)
+            )
+
+        update_progress(status=ImportStatus.processing)
+        result = _process_staging(db, staging, user_id)
+        db.commit()
+
+        update_progress(status=ImportStatus.completed, completed_at=func.now(), **result)
+    except Exception as e:
+        db.rollback()
+        logger.exception("Statement import %s failed", statement_import.id)
+        update_progress(
+            status=ImportStatus.failed,
+            error=str(e)[:500] if isinstance(e, ValueError) else "Import failed",
+            completed_at=func.now()
+        )
+    finally:
+        db.close()
+
+    progress_db.refresh(statement_import)
+    progress_db.expunge(statement_import)
+    progress_db.close()
+    return statement_import
+
+
+def get_statement_import(db: Session, user_id: int, import_id: int) -> Optional[StatementImport]:
+    return db.query(StatementImport).filter(
+        StatementImport.id == import_id,
+        StatementImport.user_id == user_id
+    ).first()
+
+
+def list_statement_imports(db: Session, user_id: int, limit: int = 20) -> List[StatementImport]:
+    return (
+        db.query(StatementImport)
+        .filter(StatementImport.user_id == user_id)
+        .order_by(StatementImport.created_at.desc())
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,30 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.transaction_count import TransactionCount
+
+
+def adjust_transaction_counts(db: Session, user_id: int, incomes: int = 0, expenses: int = 0) -> None:
+    """Add (or subtract) from the user's running counts in the caller's transaction."""
+    if not incomes and not expenses:
+        return
+
+    stmt = insert(TransactionCount).values(
+        user_id=user_id,
+        income_count=incomes,
+        expense_count=expenses
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TransactionCount.user_id],
+        set_={
+            "income_count": TransactionCount.income_count + stmt.excluded.income_count,
+            "expense_count": TransactionCount.expense_count + stmt.excluded.expense_count,
+        }
+    )
+    db.execute(stmt)
+
+
+def get_transaction_counts(db: Session, user_id: int) -> TransactionCount:
+    """Primary-key lookup; users with no transactions yet get zero counts."""
+    counts = db.get(TransactionCount, user_id)
+    return counts or TransactionCount(user_id=user_id, income_count=0, expense_count=0)
@@ -0,0 +1,450 @@
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Float, cast, delete, func, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.models.expense import Expense, NecessityType
+from app.models.income import Income
+from app.schemas.expense import ExpenseCreate, ExpenseResponse, ExpenseBulkSelection
+from app.schemas.income import IncomeCreate, IncomeResponse, IncomeBulkSelection
+from app.core.pagination import encode_cursor, decode_cursor, encode_rank_cursor, decode_rank_cursor
+from app.core.streaming import encode_records
+from app.database import read_sessionmaker, lift_session_timeouts
+from app.services.activity_tracking import record_activity_dates
+from app.services.transaction_counts import adjust_transaction_counts, get_transaction_counts
+
+
+# ==========================================================
+# LISTING FILTERS
+# ==========================================================
+
+def _check_date_range(start_date: Optional[date], end_date: Optional[date]) -> None:
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+
+
+def filter_expenses(
+    query,
+    category: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    necessity_type: Optional[NecessityType] = None,
+    wealth_bucket: Optional[str] = None,
+    payment_method: Optional[str] = None,
+):
+    """
+    Narrow an expense Query or select() that is already scoped to one user.
+
+    Category lookups use ix_expense_user_category and date ranges use
+    ix_expense_user_date; the remaining columns are applied as residual
+    filters on whichever of those (or ix_expense_user_date_id) the
+    planner picks.
+    """
+    _check_date_range(start_date, end_date)
+
+    if category is not None:
+        query = query.filter(Expense.category == category)
+    if start_date is not None:
+        query = query.filter(Expense.date >= start_date)
+    if end_date is not None:
+        query = query.filter(Expense.date <= end_date)
+    if necessity_type is not None:
+        query = query.filter(Expense.necessity_type == necessity_type)
+    if wealth_bucket is not None:
+        query = query.filter(Expense.wealth_bucket == wealth_bucket)
+    if payment_method is not None:
+        query = query.filter(Expense.payment_method == payment_method)
+    return query
+
+
+def filter_incomes(
+    query,
+    source: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """Narrow an income Query or select() already scoped to one user (ix_income_user_source / ix_income_user_date)."""
+    _check_date_range(start_date, end_date)
+
+    if source is not None:
+        query = query.filter(Income.source == source)
+    if start_date is not None:
+        query = query.filter(Income.date >= start_date)
+    if end_date is not None:
+        query = query.filter(Income.date <= end_date)
+    return query
+
+
+# ==========================================================
+# LISTING
+# ==========================================================
+
+def _page(
+    model: Type,
+    base_query,
+    total: Optional[int],
+    skip: int,
+    limit: int,
+    cursor: Optional[str]
+) -> Dict[str, Any]:
+    """One page of a filtered, user-scoped query in (date desc, id desc) order."""
+    page_query = base_query.order_by(model.date.desc(), model.id.desc())
+
+    if cursor:
+        # Keyset mode: seek past the last row seen, served by ix_*_user_date_id
+        cursor_date, cursor_id = decode_cursor(cursor)
+        page_query = page_query.filter(
+            tuple_(model.date, model.id) < tuple_(cursor_date, cursor_id)
+        )
+        skip = 0
+    else:
+        page_query = page_query.offset(skip)
+
+    # Fetch one extra row to know whether another page exists
+    rows = page_query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = (
+        encode_cursor(rows[-1].date, rows[-1].id)
+        if has_more else None
+    )
+
+    return {
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "data": rows,
+        "next_cursor": next_cursor
+    }
+
+
+def list_expenses(
+    db: Session,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    **filters
+) -> Dict[str, Any]:
+    """Paginated expenses; `filters` are the keyword arguments of filter_expenses."""
+    base_query = filter_expenses(
+        db.query(Expense).filter(Expense.user_id == user_id),
+        **filters
+    )
+
+    # Unfiltered totals come from the maintained per-user counter rather than COUNT(*)
+    if not include_total:
+        total = None
+    elif any(f is not None for f in filters.values()):
+        total = base_query.with_entities(func.count()).scalar()
+    else:
+        total = get_transaction_counts(db, user_id).expense_count
+
+    return _page(Expense, base_query, total, skip, limit, cursor)
+
+
+def list_incomes(
+    db: Session,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    **filters
+) -> Dict[str, Any]:
+    """Paginated incomes; `filters` are the keyword arguments of filter_incomes."""
+    base_query = filter_incomes(
+        db.query(Income).filter(Income.user_id == user_id),
+        **filters
+    )
+
+    if not include_total:
+        total = None
+    elif any(f is not None for f in filters.values()):
+        total = base_query.with_entities(func.count()).scalar()
+    else:
+        total = get_transaction_counts(db, user_id).income_count
+
+    return _page(Income, base_query, total, skip, limit, cursor)
+
+
+# ==========================================================
+# BULK CREATE
+# ==========================================================
+
+def _validate_items(
+    items: List[Dict[str, Any]],
+    schema: Type[BaseModel]
+) -> Tuple[List[BaseModel], List[Dict]]:
+    """Validate every item in one pass, collecting errors by position."""
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append(schema.model_validate(item))
+        except ValidationError as e:
+            errors.append({
+                "index": index,
+                "errors": [
+                    {"loc": list(err["loc"]), "msg": err["msg"], "type": err["type"]}
+                    for err in e.errors()
+                ]
+            })
+    return valid, errors
+
+
+def bulk_create_expenses(db: Session, user_id: int, items: List[Dict[str, Any]]) -> Dict:
+    """
+    Insert every valid item with one multi-row INSERT ... RETURNING and a
+    single commit. Invalid items are reported, not inserted; the insert
+    itself is all-or-nothing, so a database error (e.g. a constraint
+    violation) rolls back every valid item and propagates.
+    """
+    valid, errors = _validate_items(items, ExpenseCreate)
+
+    created = []
+    if valid:
+        rows = [{**item.model_dump(), "user_id": user_id} for item in valid]
+        inserted = db.scalars(insert(Expense).returning(Expense), rows).all()
+
+        # Serialize before commit so the response doesn't reload each row
+        created = [ExpenseResponse.model_validate(row) for row in inserted]
+
+        record_activity_dates(db, user_id, (row.date for row in created))
+        adjust_transaction_counts(db, user_id, expenses=len(created))
+        db.commit()
+
+    return {
+        "created": len(created),
+        "failed": len(errors),
+        "data": created,
+        "errors": errors
+    }
+
+
+def bulk_create_incomes(db: Session, user_id: int, items: List[Dict[str, Any]]) -> Dict:
+    """Income counterpart of bulk_create_expenses."""
+    valid, errors = _validate_items(items, IncomeCreate)
+
+    created = []
+    if valid:
+        rows = [{**item.model_dump(), "user_id": user_id} for item in valid]
+        inserted = db.scalars(insert(Income).returning(Income), rows).all()
+
+        # Serialize before commit so the response doesn't reload each row
+        created = [IncomeResponse.model_validate(row) for row in inserted]
+
+        record_activity_dates(db, user_id, (row.date for row in created))
+        adjust_transaction_counts(db, user_id, incomes=len(created))
+        db.commit()
+
+    return {
+        "created": len(created),
+        "failed": len(errors),
+        "data": created,
+        "errors": errors
+    }
+
+
+# ==========================================================
+# BULK UPDATE / DELETE
+# ==========================================================
+# One ownership-checked UPDATE/DELETE ... RETURNING id per request;
+# rows belonging to other users simply never match.
+
+def _select_expenses(stmt, user_id: int, where: ExpenseBulkSelection):
+    stmt = stmt.where(Expense.user_id == user_id)
+    if where.ids:
+        stmt = stmt.where(Expense.id.in_(where.ids))
+    return filter_expenses(
+        stmt,
+        category=where.category,
+        start_date=where.start_date,
+        end_date=where.end_date,
+    )
+
+
+def _select_incomes(stmt, user_id: int, where: IncomeBulkSelection):
+    stmt = stmt.where(Income.user_id == user_id)
+    if where.ids:
+        stmt = stmt.where(Income.id.in_(where.ids))
+    return filter_incomes(
+        stmt,
+        source=where.source,
+        start_date=where.start_date,
+        end_date=where.end_date,
+    )
+
+
+def _mutation_result(ids: List[int]) -> Dict:
+    return {"count": len(ids), "ids": ids}
+
+
+def bulk_update_expenses(db: Session, user_id: int, where: ExpenseBulkSelection, changes: Dict[str, Any]) -> Dict:
+    stmt = _select_expenses(update(Expense), user_id, where).values(**changes)
+    ids = db.scalars(
+        stmt.returning(Expense.id),
+        execution_options={"synchronize_session": False}
+    ).all()
+    db.commit()
+    return _mutation_result(ids)
+
+
+def bulk_update_incomes(db: Session, user_id: int, where: IncomeBulkSelection, changes: Dict[str, Any]) -> Dict:
+    stmt = _select_incomes(update(Income), user_id, where).values(**changes)
+    ids = db.scalars(
+        stmt.returning(Income.id),
+        execution_options={"synchronize_session": False}
+    ).all()
+    db.commit()
+    return _mutation_result(ids)
+
+
+def bulk_delete_expenses(db: Session, user_id: int, where: ExpenseBulkSelection) -> Dict:
+    ids = db.scalars(
+        _select_expenses(delete(Expense), user_id, where).returning(Expense.id),
+        execution_options={"synchronize_session": False}
+    ).all()
+    adjust_transaction_counts(db, user_id, expenses=-len(ids))
+    db.commit()
+    return _mutation_result(ids)
+
+
+def bulk_delete_incomes(db: Session, user_id: int, where: IncomeBulkSelection) -> Dict:
+    ids = db.scalars(
+        _select_incomes(delete(Income), user_id, where).returning(Income.id),
+        execution_options={"synchronize_session": False}
+    ).all()
+    adjust_transaction_counts(db, user_id, incomes=-len(ids))
+    db.commit()
+    return _mutation_result(ids)
+
+
+# ==========================================================
+# FULL-TEXT SEARCH
+# ==========================================================
+
+def search_transactions(
+    db: Session,
+    model: Type,
+    user_id: int,
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Rank one user's incomes or expenses against a web-style query
+    ("generator repair", "rent -deposit", "\"data bundle\"").
+
+    Matching runs on ix_*_user_search; only the user's matches are ranked.
+    Pages are keyset on (rank desc, id desc).
+    """
+    query = func.websearch_to_tsquery("english", q)
+    # ts_rank returns float4; compare and page on float8 so the cursor's
+    # double round-trips exactly and rows tied at a page boundary aren't
+    # skipped or repeated
+    rank = cast(func.ts_rank(model.search_vector, query), Float(53))
+
+    stmt = (
+        db.query(model, rank.label("rank"))
+        .filter(
+            model.user_id == user_id,
+            model.search_vector.bool_op("@@")(query)
+        )
+        .order_by(rank.desc(), model.id.desc())
+    )
+
+    if cursor:
+        cursor_rank, cursor_id = decode_rank_cursor(cursor)
+        stmt = stmt.filter(tuple_(rank, model.id) < tuple_(cursor_rank, cursor_id))
+
+    rows = stmt.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        "total": None,
+        "skip": 0,
+        "limit": limit,
+        "data": [row[0] for row in rows],
+        "next_cursor": encode_rank_cursor(rows[-1].rank, rows[-1][0].id) if has_more else None
+    }
+
+
+# ==========================================================
+# STREAMING EXPORT
+# ==========================================================
+
+EXPENSE_EXPORT_FIELDS = [
+    "id", "date", "amount", "category", "necessity_type",
+    "wealth_bucket", "payment_method", "description",
+]
+
+INCOME_EXPORT_FIELDS = [
+    "id", "date", "amount", "source", "payment_method", "description",
+]
+
+
+def _iter_export(statement, fields: List[str], user_id: int, export_format: str, batch_size: int) -> Iterator[str]:
+    """
+    Stream plain column tuples off a server-side cursor, `batch_size` rows
+    at a time. Owns its session because it outlives the request.
+    """
+    db = read_sessionmaker(user_id)()
+    try:
+        # The client sets the pace; don't let idle gaps between batches time out
+        lift_session_timeouts(db)
+        rows = db.execute(statement.execution_options(yield_per=batch_size))
+        yield from encode_records(
+            (dict(zip(fields, row)) for row in rows),
+            fields,
+            export_format,
+            batch_size
+        )
+    finally:
+        db.close()
+
+
+def iter_expense_export(
+    user_id: int,
+    export_format: str = "csv",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    batch_size: int = 2000
+) -> Iterator[str]:
+    _check_date_range(start_date, end_date)
+
+    statement = filter_expenses(
+        select(*(getattr(Expense, f) for f in EXPENSE_EXPORT_FIELDS))
+        .where(Expense.user_id == user_id)
+        .order_by(Expense.date.desc(), Expense.id.desc()),
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return _iter_export(statement, EXPENSE_EXPORT_FIELDS, user_id, export_format, batch_size)
+
+
+def iter_income_export(
+    user_id: int,
+    export_format: str = "csv",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    batch_size: int = 2000
+) -> Iterator[str]:
+    _check_date_range(start_date, end_date)
+
+    statement = filter_incomes(
+        select(*(getattr(Income, f) for f in INCOME_EXPORT_FIELDS))
+        .where(Income.user_id == user_id)
+        .order_by(Income.date.desc(), Income.id.desc()),
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return _iter_export(statement, INCOME_EXPORT_FIELDS, user_id, export_format, batch_size)
@@ -0,0 +1,66 @@
+"""HyperLogLog DAU/WAU estimates against exact distinct counts."""
+
+from datetime import date, timedelta
+
+from sqlalchemy import func
+
+from app.models.daily_active_sketch import DailyActiveSketch, SKETCH_SHARDS
+from app.services import hyperloglog
+from app.services.activity_tracking import record_activity_dates
+from app.services.admin_analytics import get_active_user_estimates
+
+# Three standard errors: the hash is fixed, so this can't flake
+TOLERANCE = 3 * hyperloglog.STANDARD_ERROR
+
+
+def assert_within_bound(estimate: int, exact: int):
+    assert abs(estimate - exact) <= TOLERANCE * exact, (estimate, exact)
+
+
+def test_estimates_stay_within_error_bound_across_shards_and_days(db):
+    today = date.today()
+    days = [today - timedelta(days=2), today - timedelta(days=1), today]
+
+    # Overlapping populations, so the window union differs from the daily sum
+    active = {
+        days[0]: set(range(0, 5000)),
+        days[1]: set(range(2500, 10000)),
+        days[2]: set(range(9000, 12000)) | set(range(0, 40)),
+    }
+
+    for user_id in sorted(set().union(*active.values())):
+        record_activity_dates(db, user_id, [d for d, users in active.items() if user_id in users])
+    db.commit()
+
+    # Every day is spread over all the shards, so reads have to merge them
+    shard_counts = dict(
+        db.query(DailyActiveSketch.day, func.count())
+        .group_by(DailyActiveSketch.day)
+    )
+    assert shard_counts == {d: SKETCH_SHARDS for d in days}
+
+    result = get_active_user_estimates(db, days=7)
+    trend = {date.fromisoformat(point["date"]): point["active_users"] for point in result["dau_trend"]}
+
+    for d, users in active.items():
+        assert_within_bound(trend[d], len(users))
+    assert result["dau"] == trend[today]
+
+    every_user = set().union(*active.values())
+    assert_within_bound(result["wau"], len(every_user))
+    assert_within_bound(result["mau"], len(every_user))
+    assert_within_bound(result["unique_in_window"], len(every_user))
+
+
+def test_small_days_are_counted_almost_exactly(db):
+    today = date.today()
+
+    for user_id in range(1, 31):
+        record_activity_dates(db, user_id, [today])
+    # Repeat activity on the same day must not count twice
+    for user_id in range(1, 11):
+        record_activity_dates(db, user_id, [today])
+    db.commit()
+
+    result = get_active_user_estimates(db, days=7)
+    assert abs(result["dau"] - 30) <= 1
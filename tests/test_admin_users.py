@@ -0,0 +1,81 @@
+"""GET /admin/users: the paged user list with per-user activity stats."""
+
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.models.bucket_activity import BucketActivity, ActivityType
+from app.models.expense import Expense, NecessityType
+from app.models.income import Income
+
+
+def test_user_list_pages_with_activity_stats(client, db, make_user):
+    admin, headers = make_user("admin@example.com", is_admin=True)
+    users = [make_user(f"user{i}@example.com")[0] for i in range(5)]
+    today = date.today()
+
+    busy = users[2]
+    db.add_all([
+        Income(
+            user_id=busy.id, amount=Decimal("100.00"), source="Salary",
+            payment_method="Bank", date=today - timedelta(days=3)
+        ),
+        Income(
+            user_id=busy.id, amount=Decimal("50.00"), source="Gift",
+            payment_method="Bank", date=today - timedelta(days=1)
+        ),
+        Expense(
+            user_id=busy.id, amount=Decimal("20.00"), category="Food", payment_method="Cash",
+            necessity_type=NecessityType.essential, date=today
+        ),
+        # Future-dated entries count but don't move last_active
+        Expense(
+            user_id=busy.id, amount=Decimal("5.00"), category="Food", payment_method="Cash",
+            necessity_type=NecessityType.essential, date=today + timedelta(days=5)
+        ),
+        BucketActivity(
+            user_id=busy.id, bucket_name="family", amount=Decimal("10.00"),
+            activity_type=ActivityType.allocation, date=today
+        ),
+    ])
+    db.commit()
+
+    response = client.get("/admin/users", params={"skip": 0, "limit": 50}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 6
+    # Newest first
+    assert [row["id"] for row in body["data"]] == [u.id for u in reversed([admin, *users])]
+
+    row = next(row for row in body["data"] if row["id"] == busy.id)
+    assert row["income_count"] == 2
+    assert row["expense_count"] == 2
+    assert row["has_buckets"] is True
+    assert row["has_bills"] is False
+    assert row["last_active"] == today.isoformat()
+    assert row["days_since_active"] == 0
+
+    idle = next(row for row in body["data"] if row["id"] == users[0].id)
+    assert (idle["income_count"], idle["expense_count"], idle["last_active"]) == (0, 0, None)
+
+
+def test_user_list_skip_and_limit_select_one_page(client, make_user):
+    admin, headers = make_user("admin@example.com", is_admin=True)
+    users = [make_user(f"user{i}@example.com")[0] for i in range(5)]
+    newest_first = [u.id for u in reversed([admin, *users])]
+
+    response = client.get("/admin/users", params={"skip": 2, "limit": 3}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["total"], body["skip"], body["limit"]) == (6, 2, 3)
+    assert [row["id"] for row in body["data"]] == newest_first[2:5]
+
+
+def test_user_export_lists_every_user(client, make_user):
+    admin, headers = make_user("admin@example.com", is_admin=True)
+    users = [make_user(f"user{i}@example.com")[0] for i in range(3)]
+
+    response = client.get("/admin/users/export", params={"format": "ndjson"}, headers=headers)
+    assert response.status_code == 200
+    ids = [json.loads(line)["id"] for line in response.text.splitlines()]
+    assert ids == [u.id for u in reversed([admin, *users])]
@@ -0,0 +1,146 @@
+"""
+Filtered transaction listings must be served by the per-user composite
+indexes, never a sequential scan. Each listing runs for real; every
+statement it sends to expenses/incomes is then re-run under EXPLAIN.
+"""
+
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event, text
+
+from app.database import engine
+from app.models.expense import NecessityType
+from app.services.transaction_service import list_expenses, list_incomes
+
+USERS = 50
+ROWS_PER_USER = 2000
+
+# Any per-user btree index is acceptable for residual-only filters; the
+# cases below name the one a selective filter must use
+EXPENSE_INDEXES = {
+    "ix_expense_user_date", "ix_expense_user_created", "ix_expense_user_category", "ix_expense_user_date_id",
+}
+INCOME_INDEXES = {
+    "ix_income_user_date", "ix_income_user_created", "ix_income_user_source", "ix_income_user_date_id",
+}
+
+
+@pytest.fixture
+def seeded(db):
+    """USERS users with ROWS_PER_USER expenses and incomes each over two years."""
+    db.execute(text("""
+        INSERT INTO users (full_name, email, hashed_password)
+        SELECT 'user ' || n, 'user' || n || '@example.com', 'x'
+        FROM generate_series(1, :users) AS n
+    """), {"users": USERS})
+    db.execute(text("""
+        INSERT INTO expenses (user_id, amount, category, necessity_type, wealth_bucket, payment_method, date)
+        SELECT u.id,
+               (n % 500) + 1,
+               'category ' || (n % 20),
+               (CASE WHEN n % 3 = 0 THEN 'non_essential' ELSE 'essential' END)::necessity_type_enum,
+               CASE WHEN n % 50 = 0 THEN 'family' END,
+               CASE WHEN n % 4 = 0 THEN 'Card' ELSE 'Cash' END,
+               current_date - (n % 730)
+        FROM users u, generate_series(1, :rows) AS n
+    """), {"rows": ROWS_PER_USER})
+    db.execute(text("""
+        INSERT INTO incomes (user_id, amount, source, payment_method, date)
+        SELECT u.id,
+               (n % 900) + 100,
+               CASE WHEN n % 100 = 0 THEN 'Bonus' ELSE 'Salary ' || (n % 10) END,
+               'Bank',
+               current_date - (n % 730)
+        FROM users u, generate_series(1, :rows) AS n
+    """), {"rows": ROWS_PER_USER})
+    db.commit()
+    db.execute(text("ANALYZE users, expenses, incomes"))
+    return db.execute(text("SELECT id FROM users ORDER BY id LIMIT 1 OFFSET :n"), {"n": USERS // 2}).scalar()
+
+
+@contextmanager
+def captured_statements(table: str):
+    """Collect (sql, params) for every statement that reads `table`."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and f"FROM {table}" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def plan_scans(db, statement: str, parameters) -> list:
+    """(node type, relation, index) for every table and index scan in the statement's plan."""
+    plan = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+
+    scans = []
+
+    def walk(node, relation=None):
+        # A Bitmap Index Scan names only its index; the relation is on the heap scan above it
+        relation = node.get("Relation Name", relation)
+        if "Index Name" in node or node["Node Type"] == "Seq Scan":
+            scans.append((node["Node Type"], relation, node.get("Index Name")))
+        for child in node.get("Plans", []):
+            walk(child, relation)
+
+    walk(plan[0]["Plan"])
+    return scans
+
+
+def assert_index_scans(db, statements, table: str, allowed: set, required: str = None):
+    assert statements, "the listing issued no query against " + table
+    used = set()
+    for statement, parameters in statements:
+        for node_type, relation, index in plan_scans(db, statement, parameters):
+            if relation != table:
+                continue
+            assert node_type != "Seq Scan", f"sequential scan on {table}:\n{statement}"
+            assert index in allowed, f"unexpected index {index} on {table}:\n{statement}"
+            used.add(index)
+    if required:
+        assert required in used, f"{required} unused; plans used {used}"
+
+
+EXPENSE_FILTERS = [
+    ({"category": "category 7"}, "ix_expense_user_category"),
+    ({"start_date": date.today() - timedelta(days=30), "end_date": date.today()}, None),
+    ({"category": "category 7", "start_date": date.today() - timedelta(days=90)}, None),
+    ({"necessity_type": NecessityType.non_essential, "payment_method": "Card"}, None),
+    ({"wealth_bucket": "family"}, None),
+]
+
+
+@pytest.mark.parametrize("filters,required", EXPENSE_FILTERS)
+def test_filtered_expense_listing_uses_indexes(seeded, db, filters, required):
+    with captured_statements("expenses") as statements:
+        page = list_expenses(db, seeded, limit=50, **filters)
+        assert page["data"]
+        if page["next_cursor"]:
+            list_expenses(db, seeded, limit=50, cursor=page["next_cursor"], include_total=False, **filters)
+
+    assert_index_scans(db, statements, "expenses", EXPENSE_INDEXES, required)
+
+
+INCOME_FILTERS = [
+    ({"source": "Bonus"}, "ix_income_user_source"),
+    ({"start_date": date.today() - timedelta(days=30)}, None),
+    ({"source": "Salary 3", "end_date": date.today() - timedelta(days=365)}, None),
+]
+
+
+@pytest.mark.parametrize("filters,required", INCOME_FILTERS)
+def test_filtered_income_listing_uses_indexes(seeded, db, filters, required):
+    with captured_statements("incomes") as statements:
+        page = list_incomes(db, seeded, limit=50, **filters)
+        assert page["data"]
+        if page["next_cursor"]:
+            list_incomes(db, seeded, limit=50, cursor=page["next_cursor"], include_total=False, **filters)
+
+    assert_index_scans(db, statements, "incomes", INCOME_INDEXES, required)
@@ -0,0 +1,49 @@
+"""Refresh-token rotation and reuse detection through /auth."""
+
+PASSWORD = "correct-horse-battery"
+
+
+def log_in(client, email: str) -> dict:
+    response = client.post("/auth/login", data={"username": email, "password": PASSWORD})
+    assert response.status_code == 200
+    return response.json()
+
+
+def refresh(client, refresh_token: str):
+    return client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def test_rotation_issues_a_new_pair(client, make_user):
+    make_user("user@example.com", PASSWORD)
+    tokens = log_in(client, "user@example.com")
+
+    response = refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+
+    me = client.get("/summary/daily", headers={"Authorization": f"Bearer {rotated['access_token']}"})
+    assert me.status_code == 200
+
+
+def test_reusing_a_rotated_token_revokes_the_family(client, make_user):
+    make_user("user@example.com", PASSWORD)
+    first = log_in(client, "user@example.com")["refresh_token"]
+    second = refresh(client, first).json()["refresh_token"]
+
+    # The old token comes back: rejected, and its newer sibling goes too
+    reused = refresh(client, first)
+    assert reused.status_code == 401
+
+    assert refresh(client, second).status_code == 401
+
+
+def test_reuse_leaves_other_sessions_alone(client, make_user):
+    make_user("user@example.com", PASSWORD)
+    stolen = log_in(client, "user@example.com")["refresh_token"]
+    other_device = log_in(client, "user@example.com")["refresh_token"]
+
+    refresh(client, stolen)
+    assert refresh(client, stolen).status_code == 401
+
+    assert refresh(client, other_device).status_code == 200